@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script de préchargement des icônes de réseaux sociaux.
+Ce script télécharge (une fois, au moment du build) les icônes PNG et SVG des
+plateformes sociales dans src/frontend/static/img/social_icons, afin que
+l'application n'ait plus besoin d'accéder au réseau au démarrage.
+"""
+
+import os
+import sys
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from src.backend.customization.social_icons import SocialIconLibrary
+
+
+def main():
+    """Télécharge les icônes manquantes et vérifie le résultat."""
+    icons_dir = sys.argv[1] if len(sys.argv) > 1 else None
+
+    print("→ Téléchargement des icônes de réseaux sociaux manquantes...")
+    library = SocialIconLibrary(icons_dir=icons_dir, download_if_missing=True, lazy=True)
+    try:
+        library.wait_ready()
+        missing = library.check_and_download_icons(verify_only=True)
+    finally:
+        library.close()
+
+    if missing:
+        print(f"✗ {len(missing)} icône(s) toujours manquante(s) dans {library.icons_dir}")
+        return 1
+
+    print(f"✓ Icônes disponibles dans {os.path.abspath(library.icons_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module utilitaire pour les couleurs des QR codes.
+Ce module normalise les couleurs et construit les arguments des masques de
+couleur de qrcode, partagés par les générateurs de styles.
+"""
+
+from functools import lru_cache
+from PIL import ImageColor
+
+
+@lru_cache(maxsize=1024)
+def _parse_color_string(color):
+    """
+    Convertit une couleur textuelle ('#rrggbb' ou nom de couleur) en tuple RGB,
+    une seule fois par valeur.
+    
+    Args:
+        color (str): Couleur hexadécimale ou nom de couleur
+    
+    Returns:
+        tuple: Couleur RGB (ou RGBA pour une couleur '#rrggbbaa')
+    """
+    if color.startswith('#') and len(color) == 7:
+        return tuple(bytes.fromhex(color[1:]))
+    return ImageColor.getrgb(color)
+
+
+def parse_color(color):
+    """
+    Normalise une couleur (tuple, liste, '#rrggbb' ou nom) en tuple.
+    
+    Args:
+        color: Couleur à normaliser
+    
+    Returns:
+        tuple: Couleur sous forme de tuple
+    """
+    if isinstance(color, str):
+        return _parse_color_string(color)
+    return tuple(color)
+
+
+def _second_color(options, option_name, default):
+    """Seconde couleur d'un dégradé : option propre au masque, sinon edge_color"""
+    if option_name in options:
+        return parse_color(options[option_name])
+    return parse_color(options.get('edge_color', default))
+
+
+def _solid_mask_kwargs(options, front_color, back_color, edge_color):
+    """Arguments d'un masque de couleur unie"""
+    return {
+        'front_color': front_color,
+        'back_color': back_color
+    }
+
+
+def _center_gradient_mask_kwargs(options, front_color, back_color, edge_color):
+    """
+    Arguments d'un masque en dégradé radial ou carré.
+    
+    L'option gradient_center est ignorée : les masques de qrcode sont toujours
+    centrés et n'acceptent pas d'argument 'center'.
+    """
+    return {
+        'center_color': front_color,
+        'edge_color': _second_color(options, 'edge_color', edge_color),
+        'back_color': back_color
+    }
+
+
+def _horizontal_gradient_mask_kwargs(options, front_color, back_color, edge_color):
+    """Arguments d'un masque en dégradé horizontal"""
+    return {
+        'left_color': front_color,
+        'right_color': _second_color(options, 'right_color', edge_color),
+        'back_color': back_color
+    }
+
+
+def _vertical_gradient_mask_kwargs(options, front_color, back_color, edge_color):
+    """Arguments d'un masque en dégradé vertical"""
+    return {
+        'top_color': front_color,
+        'bottom_color': _second_color(options, 'bottom_color', edge_color),
+        'back_color': back_color
+    }
+
+
+def _diagonal_gradient_mask_kwargs(options, front_color, back_color, edge_color):
+    """Arguments d'un masque en dégradé diagonal"""
+    return {
+        'top_left_color': front_color,
+        'bottom_right_color': _second_color(options, 'bottom_right_color', edge_color),
+        'back_color': back_color
+    }
+
+
+def _rainbow_mask_kwargs(options, front_color, back_color, edge_color):
+    """Arguments d'un masque arc-en-ciel"""
+    color_mask_kwargs = {'back_color': back_color}
+    if 'colors' in options:
+        color_mask_kwargs['colors'] = [parse_color(color) for color in options.get('colors')]
+    return color_mask_kwargs
+
+
+# Construction des arguments de chaque type de masque de couleur
+_COLOR_MASK_KWARGS = {
+    'solid': _solid_mask_kwargs,
+    'radial_gradient': _center_gradient_mask_kwargs,
+    'square_gradient': _center_gradient_mask_kwargs,
+    'horizontal_gradient': _horizontal_gradient_mask_kwargs,
+    'vertical_gradient': _vertical_gradient_mask_kwargs,
+    'diagonal_gradient': _diagonal_gradient_mask_kwargs,
+    'rainbow': _rainbow_mask_kwargs
+}
+
+# Couleurs par défaut (premier plan, seconde couleur du dégradé) de chaque masque
+MASK_DEFAULT_COLORS = {
+    'solid': ((0, 0, 0), (100, 100, 100)),
+    'radial_gradient': ((0, 102, 204), (0, 51, 153)),
+    'square_gradient': ((0, 102, 204), (0, 51, 153)),
+    'horizontal_gradient': ((255, 102, 0), (204, 0, 0)),
+    'vertical_gradient': ((0, 153, 0), (0, 51, 0)),
+    'diagonal_gradient': ((0, 102, 204), (0, 51, 153))
+}
+
+
+def color_mask_kwargs(color_mask_id, options, default_colors=None):
+    """
+    Construit les arguments d'un masque de couleur à partir des options.
+    
+    Args:
+        color_mask_id (str): Identifiant du masque de couleur ('solid',
+            'radial_gradient', etc.). Un identifiant inconnu donne une couleur unie.
+        options (dict): Options de personnalisation (front_color, back_color,
+            edge_color ou right_color/bottom_color/bottom_right_color, colors)
+        default_colors (tuple, optional): Couleurs par défaut (premier plan,
+            seconde couleur du dégradé). Si non spécifié, utilise celles de
+            MASK_DEFAULT_COLORS pour ce masque.
+    
+    Returns:
+        dict: Arguments du masque de couleur, couleurs normalisées en tuples
+    """
+    kwargs_builder = _COLOR_MASK_KWARGS.get(color_mask_id, _solid_mask_kwargs)
+    front_default, edge_default = default_colors or MASK_DEFAULT_COLORS.get(
+        color_mask_id, MASK_DEFAULT_COLORS['solid']
+    )
+    
+    front_color = parse_color(options.get('front_color', front_default))
+    back_color = parse_color(options.get('back_color', (255, 255, 255)))
+    return kwargs_builder(options, front_color, back_color, edge_default)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de journalisation des métadonnées des QR codes.
+Ce module fournit le journal JSON Lines partagé par les générateurs de styles.
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class MetadataJournal:
+    """
+    Journal des métadonnées des QR codes générés.
+    
+    Chaque QR code ajoute une ligne JSON au fichier metadata/index.jsonl, écrit au
+    travers d'un tampon de 64 Ko (vidé par close()) ; en mode legacy, un fichier
+    texte est écrit par QR code.
+    """
+    
+    def __init__(self, metadata_dir, legacy=False):
+        """
+        Initialise le journal des métadonnées.
+        
+        Args:
+            metadata_dir (str): Répertoire des métadonnées (déjà créé)
+            legacy (bool): Écrit un fichier texte de métadonnées par QR code au
+                lieu d'une ligne dans le journal index.jsonl
+        """
+        self.metadata_dir = metadata_dir
+        self.legacy = legacy
+        
+        # Journal ouvert à la première écriture et tamponné
+        self._fp = None
+        self._lock = threading.Lock()
+    
+    def write(self, data, output_path, options=None):
+        """
+        Enregistre les métadonnées d'un QR code généré.
+        
+        Args:
+            data (str): Données encodées dans le QR code
+            output_path (str): Chemin du fichier QR code généré
+            options (dict, optional): Options utilisées pour la génération
+        """
+        if self.legacy:
+            self._write_file(data, output_path, options)
+            return
+        
+        record = {
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'data': data,
+            'file': os.path.basename(output_path),
+            'options': options or {}
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+        
+        with self._lock:
+            if self._fp is None:
+                self._fp = open(os.path.join(self.metadata_dir, 'index.jsonl'), 'ab',
+                                buffering=1 << 16)
+            self._fp.write(line)
+    
+    def _write_file(self, data, output_path, options=None):
+        """
+        Enregistre les métadonnées d'un QR code dans un fichier texte dédié.
+        
+        Args:
+            data (str): Données encodées dans le QR code
+            output_path (str): Chemin du fichier QR code généré
+            options (dict, optional): Options utilisées pour la génération
+        """
+        # Nom du fichier de métadonnées basé sur le nom du QR code
+        qr_filename = os.path.basename(output_path)
+        metadata_filename = f"{os.path.splitext(qr_filename)[0]}.txt"
+        metadata_path = os.path.join(self.metadata_dir, metadata_filename)
+        
+        # Création du contenu des métadonnées (options ajoutées si spécifiées)
+        metadata_content = (
+            f"Date de création: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Données: {data}\n"
+            f"Fichier: {qr_filename}"
+        )
+        if options:
+            metadata_content += "\nOptions:" + ''.join(
+                f"\n  {key}: {value}" for key, value in options.items()
+            )
+        
+        # Écriture des métadonnées dans le fichier, en une seule écriture
+        with open(metadata_path, 'wb') as f:
+            f.write(metadata_content.encode('utf-8'))
+    
+    def close(self):
+        """
+        Vide et ferme le journal.
+        """
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+    
+    def __del__(self):
+        fp = getattr(self, '_fp', None)
+        if fp is not None:
+            fp.close()
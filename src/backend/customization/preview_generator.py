@@ -9,6 +9,7 @@ compatible with QR Code Monkey functionality.
 
 import io
 import base64
+import logging
 import qrcode
 import math
 from PIL import Image, ImageDraw, ImageOps, ImageFilter, ImageChops
@@ -29,6 +30,22 @@ from qrcode.image.styles.colormasks import (
     VerticalGradiantColorMask
 )
 
+logger = logging.getLogger(__name__)
+
+# Platform colors used by social previews (simplified subset for the preview)
+SOCIAL_PLATFORM_COLORS = {
+    'facebook': '#1877F2',
+    'twitter': '#1DA1F2',
+    'instagram': '#E4405F',
+    'linkedin': '#0A66C2',
+    'youtube': '#FF0000',
+    'tiktok': '#000000',
+    'snapchat': '#FFFC00',
+    'pinterest': '#E60023',
+    'whatsapp': '#25D366',
+    'website': '#333333'
+}
+
 class QRCodePreviewGenerator:
     """
     Enhanced class for generating QR code previews with various styling options.
@@ -177,19 +194,7 @@ class QRCodePreviewGenerator:
         box_size = options.get('box_size', 10)
         border = options.get('border', 4)
         
-        # Map error correction level from integer to constant
-        error_correction_map = {
-            0: qrcode.constants.ERROR_CORRECT_L,
-            1: qrcode.constants.ERROR_CORRECT_M,
-            2: qrcode.constants.ERROR_CORRECT_Q,
-            3: qrcode.constants.ERROR_CORRECT_H
-        }
-        
-        # Convert string/integer error correction to constants
-        if isinstance(error_correction, str) and error_correction.isdigit():
-            error_correction = int(error_correction)
-        if isinstance(error_correction, int) and error_correction in error_correction_map:
-            error_correction = error_correction_map[error_correction]
+        error_correction = self._resolve_error_correction(error_correction)
         
         # Generate QR code based on preview type
         if preview_type == 'basic':
@@ -248,21 +253,7 @@ class QRCodePreviewGenerator:
             # Check for platform color override
             use_platform_color = options.get('use_platform_color', False)
             if use_platform_color and social_platform:
-                # Here we would ideally look up the platform color
-                # This is simplified for the preview
-                platform_colors = {
-                    'facebook': '#1877F2',
-                    'twitter': '#1DA1F2',
-                    'instagram': '#E4405F',
-                    'linkedin': '#0A66C2',
-                    'youtube': '#FF0000',
-                    'tiktok': '#000000',
-                    'snapchat': '#FFFC00',
-                    'pinterest': '#E60023',
-                    'whatsapp': '#25D366',
-                    'website': '#333333'
-                }
-                fill_color = self._parse_color(platform_colors.get(social_platform, "#000000"))
+                fill_color = self._parse_color(SOCIAL_PLATFORM_COLORS.get(social_platform, "#000000"))
             
             img = self._generate_social_preview(
                 data, version, error_correction, box_size, border,
@@ -284,7 +275,87 @@ class QRCodePreviewGenerator:
         else:
             raise ValueError(f"Unknown preview type: {preview_type}")
         
-        # Convert image to base64
+        return self._image_to_base64(img)
+    
+    def generate_error_correction_preview(self, data, **options):
+        """
+        Generate one preview per error correction level (L, M, Q, H).
+        
+        The error correction level only changes the module matrix, so the
+        options are parsed once and each matrix is rasterized directly
+        instead of running the full preview pipeline four times.
+        
+        Args:
+            data (str): Data to encode in the QR code
+            **options: version, box_size, border, fill_color, back_color
+            
+        Returns:
+            dict: Base64 encoded image data keyed by level ('L', 'M', 'Q', 'H')
+        """
+        version = options.get('version', 1)
+        box_size = int(options.get('box_size', 10))
+        border = int(options.get('border', 4))
+        fill_color = self._parse_color(options.get('fill_color', "black"))
+        back_color = self._parse_color(options.get('back_color', "white"))
+        
+        levels = {
+            'L': qrcode.constants.ERROR_CORRECT_L,
+            'M': qrcode.constants.ERROR_CORRECT_M,
+            'Q': qrcode.constants.ERROR_CORRECT_Q,
+            'H': qrcode.constants.ERROR_CORRECT_H
+        }
+        
+        return {
+            level: self._render_matrix_to_b64(
+                self._qr_matrix(data, error_correction, version, border),
+                box_size, fill_color, back_color
+            )
+            for level, error_correction in levels.items()
+        }
+    
+    def _resolve_error_correction(self, error_correction):
+        """Convert a string/integer error correction level to a qrcode constant."""
+        # Map error correction level from integer to constant
+        error_correction_map = {
+            0: qrcode.constants.ERROR_CORRECT_L,
+            1: qrcode.constants.ERROR_CORRECT_M,
+            2: qrcode.constants.ERROR_CORRECT_Q,
+            3: qrcode.constants.ERROR_CORRECT_H
+        }
+        
+        if isinstance(error_correction, str) and error_correction.isdigit():
+            error_correction = int(error_correction)
+        if isinstance(error_correction, int) and error_correction in error_correction_map:
+            error_correction = error_correction_map[error_correction]
+        
+        return error_correction
+    
+    def _qr_matrix(self, data, error_correction, version=1, border=4):
+        """Build the module matrix (border included) for the given data and level."""
+        qr = qrcode.QRCode(
+            version=version,
+            error_correction=error_correction,
+            border=border,
+        )
+        qr.add_data(data)
+        qr.make(fit=True)
+        
+        return qr.get_matrix()
+    
+    def _render_matrix_to_b64(self, matrix, box_size, fill_color, back_color):
+        """Rasterize a module matrix into a PNG data URI."""
+        size = len(matrix)
+        
+        # One pixel per module with a two-entry RGB palette (alpha dropped), then scale up
+        img = Image.new('P', (size, size))
+        img.putpalette(list(back_color[:3]) + list(fill_color[:3]))
+        img.putdata([1 if module else 0 for row in matrix for module in row])
+        img = img.resize((size * box_size, size * box_size), Image.NEAREST)
+        
+        return self._image_to_base64(img.convert('RGB'))
+    
+    def _image_to_base64(self, img):
+        """Encode an image as a PNG data URI."""
         buffered = io.BytesIO()
         img.save(buffered, format="PNG")
         img_str = base64.b64encode(buffered.getvalue()).decode()
@@ -477,7 +548,7 @@ class QRCodePreviewGenerator:
             return result
             
         except Exception as e:
-            print(f"Error adding logo: {e}")
+            logger.warning("Error adding logo: %s", e, exc_info=True)
             # Return QR code without logo in case of error
             return qr_img
     
@@ -8,15 +8,441 @@ pour les réseaux sociaux et ajouter des icônes sociales aux QR codes généré
 """
 
 import os
+import multiprocessing
+import io
+import json
 import uuid
+import logging
 import math
-import requests
+import threading
 import base64
-from io import BytesIO
+from urllib.parse import quote
+from collections import OrderedDict
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont, ImageColor, ImageEnhance
+from types import MappingProxyType
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 import qrcode
-from qrcode.image.styledpil import StyledPilImage
+
+logger = logging.getLogger(__name__)
+
+
+# Configuration des icônes des plateformes (partagée par toutes les instances)
+ICONS_CONFIG = {
+    'facebook': {
+        'name': 'Facebook',
+        'color': '#1877F2',
+        'filename': 'facebook.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/facebook.svg',
+        'formats': ['png', 'svg']
+    },
+    'twitter': {
+        'name': 'Twitter',
+        'color': '#1DA1F2',
+        'filename': 'twitter.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/twitter.svg',
+        'formats': ['png', 'svg']
+    },
+    'instagram': {
+        'name': 'Instagram',
+        'color': '#E4405F',
+        'filename': 'instagram.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/instagram.svg',
+        'formats': ['png', 'svg']
+    },
+    'linkedin': {
+        'name': 'LinkedIn',
+        'color': '#0A66C2',
+        'filename': 'linkedin.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/linkedin.svg',
+        'formats': ['png', 'svg']
+    },
+    'youtube': {
+        'name': 'YouTube',
+        'color': '#FF0000',
+        'filename': 'youtube.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/youtube.svg',
+        'formats': ['png', 'svg']
+    },
+    'tiktok': {
+        'name': 'TikTok',
+        'color': '#000000',
+        'filename': 'tiktok.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/tiktok.svg',
+        'formats': ['png', 'svg']
+    },
+    'snapchat': {
+        'name': 'Snapchat',
+        'color': '#FFFC00',
+        'filename': 'snapchat.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/snapchat.svg',
+        'formats': ['png', 'svg']
+    },
+    'pinterest': {
+        'name': 'Pinterest',
+        'color': '#E60023',
+        'filename': 'pinterest.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/pinterest.svg',
+        'formats': ['png', 'svg']
+    },
+    'whatsapp': {
+        'name': 'WhatsApp',
+        'color': '#25D366',
+        'filename': 'whatsapp.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/whatsapp.svg',
+        'formats': ['png', 'svg']
+    },
+    'telegram': {
+        'name': 'Telegram',
+        'color': '#26A5E4',
+        'filename': 'telegram.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/telegram.svg',
+        'formats': ['png', 'svg']
+    },
+    'reddit': {
+        'name': 'Reddit',
+        'color': '#FF4500',
+        'filename': 'reddit.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/reddit.svg',
+        'formats': ['png', 'svg']
+    },
+    'github': {
+        'name': 'GitHub',
+        'color': '#181717',
+        'filename': 'github.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/github.svg',
+        'formats': ['png', 'svg']
+    },
+    'discord': {
+        'name': 'Discord',
+        'color': '#5865F2',
+        'filename': 'discord.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/discord.svg',
+        'formats': ['png', 'svg']
+    },
+    'twitch': {
+        'name': 'Twitch',
+        'color': '#9146FF',
+        'filename': 'twitch.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/twitch.svg',
+        'formats': ['png', 'svg']
+    },
+    'vimeo': {
+        'name': 'Vimeo',
+        'color': '#1AB7EA',
+        'filename': 'vimeo.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/vimeo.svg',
+        'formats': ['png', 'svg']
+    },
+    'email': {
+        'name': 'Email',
+        'color': '#EA4335',
+        'filename': 'email.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/gmail.svg',
+        'formats': ['png', 'svg']
+    },
+    'website': {
+        'name': 'Site Web',
+        'color': '#4285F4',
+        'filename': 'website.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/googlechrome.svg',
+        'formats': ['png', 'svg']
+    },
+    'phone': {
+        'name': 'Téléphone',
+        'color': '#0F9D58',
+        'filename': 'phone.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/phone.svg',
+        'formats': ['png', 'svg']
+    },
+    'spotify': {
+        'name': 'Spotify',
+        'color': '#1DB954',
+        'filename': 'spotify.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/spotify.svg',
+        'formats': ['png', 'svg']
+    },
+    'apple': {
+        'name': 'Apple',
+        'color': '#000000',
+        'filename': 'apple.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/apple.svg',
+        'formats': ['png', 'svg']
+    },
+    'google': {
+        'name': 'Google',
+        'color': '#4285F4',
+        'filename': 'google.png',
+        'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/google.svg',
+        'formats': ['png', 'svg']
+    }
+}
+
+# Couleurs RGBA, attributs de remplissage SVG et noms des fichiers SVG précalculés une seule fois au chargement du module
+for _config in ICONS_CONFIG.values():
+    _color = _config['color']
+    _value = int(_color[1:7], 16)
+    _config['color_rgb'] = ((_value >> 16) & 0xFF, (_value >> 8) & 0xFF, _value & 0xFF, 255)
+    _config['svg_filename'] = f"{os.path.splitext(_config['filename'])[0]}.svg"
+    _config['fill_attr'] = f'fill="{_color}"'.encode('ascii')
+del _config, _color, _value
+
+# Vue en lecture seule, jusqu'aux entrées de chaque plateforme : la configuration
+# est partagée par toutes les instances et tous les threads
+ICONS_CONFIG = MappingProxyType({
+    platform: MappingProxyType(dict(config, formats=tuple(config['formats'])))
+    for platform, config in ICONS_CONFIG.items()
+})
+
+# Manifeste des icônes téléchargées, écrit dans le répertoire des icônes
+ICONS_MANIFEST = 'manifest.json'
+
+# Ensemble des fichiers d'icônes attendus dans le répertoire
+EXPECTED_ICON_FILES = frozenset(
+    filename
+    for config in ICONS_CONFIG.values()
+    for filename in (config['filename'], config['svg_filename'] if 'svg' in config['formats'] else None)
+    if filename
+)
+
+
+@lru_cache(maxsize=64)
+def _white_disk(size):
+    """
+    Crée (une seule fois par taille) le fond blanc opaque placé sous les icônes.
+    
+    L'image renvoyée est partagée : elle ne doit pas être modifiée en place.
+    
+    Args:
+        size (int): Côté du fond en pixels
+    
+    Returns:
+        Image: Objet PIL Image en mode RGBA
+    """
+    disk = Image.new('RGBA', (size, size), (255, 255, 255, 255))
+    ImageDraw.Draw(disk).ellipse((0, 0, size - 1, size - 1), fill=(255, 255, 255, 255))
+    return disk
+
+
+def _blend_icon_np(canvas, icon, position):
+    """
+    Fusionne une icône RGBA dans un tableau NumPy RGB ou RGBA opaque (modifié en place).
+    
+    Args:
+        canvas (numpy.ndarray): Image de destination (hauteur, largeur, 3 ou 4) en uint8
+        icon (Image): Icône PIL en mode RGBA
+        position (tuple): Coin supérieur gauche (x, y) de l'icône
+    """
+    x, y = position
+    src = np.asarray(icon)
+    height, width = src.shape[:2]
+    
+    # Découpage de la zone recouverte par l'icône
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, canvas.shape[1]), min(y + height, canvas.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    src = src[y0 - y:y1 - y, x0 - x:x1 - x]
+    dst = canvas[y0:y1, x0:x1]
+    
+    alpha = src[..., 3:4].astype(np.uint16)
+    dst[..., :3] = (src[..., :3] * alpha + dst[..., :3] * (255 - alpha) + 127) // 255
+
+
+# Matrices de modules déjà calculées (encodage Reed-Solomon et choix du masque),
+# indexées par (données, version, correction d'erreur) ; LRU borné
+_MATRIX_CACHE = OrderedDict()
+_MATRIX_CACHE_MAX = 256
+_MATRIX_CACHE_LOCK = threading.Lock()
+
+
+def _get_qr_modules(data, version, error_correction):
+    """
+    Calcule (ou récupère du cache) la matrice de modules d'un QR code.
+    
+    Args:
+        data (str): Données à encoder
+        version (int): Version minimale du QR code
+        error_correction (int): Niveau de correction d'erreur (constante qrcode)
+    
+    Returns:
+        list: Matrice de modules (sans bordure), partagée et à ne pas modifier
+    """
+    key = (data, version, error_correction)
+    with _MATRIX_CACHE_LOCK:
+        modules = _MATRIX_CACHE.get(key)
+        if modules is not None:
+            _MATRIX_CACHE.move_to_end(key)
+            return modules
+    
+    qr = qrcode.QRCode(version=version, error_correction=error_correction)
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    with _MATRIX_CACHE_LOCK:
+        if len(_MATRIX_CACHE) >= _MATRIX_CACHE_MAX:
+            _MATRIX_CACHE.popitem(last=False)
+        _MATRIX_CACHE[key] = qr.modules
+    return qr.modules
+
+
+def _render_qr_modules(modules, box_size, border, fill_color, back_color, mode=None):
+    """
+    Rend une matrice de modules en image, pixel pour pixel comme qrcode.image.pil.PilImage.
+    
+    Args:
+        modules (list): Matrice de modules (sans bordure)
+        box_size (int): Taille de chaque "boîte" en pixels
+        border (int): Taille de la bordure en nombre de boîtes
+        fill_color (str/tuple): Couleur des modules
+        back_color (str/tuple): Couleur d'arrière-plan ('transparent' accepté)
+        mode (str, optional): Mode minimal de l'image produite : 'RGB' évite le
+            mode '1', 'RGBA' force la couche alpha. Évite une conversion ultérieure
+            de l'image complète.
+    
+    Returns:
+        Image: Objet PIL Image (mode '1', RGB ou RGBA selon les couleurs)
+    """
+    # Même choix de mode que qrcode.image.pil.PilImage
+    fill = fill_color.lower() if isinstance(fill_color, str) else fill_color
+    back = back_color.lower() if isinstance(back_color, str) else back_color
+    if fill == 'black' and back == 'white':
+        img_mode, fill, back = '1', 0, 255
+    elif back == 'transparent':
+        img_mode, back = 'RGBA', 0
+    else:
+        img_mode = 'RGB'
+    
+    # Rendu direct dans le mode demandé
+    if mode == 'RGBA' or (mode == 'RGB' and img_mode == '1'):
+        if img_mode == '1':
+            fill, back = 'black', 'white'
+        img_mode = mode
+    
+    count = len(modules)
+    size = count + 2 * border
+    
+    # Masque des modules foncés, à raison d'un pixel par module
+    mask = Image.fromarray(np.array(modules, dtype=bool))
+    
+    img = Image.new(img_mode, (size, size), back)
+    img.paste(fill, (border, border), mask)
+    
+    return img.resize((size * box_size, size * box_size), Image.Resampling.NEAREST)
+
+
+@lru_cache(maxsize=32)
+def _get_font(names, size):
+    """
+    Charge une police TrueType une seule fois par (noms, taille).
+    
+    Args:
+        names (str or tuple): Nom ou chemin du fichier de police, ou polices
+            candidates essayées dans l'ordre
+        size (int): Taille de la police
+    
+    Returns:
+        ImageFont: Première police trouvée, ou la police par défaut si aucune ne l'est
+    """
+    for name in (names,) if isinstance(names, str) else names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+# Polices des icônes de secours (arial sous Windows, DejaVu sous Linux)
+FALLBACK_FONTS = ("arial.ttf", "DejaVuSans-Bold.ttf")
+
+
+def _svg_to_png_bytes(svg_bytes, width, height):
+    """
+    Convertit un SVG en PNG avec cairosvg.
+    
+    Args:
+        svg_bytes (bytes): Contenu SVG
+        width (int): Largeur de sortie en pixels
+        height (int): Hauteur de sortie en pixels
+    
+    Returns:
+        bytes: Contenu PNG
+    
+    Raises:
+        ImportError: Si cairosvg n'est pas disponible
+    """
+    from cairosvg import svg2png
+    
+    return svg2png(bytestring=svg_bytes, output_width=width, output_height=height)
+
+
+def _svg_data_uri(svg_path):
+    """
+    Construit l'URI de données (encodée en URL) d'un fichier SVG.
+    
+    Args:
+        svg_path (str): Chemin du fichier SVG
+    
+    Returns:
+        str: URI de données 'data:image/svg+xml;utf8,...'
+    """
+    with open(svg_path, 'r', encoding='utf-8') as f:
+        return f"data:image/svg+xml;utf8,{quote(f.read())}"
+
+
+def _atomic_write(path, data):
+    """
+    Écrit un fichier de façon atomique : le contenu est écrit dans un fichier
+    temporaire du même répertoire puis renommé, si bien qu'un lecteur concurrent
+    ne voit jamais un fichier partiellement écrit.
+    
+    Args:
+        path (str): Chemin du fichier à écrire
+        data (bytes): Contenu du fichier
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Exécuteur partagé des téléchargements d'icônes lancés en arrière-plan
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='social-icons-prefetch')
+
+# Générateurs réutilisés dans chaque processus de travail de generate_batch
+_worker_generators = {}
+
+
+def _generate_social_qrcode_worker(job):
+    """
+    Génère un QR code social dans un processus de travail.
+    
+    Le générateur (et donc le cache d'icônes) est créé une seule fois par
+    processus et par couple de répertoires.
+    
+    Args:
+        job (tuple): (répertoire de sortie, répertoire des icônes, entrée)
+    
+    Returns:
+        str: Chemin du fichier QR code généré.
+    """
+    output_dir, icons_dir, entry = job
+    
+    generator = _worker_generators.get((output_dir, icons_dir))
+    if generator is None:
+        icon_library = SocialIconLibrary(icons_dir=icons_dir, download_if_missing=False)
+        generator = SocialQRGenerator(output_dir=output_dir, icon_library=icon_library)
+        _worker_generators[(output_dir, icons_dir)] = generator
+    
+    return generator.generate_social_qrcode(**entry)
 
 
 class SocialIconLibrary:
@@ -25,14 +451,22 @@ class SocialIconLibrary:
     Fournit des méthodes pour récupérer et manipuler des icônes de réseaux sociaux.
     """
 
-    def __init__(self, icons_dir=None, download_if_missing=True):
+    def __init__(self, icons_dir=None, download_if_missing=False, preload_sizes=None, lazy=False):
         """
         Initialise la bibliothèque d'icônes de réseaux sociaux.
         
         Args:
             icons_dir (str, optional): Répertoire de stockage des icônes.
                 Si non spécifié, utilise le sous-répertoire 'social_icons' du répertoire courant.
-            download_if_missing (bool): Télécharge automatiquement les icônes manquantes
+            download_if_missing (bool): Télécharge automatiquement les icônes manquantes,
+                en arrière-plan (voir wait_ready). Désactivé par défaut : les icônes
+                sont fournies avec l'application (voir prefetch_social_icons.py),
+                seules les absences sont signalées et une icône PNG absente est
+                remplacée par une icône de secours, sans accès au réseau.
+            preload_sizes (list, optional): Tailles (largeur, hauteur) à préparer dans
+                le cache des icônes redimensionnées, par exemple [(64, 64), (96, 96)]
+            lazy (bool): Décode les icônes à la première utilisation au lieu de les
+                précharger en mémoire
         """
         # Répertoire par défaut des icônes
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -41,184 +475,282 @@ class SocialIconLibrary:
         # Création du répertoire s'il n'existe pas
         os.makedirs(self.icons_dir, exist_ok=True)
         
-        # Configuration des icônes
-        self.icons_config = {
-            'facebook': {
-                'name': 'Facebook',
-                'color': '#1877F2',
-                'filename': 'facebook.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/facebook.svg',
-                'formats': ['png', 'svg']
-            },
-            'twitter': {
-                'name': 'Twitter',
-                'color': '#1DA1F2',
-                'filename': 'twitter.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/twitter.svg',
-                'formats': ['png', 'svg']
-            },
-            'instagram': {
-                'name': 'Instagram',
-                'color': '#E4405F',
-                'filename': 'instagram.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/instagram.svg',
-                'formats': ['png', 'svg']
-            },
-            'linkedin': {
-                'name': 'LinkedIn',
-                'color': '#0A66C2',
-                'filename': 'linkedin.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/linkedin.svg',
-                'formats': ['png', 'svg']
-            },
-            'youtube': {
-                'name': 'YouTube',
-                'color': '#FF0000',
-                'filename': 'youtube.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/youtube.svg',
-                'formats': ['png', 'svg']
-            },
-            'tiktok': {
-                'name': 'TikTok',
-                'color': '#000000',
-                'filename': 'tiktok.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/tiktok.svg',
-                'formats': ['png', 'svg']
-            },
-            'snapchat': {
-                'name': 'Snapchat',
-                'color': '#FFFC00',
-                'filename': 'snapchat.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/snapchat.svg',
-                'formats': ['png', 'svg']
-            },
-            'pinterest': {
-                'name': 'Pinterest',
-                'color': '#E60023',
-                'filename': 'pinterest.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/pinterest.svg',
-                'formats': ['png', 'svg']
-            },
-            'whatsapp': {
-                'name': 'WhatsApp',
-                'color': '#25D366',
-                'filename': 'whatsapp.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/whatsapp.svg',
-                'formats': ['png', 'svg']
-            },
-            'telegram': {
-                'name': 'Telegram',
-                'color': '#26A5E4',
-                'filename': 'telegram.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/telegram.svg',
-                'formats': ['png', 'svg']
-            },
-            'reddit': {
-                'name': 'Reddit',
-                'color': '#FF4500',
-                'filename': 'reddit.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/reddit.svg',
-                'formats': ['png', 'svg']
-            },
-            'github': {
-                'name': 'GitHub',
-                'color': '#181717',
-                'filename': 'github.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/github.svg',
-                'formats': ['png', 'svg']
-            },
-            'discord': {
-                'name': 'Discord',
-                'color': '#5865F2',
-                'filename': 'discord.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/discord.svg',
-                'formats': ['png', 'svg']
-            },
-            'twitch': {
-                'name': 'Twitch',
-                'color': '#9146FF',
-                'filename': 'twitch.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/twitch.svg',
-                'formats': ['png', 'svg']
-            },
-            'vimeo': {
-                'name': 'Vimeo',
-                'color': '#1AB7EA',
-                'filename': 'vimeo.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/vimeo.svg',
-                'formats': ['png', 'svg']
-            },
-            'email': {
-                'name': 'Email',
-                'color': '#EA4335',
-                'filename': 'email.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/gmail.svg',
-                'formats': ['png', 'svg']
-            },
-            'website': {
-                'name': 'Site Web',
-                'color': '#4285F4',
-                'filename': 'website.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/googlechrome.svg',
-                'formats': ['png', 'svg']
-            },
-            'phone': {
-                'name': 'Téléphone',
-                'color': '#0F9D58',
-                'filename': 'phone.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/phone.svg',
-                'formats': ['png', 'svg']
-            },
-            'spotify': {
-                'name': 'Spotify',
-                'color': '#1DB954',
-                'filename': 'spotify.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/spotify.svg',
-                'formats': ['png', 'svg']
-            },
-            'apple': {
-                'name': 'Apple',
-                'color': '#000000',
-                'filename': 'apple.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/apple.svg',
-                'formats': ['png', 'svg']
-            },
-            'google': {
-                'name': 'Google',
-                'color': '#4285F4',
-                'filename': 'google.png',
-                'url': 'https://cdn.jsdelivr.net/npm/simple-icons@v7/icons/google.svg',
-                'formats': ['png', 'svg']
-            }
-        }
-        
-        # Vérification et téléchargement des icônes manquantes
+        # Fichiers présents dans le répertoire : le manifeste, s'il recense toutes
+        # les icônes attendues, évite de parcourir le répertoire ; sinon une seule
+        # lecture du répertoire au lieu d'un stat par fichier (l'ensemble est
+        # complété au fil des téléchargements, toujours en place et sous verrou)
+        self._manifest = self._load_manifest()
+        self._http_validators = {}
+        self._present_files = set()
+        self._present_files_lock = threading.Lock()
+        if EXPECTED_ICON_FILES.issubset(self._manifest):
+            self._present_files.update(self._manifest)
+        else:
+            self._refresh_dir_cache()
+        
+        # Caches des icônes décodées (RGBA) et de leurs versions redimensionnées
+        # (ce dernier est un LRU borné : les entrées les moins récemment utilisées
+        # sont évincées)
+        self._icon_cache = {}
+        self._resized_cache = OrderedDict()
+        self._resized_cache_max = 128
+        self._resized_cache_lock = threading.Lock()
+        self._all_platforms_cache = None
+        self._data_uri_cache = {}
+        
+        # Configuration des icônes (constante de module partagée)
+        self.icons_config = ICONS_CONFIG
+        
+        # Verrou de téléchargement par plateforme : une même icône n'est jamais
+        # téléchargée et écrite deux fois à la fois (voir _download_missing)
+        self._download_locks = {platform: threading.Lock() for platform in self.icons_config}
+        
+        # Session HTTP créée au premier téléchargement (voir _get_session)
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Vérification des icônes manquantes ; leur téléchargement se fait en
+        # arrière-plan pour ne pas bloquer le constructeur (une icône demandée
+        # avant la fin est téléchargée à la demande par get_icon_path, sous le
+        # même verrou de plateforme)
+        self.download_if_missing = download_if_missing
+        self._prefetch_future = None
         if download_if_missing:
-            self.check_and_download_icons()
+            self._prefetch_future = _prefetch_executor.submit(self.check_and_download_icons)
+        else:
+            self.check_and_download_icons(verify_only=True)
+        
+        # Décodage des icônes en mémoire (~3 Mo pour l'ensemble des plateformes)
+        if not lazy:
+            self.preload_icons()
+        
+        # Préchargement des tailles d'icônes courantes
+        for size in preload_sizes or []:
+            for platform in self.icons_config:
+                self.resize_icon(platform, tuple(size))
+    
+    def _refresh_dir_cache(self):
+        """
+        Relit le contenu du répertoire des icônes en un seul appel à os.listdir
+        (sans stat par entrée, coûteux sur les systèmes de fichiers réseau).
+        
+        L'ensemble est complété en place : les fichiers ajoutés par d'autres threads
+        pendant la lecture ne sont pas perdus (la bibliothèque ne supprime jamais
+        d'icône).
+        """
+        filenames = os.listdir(self.icons_dir)
+        with self._present_files_lock:
+            self._present_files.update(filenames)
+    
+    def _mark_present(self, filename):
+        """
+        Signale qu'un fichier vient d'être écrit dans le répertoire des icônes.
+        
+        Args:
+            filename (str): Nom du fichier
+        """
+        with self._present_files_lock:
+            self._present_files.add(filename)
+    
+    def _load_manifest(self):
+        """
+        Charge le manifeste des icônes téléchargées.
+        
+        Returns:
+            dict: Informations par nom de fichier, ou un dictionnaire vide si le
+                manifeste est absent ou illisible
+        """
+        try:
+            with open(os.path.join(self.icons_dir, ICONS_MANIFEST), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+    
+    def _save_manifest(self):
+        """
+        Enregistre le manifeste des icônes présentes dans le répertoire, avec la date
+        de modification de chaque fichier, l'URI de données des SVG et leurs
+        validateurs HTTP (ETag, Last-Modified).
+        """
+        self._refresh_dir_cache()
+        with self._present_files_lock:
+            present_files = sorted(self._present_files & EXPECTED_ICON_FILES)
+        
+        manifest = {}
+        for filename in present_files:
+            path = os.path.join(self.icons_dir, filename)
+            entry = dict(self._manifest.get(filename, {}))
+            entry.update(self._http_validators.get(filename, {}))
+            entry['mtime'] = os.stat(path).st_mtime
+            if filename.endswith('.svg'):
+                # URI de données précalculée pour get_icon_data_uri
+                entry['data_uri'] = _svg_data_uri(path)
+            manifest[filename] = entry
+        
+        try:
+            _atomic_write(os.path.join(self.icons_dir, ICONS_MANIFEST),
+                          json.dumps(manifest, indent=2).encode('utf-8'))
+        except OSError as e:
+            logger.warning("Impossible d'écrire le manifeste des icônes: %s", e)
+            return
+        self._manifest = manifest
+    
+    def wait_ready(self, timeout=None):
+        """
+        Attend la fin du téléchargement des icônes lancé en arrière-plan.
+        
+        Args:
+            timeout (float, optional): Délai maximal d'attente en secondes
+        
+        Returns:
+            list: Couples (plateforme, formats) des icônes qui manquaient, ou une
+                liste vide si aucun téléchargement n'a été lancé
+        """
+        if self._prefetch_future is None:
+            return []
+        return self._prefetch_future.result(timeout)
     
-    def check_and_download_icons(self):
+    def _get_session(self):
+        """
+        Obtient la session HTTP des téléchargements, créée à la première utilisation :
+        requests n'est importé que si une icône doit réellement être téléchargée.
+        
+        La session réutilise les connexions vers le CDN (keep-alive), avec un pool
+        dimensionné pour les téléchargements parallèles.
+        
+        Returns:
+            requests.Session: Session partagée par les téléchargements de l'instance
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=16,
+                    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+                )
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = 'qr-generator/1.0'
+                self._session = session
+            return self._session
+    
+    def close(self):
+        """
+        Ferme la session HTTP utilisée pour les téléchargements, après la fin
+        d'un éventuel téléchargement en arrière-plan.
+        """
+        if self._prefetch_future is not None:
+            self._prefetch_future.exception()
+        if self._session is not None:
+            self._session.close()
+    
+    def __del__(self):
+        session = getattr(self, '_session', None)
+        if session is not None:
+            session.close()
+    
+    def check_and_download_icons(self, verify_only=False):
         """
         Vérifie la présence des icônes et télécharge celles qui sont manquantes.
+        
+        Les téléchargements sont lancés en parallèle (16 au maximum à la fois) et le
+        SVG d'une plateforme n'est téléchargé qu'une fois, même si les deux formats
+        manquent.
+        
+        Args:
+            verify_only (bool): Signale les icônes manquantes sans les télécharger
+        
+        Returns:
+            list: Couples (plateforme, formats) des icônes manquantes avant l'appel
         """
+        missing = []
+        if EXPECTED_ICON_FILES.issubset(self._present_files):
+            return missing
+        
         for platform, config in self.icons_config.items():
+            formats = []
+            
             # Vérification du fichier PNG
-            png_path = os.path.join(self.icons_dir, config['filename'])
-            if not os.path.exists(png_path):
-                self._download_icon(platform)
+            if config['filename'] not in self._present_files:
+                formats.append('png')
             
             # Vérification du fichier SVG
-            svg_filename = f"{os.path.splitext(config['filename'])[0]}.svg"
-            svg_path = os.path.join(self.icons_dir, svg_filename)
-            if not os.path.exists(svg_path) and 'svg' in config.get('formats', []):
-                self._download_icon(platform, 'svg')
+            svg_filename = config['svg_filename']
+            if svg_filename not in self._present_files and 'svg' in config.get('formats', []):
+                formats.append('svg')
+            
+            if formats:
+                missing.append((platform, tuple(formats)))
+        
+        if not missing:
+            return missing
+        
+        if verify_only:
+            logger.warning(
+                "Icônes manquantes dans %s : %s", self.icons_dir,
+                ", ".join(f"{platform} ({'/'.join(formats)})" for platform, formats in missing)
+            )
+            return missing
+        
+        # Chaque téléchargement écrit son propre fichier : ils peuvent se chevaucher.
+        # La conversion SVG -> PNG se fait dans le thread du téléchargement : cette
+        # méthode s'exécute sur le thread de préchargement, et créer un pool de
+        # processus (fork) depuis un processus multithread risque un interblocage
+        with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+            list(executor.map(lambda job: self._download_missing(*job), missing))
+        
+        self._save_manifest()
+        return missing
+    
+    def _download_missing(self, platform, format_type='png'):
+        """
+        Télécharge les formats encore absents de l'icône d'une plateforme.
+        
+        Le téléchargement se fait sous le verrou de la plateforme : si un autre
+        thread (téléchargement en arrière-plan ou get_icon_path) produit déjà
+        l'icône, l'appel attend sa fin et ignore les formats devenus présents.
+        
+        Args:
+            platform (str): Nom de la plateforme
+            format_type (str or tuple): Format de l'icône ('png' ou 'svg'), ou plusieurs
+                formats produits à partir d'un seul téléchargement
+        
+        Returns:
+            bool: True si les formats demandés sont présents ou ont été téléchargés,
+                False sinon
+        """
+        if platform not in self.icons_config:
+            return False
+        
+        config = self.icons_config[platform]
+        formats = (format_type,) if isinstance(format_type, str) else tuple(format_type)
+        
+        with self._download_locks[platform]:
+            formats = tuple(
+                fmt for fmt in formats
+                if (config['svg_filename'] if fmt == 'svg' else config['filename'])
+                not in self._present_files
+            )
+            if not formats:
+                return True
+            return self._download_icon(platform, formats)
     
     def _download_icon(self, platform, format_type='png'):
         """
         Télécharge l'icône d'une plateforme spécifique.
         
+        Le SVG n'est récupéré qu'une fois, puis chaque format demandé est produit à
+        partir des mêmes octets.
+        
         Args:
             platform (str): Nom de la plateforme
-            format_type (str): Format de l'icône ('png' ou 'svg')
+            format_type (str or tuple): Format de l'icône ('png' ou 'svg'), ou plusieurs
+                formats produits à partir d'un seul téléchargement
         
         Returns:
             bool: True si le téléchargement réussit, False sinon
@@ -226,32 +758,17 @@ class SocialIconLibrary:
         if platform not in self.icons_config:
             return False
         
-        config = self.icons_config[platform]
-        url = config['url']
+        formats = (format_type,) if isinstance(format_type, str) else tuple(format_type)
         
         try:
-            # Téléchargement de l'icône
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            svg_bytes = self._fetch_svg(platform, refresh='svg' in formats)
             
-            if format_type == 'svg':
-                # Sauvegarde directe du SVG
-                svg_filename = f"{os.path.splitext(config['filename'])[0]}.svg"
-                svg_path = os.path.join(self.icons_dir, svg_filename)
-                with open(svg_path, 'wb') as f:
-                    f.write(response.content)
-            else:
-                # Conversion du SVG en PNG coloré
+            if 'svg' in formats:
+                self._write_svg(platform, svg_bytes)
+            
+            if 'png' in formats:
                 try:
-                    from cairosvg import svg2png
-                    
-                    # Modifier la couleur du SVG
-                    svg_content = response.text
-                    svg_content = svg_content.replace('fill="currentColor"', f'fill="{config["color"]}"')
-                    
-                    # Convertir en PNG
-                    png_path = os.path.join(self.icons_dir, config['filename'])
-                    svg2png(bytestring=svg_content.encode('utf-8'), write_to=png_path, output_width=200, output_height=200)
+                    self._rasterize_to_png(platform, svg_bytes)
                 except ImportError:
                     # Si cairosvg n'est pas disponible, créer une icône de secours
                     self._create_fallback_icon(platform)
@@ -259,14 +776,147 @@ class SocialIconLibrary:
             return True
             
         except Exception as e:
-            print(f"Erreur lors du téléchargement de l'icône {platform}: {e}")
+            logger.warning("Erreur lors du téléchargement de l'icône %s: %s", platform, e)
             
             # Création d'une icône de secours
-            if format_type == 'png':
+            if 'png' in formats:
                 self._create_fallback_icon(platform)
             
             return False
     
+    def _fetch_svg(self, platform, refresh=False):
+        """
+        Récupère le contenu SVG d'une plateforme : depuis le répertoire s'il y est
+        déjà (sans requête réseau), sinon depuis le CDN.
+        
+        Args:
+            platform (str): Nom de la plateforme
+            refresh (bool): Télécharge le SVG même s'il est présent localement
+        
+        Returns:
+            bytes: Contenu SVG
+        """
+        config = self.icons_config[platform]
+        svg_filename = config['svg_filename']
+        
+        if not refresh and svg_filename in self._present_files:
+            with open(os.path.join(self.icons_dir, svg_filename), 'rb') as f:
+                return f.read()
+        
+        response = self._get_session().get(config['url'], timeout=10)
+        response.raise_for_status()
+        self._remember_validators(svg_filename, response)
+        return response.content
+    
+    def _remember_validators(self, svg_filename, response):
+        """
+        Conserve les validateurs HTTP d'un SVG téléchargé, enregistrés dans le
+        manifeste pour les requêtes conditionnelles de refresh_icons.
+        
+        Args:
+            svg_filename (str): Nom du fichier SVG
+            response (requests.Response): Réponse du CDN
+        """
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['last_modified'] = response.headers['Last-Modified']
+        self._http_validators[svg_filename] = validators
+    
+    def refresh_icons(self):
+        """
+        Retélécharge les icônes modifiées sur le CDN depuis leur dernier téléchargement.
+        
+        Les requêtes sont conditionnelles (If-None-Match / If-Modified-Since, à partir
+        des validateurs du manifeste) : une icône inchangée ne renvoie qu'une réponse
+        304 sans contenu.
+        
+        Returns:
+            list: Plateformes dont l'icône a été mise à jour
+        """
+        def refresh(platform):
+            config = self.icons_config[platform]
+            entry = self._manifest.get(config['svg_filename'], {})
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            
+            try:
+                response = self._get_session().get(config['url'], headers=headers, timeout=10)
+                if response.status_code == 304:
+                    return False
+                response.raise_for_status()
+                
+                self._remember_validators(config['svg_filename'], response)
+                with self._download_locks[platform]:
+                    if 'svg' in config['formats']:
+                        self._write_svg(platform, response.content)
+                    try:
+                        self._rasterize_to_png(platform, response.content)
+                    except ImportError:
+                        # Sans cairosvg, le PNG existant est conservé
+                        pass
+                return True
+            except Exception as e:
+                logger.warning("Erreur lors de la mise à jour de l'icône %s: %s", platform, e)
+                return False
+        
+        platforms = list(self.icons_config)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            changes = executor.map(refresh, platforms)
+            updated = [platform for platform, changed in zip(platforms, changes) if changed]
+        
+        # Les versions décodées des icônes mises à jour ne sont plus valides
+        for platform in updated:
+            self._icon_cache.pop(platform, None)
+            self._data_uri_cache.pop(platform, None)
+        if updated:
+            with self._resized_cache_lock:
+                for key in [key for key in self._resized_cache if key[0] in updated]:
+                    del self._resized_cache[key]
+        
+        self._save_manifest()
+        return updated
+    
+    def _write_svg(self, platform, svg_bytes):
+        """
+        Enregistre le SVG d'une plateforme tel quel (écriture atomique).
+        
+        Args:
+            platform (str): Nom de la plateforme
+            svg_bytes (bytes): Contenu SVG
+        """
+        svg_filename = self.icons_config[platform]['svg_filename']
+        _atomic_write(os.path.join(self.icons_dir, svg_filename), svg_bytes)
+        self._mark_present(svg_filename)
+    
+    def _rasterize_to_png(self, platform, svg_bytes):
+        """
+        Convertit le SVG d'une plateforme en PNG coloré de 200x200 pixels
+        (écriture atomique).
+        
+        Args:
+            platform (str): Nom de la plateforme
+            svg_bytes (bytes): Contenu SVG
+        
+        Raises:
+            ImportError: Si cairosvg n'est pas disponible
+        """
+        config = self.icons_config[platform]
+        
+        # Modifier la couleur du SVG (directement sur les octets, sans
+        # décodage ni réencodage du texte)
+        svg_bytes = svg_bytes.replace(b'fill="currentColor"', config['fill_attr'])
+        
+        # Convertir en PNG
+        png_bytes = _svg_to_png_bytes(svg_bytes, 200, 200)
+        
+        _atomic_write(os.path.join(self.icons_dir, config['filename']), png_bytes)
+        self._mark_present(config['filename'])
+    
     def _create_fallback_icon(self, platform):
         """
         Crée une icône de secours pour une plateforme.
@@ -281,56 +931,57 @@ class SocialIconLibrary:
         
         # Création d'une image avec la première lettre
         size = 200
-        img = Image.new('RGBA', (size, size), color=(0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
         
-        # Dessin du cercle de fond
-        color = config.get('color', '#000000')
-        if color.startswith('#'):
-            # Conversion hex en RGB
-            r = int(color[1:3], 16)
-            g = int(color[3:5], 16)
-            b = int(color[5:7], 16)
-            color_rgb = (r, g, b, 255)
-        else:
-            color_rgb = (0, 0, 0, 255)
+        # Couleur du cercle de fond (précalculée au chargement du module)
+        color_rgb = config.get('color_rgb', (0, 0, 0, 255))
+        
+        # Dessin du cercle de fond (masque du disque calculé en une seule
+        # opération vectorisée)
+        radius = size / 2
+        yy, xx = np.ogrid[:size, :size]
+        disk = (xx + 0.5 - radius) ** 2 + (yy + 0.5 - radius) ** 2 <= radius ** 2
+        pixels = np.zeros((size, size, 4), dtype=np.uint8)
+        pixels[disk] = color_rgb
+        img = Image.fromarray(pixels, 'RGBA')
         
-        # Dessiner le cercle
-        draw.ellipse((0, 0, size, size), fill=color_rgb)
+        draw = ImageDraw.Draw(img)
         
         # Ajouter la lettre
         letter = config.get('name', platform)[0].upper()
         
-        # Utiliser une police par défaut
-        font_size = size // 2
-        try:
-            # Essayer de charger une police
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            # Sinon utiliser la police par défaut
-            font = ImageFont.load_default()
+        # Police mise en cache (arial si disponible, sinon la police par défaut)
+        font = _get_font(FALLBACK_FONTS, size // 2)
         
-        # Calculer la position du texte pour le centrer
-        text_width, text_height = draw.textsize(letter, font=font) if hasattr(draw, 'textsize') else font.getsize(letter)
-        position = ((size - text_width) // 2, (size - text_height) // 2)
+        # Calculer la position du texte pour le centrer (textbbox donne largeur et
+        # hauteur réelles ; textsize/getsize n'existent plus depuis Pillow 10)
+        left, top, right, bottom = draw.textbbox((0, 0), letter, font=font)
+        position = ((size - (right - left)) // 2 - left, (size - (bottom - top)) // 2 - top)
         
         # Dessiner le texte
         draw.text(position, letter, fill=(255, 255, 255, 255), font=font)
         
-        # Sauvegarder l'image
-        png_path = os.path.join(self.icons_dir, config['filename'])
-        img.save(png_path)
+        # Sauvegarder l'image (écriture atomique)
+        # Écrite une seule fois : compression maximale pour réduire le fichier servi
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', optimize=True)
+        _atomic_write(os.path.join(self.icons_dir, config['filename']), buffer.getvalue())
+        self._mark_present(config['filename'])
     
     def get_icon_path(self, platform, format_type='png'):
         """
         Obtient le chemin d'une icône de réseau social.
         
+        Une icône absente est téléchargée si download_if_missing est activé ;
+        sinon, une icône de secours est créée pour le format PNG et aucun SVG
+        n'est renvoyé.
+        
         Args:
             platform (str): Nom de la plateforme ('facebook', 'twitter', etc.)
             format_type (str): Format de l'icône ('png' ou 'svg')
         
         Returns:
-            str: Chemin de l'icône, ou None si la plateforme n'existe pas
+            str: Chemin de l'icône, ou None si la plateforme n'existe pas ou si
+                l'icône est indisponible
         """
         if platform not in self.icons_config:
             return None
@@ -338,21 +989,72 @@ class SocialIconLibrary:
         config = self.icons_config[platform]
         
         if format_type == 'svg':
-            filename = f"{os.path.splitext(config['filename'])[0]}.svg"
+            filename = config['svg_filename']
         else:
             filename = config['filename']
         
         icon_path = os.path.join(self.icons_dir, filename)
         
-        # Vérifier si l'icône existe
-        if not os.path.exists(icon_path):
-            if self._download_icon(platform, format_type):
-                return icon_path
-            else:
+        # Vérifier si l'icône existe (instantané du répertoire, relu une fois en
+        # cas d'absence pour prendre en compte les fichiers ajoutés depuis)
+        if filename not in self._present_files:
+            self._refresh_dir_cache()
+        if filename not in self._present_files:
+            if not self.download_if_missing:
+                # Pas de téléchargement sur le chemin des requêtes
+                logger.warning("Icône %s absente de %s (téléchargement désactivé)",
+                               filename, self.icons_dir)
+                if format_type == 'svg':
+                    return None
+                with self._download_locks[platform]:
+                    if filename not in self._present_files:
+                        self._create_fallback_icon(platform)
+            elif not self._download_missing(platform, format_type):
                 return None
         
         return icon_path
     
+    def get_icon_data_uri(self, platform):
+        """
+        Obtient l'icône d'une plateforme sous forme d'URI de données, à intégrer
+        directement dans du HTML ou du CSS.
+        
+        Le SVG est privilégié (quelques centaines d'octets, net à toute résolution)
+        et encodé en URL, plus compact que le base64 pour du texte ; le PNG encodé
+        en base64 sert de solution de repli. L'URI précalculée dans le manifeste
+        (voir prefetch_social_icons.py) est utilisée si elle existe, et le
+        résultat est mis en cache.
+        
+        Args:
+            platform (str): Nom de la plateforme ('facebook', 'twitter', etc.)
+        
+        Returns:
+            str: URI de données de l'icône, ou None si l'icône est indisponible
+        """
+        data_uri = self._data_uri_cache.get(platform)
+        if data_uri is not None:
+            return data_uri
+        
+        if platform in self.icons_config:
+            svg_filename = self.icons_config[platform]['svg_filename']
+            data_uri = self._manifest.get(svg_filename, {}).get('data_uri')
+            if data_uri is not None:
+                self._data_uri_cache[platform] = data_uri
+                return data_uri
+        
+        svg_path = self.get_icon_path(platform, 'svg')
+        if svg_path:
+            data_uri = _svg_data_uri(svg_path)
+        else:
+            png_path = self.get_icon_path(platform)
+            if not png_path:
+                return None
+            with open(png_path, 'rb') as f:
+                data_uri = f"data:image/png;base64,{base64.b64encode(f.read()).decode('ascii')}"
+        
+        self._data_uri_cache[platform] = data_uri
+        return data_uri
+    
     def get_icon_color(self, platform):
         """
         Obtient la couleur officielle d'une plateforme sociale.
@@ -385,9 +1087,15 @@ class SocialIconLibrary:
         """
         Obtient la liste de toutes les plateformes disponibles.
         
+        La liste ne dépend que de la configuration (immuable) : elle est construite
+        au premier appel puis partagée, et ne doit pas être modifiée en place.
+        
         Returns:
             list: Liste des plateformes avec leurs informations
         """
+        if self._all_platforms_cache is not None:
+            return self._all_platforms_cache
+        
         platforms = []
         for platform, config in self.icons_config.items():
             icon_url = f"/static/img/social_icons/{config['filename']}"
@@ -398,29 +1106,90 @@ class SocialIconLibrary:
                 'icon_url': icon_url
             })
         
+        self._all_platforms_cache = platforms
         return platforms
     
-    def resize_icon(self, platform, size=(64, 64)):
+    def preload_icons(self):
         """
-        Redimensionne une icône à la taille spécifiée.
+        Décode en mémoire (RGBA) toutes les icônes PNG présentes dans le répertoire,
+        afin que les générations suivantes n'accèdent plus au disque.
+        
+        Les icônes absentes ne sont pas téléchargées ; elles seront chargées à la
+        première utilisation.
+        """
+        for platform, config in self.icons_config.items():
+            if platform in self._icon_cache or config['filename'] not in self._present_files:
+                continue
+            try:
+                with Image.open(os.path.join(self.icons_dir, config['filename'])) as img:
+                    self._icon_cache[platform] = img.convert('RGBA')
+            except OSError as e:
+                logger.warning("Impossible de précharger l'icône %s: %s", platform, e)
+    
+    def get_icon_image(self, platform):
+        """
+        Obtient l'icône décodée d'une plateforme, mise en cache après le premier chargement.
+        
+        L'image renvoyée est partagée : elle ne doit pas être modifiée en place.
         
         Args:
             platform (str): Nom de la plateforme
-            size (tuple): Dimensions (largeur, hauteur)
         
         Returns:
-            Image: Objet PIL Image contenant l'icône redimensionnée
+            Image: Objet PIL Image en mode RGBA, ou None si l'icône est indisponible
         """
+        icon = self._icon_cache.get(platform)
+        if icon is not None:
+            return icon
+        
         icon_path = self.get_icon_path(platform)
         if not icon_path:
             return None
         
+        with Image.open(icon_path) as img:
+            icon = img.convert('RGBA')
+        
+        self._icon_cache[platform] = icon
+        return icon
+    
+    def resize_icon(self, platform, size=(64, 64), resample=Image.Resampling.BICUBIC):
+        """
+        Redimensionne une icône à la taille spécifiée.
+        
+        Les versions redimensionnées sont mises en cache par (plateforme, taille, filtre) ;
+        l'image renvoyée est partagée et ne doit pas être modifiée en place.
+        
+        Args:
+            platform (str): Nom de la plateforme
+            size (tuple): Dimensions (largeur, hauteur)
+            resample (int): Filtre de rééchantillonnage PIL (BICUBIC par défaut,
+                LANCZOS pour une qualité maximale)
+        
+        Returns:
+            Image: Objet PIL Image contenant l'icône redimensionnée
+        """
+        key = (platform, size[0], size[1], resample)
+        with self._resized_cache_lock:
+            icon = self._resized_cache.get(key)
+            if icon is not None:
+                self._resized_cache.move_to_end(key)
+                return icon
+        
         try:
-            img = Image.open(icon_path)
-            return img.resize(size, Image.LANCZOS)
-        except Exception as e:
-            print(f"Erreur lors du redimensionnement de l'icône {platform}: {e}")
+            img = self.get_icon_image(platform)
+            if img is None:
+                return None
+            # Réduction rapide par facteur entier avant le filtre final
+            icon = img.resize(size, resample, reducing_gap=2.0)
+        except Exception:
+            logger.exception("Erreur lors du redimensionnement de l'icône %s", platform)
             return None
+        
+        with self._resized_cache_lock:
+            if len(self._resized_cache) >= self._resized_cache_max:
+                self._resized_cache.popitem(last=False)
+            self._resized_cache[key] = icon
+        return icon
 
 
 class SocialQRGenerator:
@@ -450,6 +1219,16 @@ class SocialQRGenerator:
         # Création du répertoire de métadonnées
         self.metadata_dir = os.path.join(self.output_dir, 'metadata')
         os.makedirs(self.metadata_dir, exist_ok=True)
+        
+        # Table des positions d'icône : (largeur QR, hauteur QR, largeur badge,
+        # hauteur badge, bordure, taille de boîte) -> coin supérieur gauche du badge
+        self._position_fns = {
+            'center': lambda w, h, iw, ih, b, bs: ((w - iw) // 2, (h - ih) // 2),
+            'top_left': lambda w, h, iw, ih, b, bs: (b * bs, b * bs),
+            'top_right': lambda w, h, iw, ih, b, bs: (w - iw - b * bs, b * bs),
+            'bottom_left': lambda w, h, iw, ih, b, bs: (b * bs, h - ih - b * bs),
+            'bottom_right': lambda w, h, iw, ih, b, bs: (w - iw - b * bs, h - ih - b * bs)
+        }
     
     def generate_social_qrcode(self, data, platform, filename=None, **options):
         """
@@ -465,16 +1244,26 @@ class SocialQRGenerator:
                 - error_correction (int): Niveau de correction d'erreur
                 - box_size (int): Taille de chaque "boîte" du QR code en pixels
                 - border (int): Taille de la bordure en nombre de boîtes
+                - target_size (int): Taille de sortie souhaitée en pixels ; remplace
+                  box_size par la plus grande taille de boîte qui y tient
                 - fill_color (str/tuple): Couleur de remplissage (remplace la couleur de la plateforme)
                 - back_color (str/tuple): Couleur d'arrière-plan du QR code
                 - add_icon (bool): Ajouter l'icône de la plateforme au centre du QR code
                 - icon_size (float): Taille de l'icône en pourcentage du QR code (0.0-1.0)
+                - resample_filter (int): Filtre PIL de redimensionnement de l'icône
+                  (Image.Resampling.BICUBIC par défaut)
+                - icon_position (str): Position de l'icône ('center', 'top_left',
+                  'top_right', 'bottom_left', 'bottom_right')
+                - skip_metadata (bool): Ne pas écrire le fichier de métadonnées
+                - png_compress_level (int): Niveau de compression PNG de 0 à 9 (1 par défaut)
+                - output_format (str): Format de sortie ('png' par défaut, ou 'webp'
+                  sans perte)
             
         Returns:
             str: Chemin du fichier QR code généré.
         """
         if not filename:
-            filename = f"social_qrcode_{platform}_{uuid.uuid4().hex}.png"
+            filename = f"social_qrcode_{platform}_{uuid.uuid4().hex}.{self._output_extension(options)}"
         
         # Chemin complet du fichier de sortie
         output_path = os.path.join(self.output_dir, filename)
@@ -504,64 +1293,86 @@ class SocialQRGenerator:
         
         back_color = options.get('back_color', "white")
         
-        # Génération du QR code
-        qr = qrcode.QRCode(
-            version=version,
-            error_correction=error_correction,
-            box_size=box_size,
-            border=border,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        # Matrice du QR code (mise en cache : seules les options visuelles varient
+        # d'un appel à l'autre pour les mêmes données)
+        modules = _get_qr_modules(data, version, error_correction)
+        
+        # Taille de boîte déduite de la taille cible (évite un redimensionnement final)
+        if options.get('target_size'):
+            box_size = max(1, int(options['target_size']) // (len(modules) + 2 * border))
         
-        # Génération de l'image QR code
-        qr_img = qr.make_image(fill_color=fill_color, back_color=back_color).convert('RGBA')
+        # Génération de l'image QR code, directement en RGB (RGBA si le fond est
+        # transparent) lorsqu'une icône doit y être collée
+        add_icon = options.get('add_icon', True)
+        render_mode = 'RGB' if add_icon else None
+        qr_img = _render_qr_modules(modules, box_size, border, fill_color, back_color, render_mode)
         
         # Ajout de l'icône de la plateforme si demandé
-        if options.get('add_icon', True):
-            # Récupération de l'icône
-            icon_size_percent = float(options.get('icon_size', 0.2))  # 20% par défaut
-            qr_width, qr_height = qr_img.size
-            icon_size = int(min(qr_width, qr_height) * icon_size_percent)
-            
-            # Redimensionnement de l'icône
-            icon = self.icon_library.resize_icon(platform, (icon_size, icon_size))
-            
-            if icon:
-                # Position de l'icône (centre)
-                icon_pos = ((qr_width - icon_size) // 2, (qr_height - icon_size) // 2)
-                
-                # Création d'un cercle blanc pour le fond de l'icône
-                circle = Image.new('RGBA', (icon_size + 20, icon_size + 20), (255, 255, 255, 255))
-                
-                # Dessiner un cercle blanc parfait
-                circle_draw = ImageDraw.Draw(circle)
-                circle_draw.ellipse((0, 0, icon_size + 19, icon_size + 19), fill=(255, 255, 255, 255))
-                
-                # Placer l'icône au centre du cercle
-                circle.paste(icon, (10, 10), icon)
-                
-                # Position du cercle (centre)
-                circle_pos = ((qr_width - icon_size - 20) // 2, (qr_height - icon_size - 20) // 2)
-                
-                # Superposition du cercle sur le QR code
-                qr_img.paste(circle, circle_pos, circle)
-        
-        # Sauvegarde de l'image finale
-        qr_img.save(output_path)
-        
-        # Enregistrement des métadonnées
-        metadata = {
-            'data': data,
-            'platform': platform,
-            'platform_name': self.icon_library.get_platform_name(platform),
-            'platform_color': fill_color,
-            **options
-        }
-        self._save_metadata(metadata, output_path)
+        if add_icon:
+            try:
+                qr_img = self._add_platform_icon(qr_img, platform, border, box_size, options)
+            except Exception:
+                # L'image d'origine n'a pas été modifiée : on la sauvegarde sans icône
+                logger.exception("Erreur lors de l'ajout de l'icône %s", platform)
+        
+        # Sauvegarde de l'image finale (compression zlib rapide par défaut)
+        self._save_image(qr_img, output_path, options)
+        
+        # Enregistrement des métadonnées (sauf si l'appelant n'en a pas besoin)
+        if not options.get('skip_metadata'):
+            metadata = {
+                'data': data,
+                'platform': platform,
+                'platform_name': self.icon_library.get_platform_name(platform),
+                'platform_color': fill_color,
+                **options
+            }
+            self._save_metadata(metadata, output_path)
         
         return output_path
     
+    def _add_platform_icon(self, qr_img, platform, border, box_size, options):
+        """
+        Ajoute l'icône d'une plateforme, sur un fond blanc, à une copie du QR code.
+        
+        Args:
+            qr_img (Image): Image du QR code (non modifiée)
+            platform (str): Plateforme sociale
+            border (int): Taille de la bordure en nombre de boîtes
+            box_size (int): Taille de chaque "boîte" du QR code en pixels
+            options (dict): Options de generate_social_qrcode
+        
+        Returns:
+            Image: Nouvelle image avec l'icône, ou l'image d'origine si l'icône est indisponible
+        """
+        # Récupération de l'icône
+        icon_size_percent = float(options.get('icon_size', 0.2))  # 20% par défaut
+        qr_size = qr_img.size[0]  # Le QR code est toujours carré
+        icon_size = int(qr_size * icon_size_percent)
+        badge_size = icon_size + 20
+        
+        # Redimensionnement de l'icône
+        icon = self.icon_library.resize_icon(
+            platform, (icon_size, icon_size), options.get('resample_filter', Image.Resampling.BICUBIC)
+        )
+        
+        if not icon:
+            return qr_img
+        
+        # Position du fond de l'icône
+        position_fn = self._position_fns.get(
+            options.get('icon_position', 'center'), self._position_fns['center']
+        )
+        circle_pos = position_fn(qr_size, qr_size, badge_size, badge_size, border, box_size)
+        
+        # Fond blanc et fusion de l'icône directement dans une copie des pixels
+        # (le QR code d'origine reste intact)
+        canvas = np.array(qr_img)
+        x, y = circle_pos
+        canvas[max(y, 0):y + badge_size, max(x, 0):x + badge_size] = 255
+        _blend_icon_np(canvas, icon, (x + 10, y + 10))
+        return Image.fromarray(canvas, qr_img.mode)
+    
     def generate_multi_social_qrcode(self, data, platforms, filename=None, **options):
         """
         Génère un QR code avec plusieurs icônes sociales.
@@ -576,16 +1387,24 @@ class SocialQRGenerator:
                 - error_correction (int): Niveau de correction d'erreur
                 - box_size (int): Taille de chaque "boîte" du QR code en pixels
                 - border (int): Taille de la bordure en nombre de boîtes
+                - target_size (int): Taille de sortie souhaitée en pixels ; remplace
+                  box_size par la plus grande taille de boîte qui y tient
                 - fill_color (str/tuple): Couleur de remplissage du QR code
                 - back_color (str/tuple): Couleur d'arrière-plan du QR code
                 - layout (str): Disposition des icônes ('circle', 'line', 'grid')
                 - icon_size (float): Taille des icônes en pourcentage du QR code
+                - resample_filter (int): Filtre PIL de redimensionnement des icônes
+                  (Image.Resampling.BICUBIC par défaut)
+                - skip_metadata (bool): Ne pas écrire le fichier de métadonnées
+                - png_compress_level (int): Niveau de compression PNG de 0 à 9 (1 par défaut)
+                - output_format (str): Format de sortie ('png' par défaut, ou 'webp'
+                  sans perte)
             
         Returns:
             str: Chemin du fichier QR code généré.
         """
         if not filename:
-            filename = f"multi_social_qrcode_{uuid.uuid4().hex}.png"
+            filename = f"multi_social_qrcode_{uuid.uuid4().hex}.{self._output_extension(options)}"
         
         # Chemin complet du fichier de sortie
         output_path = os.path.join(self.output_dir, filename)
@@ -620,43 +1439,39 @@ class SocialQRGenerator:
         fill_color = options.get('fill_color', "black")
         back_color = options.get('back_color', "white")
         
-        # Génération du QR code
-        qr = qrcode.QRCode(
-            version=version,
-            error_correction=error_correction,
-            box_size=box_size,
-            border=border,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        # Matrice du QR code (mise en cache : seules les options visuelles varient
+        # d'un appel à l'autre pour les mêmes données)
+        modules = _get_qr_modules(data, version, error_correction)
         
-        # Génération de l'image QR code
-        qr_img = qr.make_image(fill_color=fill_color, back_color=back_color).convert('RGBA')
-        qr_width, qr_height = qr_img.size
+        # Taille de boîte déduite de la taille cible (évite un redimensionnement final)
+        if options.get('target_size'):
+            box_size = max(1, int(options['target_size']) // (len(modules) + 2 * border))
+        
+        # Génération de l'image QR code, directement en RGBA
+        qr_img = _render_qr_modules(modules, box_size, border, fill_color, back_color, 'RGBA')
+        
+        # Grandeurs dérivées de la taille (le QR code est toujours carré)
+        qr_size = qr_img.size[0]
+        half = qr_size // 2
         
         # Disposition des icônes
         layout = options.get('layout', 'circle').lower()
         
         # Taille des icônes individuelles
         icon_size_percent = float(options.get('icon_size', 0.15))  # 15% par défaut pour plusieurs icônes
-        base_icon_size = int(min(qr_width, qr_height) * icon_size_percent)
+        base_icon_size = int(qr_size * icon_size_percent)
+        half_icon = base_icon_size // 2
         
         # Nombre d'icônes
         num_icons = len(valid_platforms)
         
         # Création d'un masque blanc au centre du QR code
-        mask_size = int(min(qr_width, qr_height) * 0.4)  # Taille du masque central
-        mask = Image.new('RGBA', (mask_size, mask_size), (255, 255, 255, 255))
-        
-        # Création d'un masque circulaire
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, mask_size - 1, mask_size - 1), fill=(255, 255, 255, 255))
+        mask_size = int(qr_size * 0.4)  # Taille du masque central
+        mask = _white_disk(mask_size)
         
         # Position du masque (centre)
-        mask_pos = ((qr_width - mask_size) // 2, (qr_height - mask_size) // 2)
-        
-        # Superposition du masque sur le QR code
-        qr_img.paste(mask, mask_pos, mask)
+        mask_offset = (qr_size - mask_size) // 2
+        mask_pos = (mask_offset, mask_offset)
         
         # Positions des icônes selon la disposition
         icon_positions = []
@@ -664,24 +1479,22 @@ class SocialQRGenerator:
         if layout == 'circle':
             # Disposition en cercle
             radius = mask_size // 3
-            center_x = qr_width // 2
-            center_y = qr_height // 2
             
-            for i in range(num_icons):
-                angle = 2 * math.pi * i / num_icons
-                x = center_x + int(radius * math.cos(angle)) - base_icon_size // 2
-                y = center_y + int(radius * math.sin(angle)) - base_icon_size // 2
-                icon_positions.append((x, y))
+            # Calcul vectorisé de toutes les positions
+            angles = np.linspace(0, 2 * np.pi, num_icons, endpoint=False)
+            xs = half + (radius * np.cos(angles)).astype(int) - half_icon
+            ys = half + (radius * np.sin(angles)).astype(int) - half_icon
+            icon_positions = list(zip(xs.tolist(), ys.tolist()))
                 
         elif layout == 'line':
             # Disposition en ligne horizontale
             total_width = num_icons * base_icon_size
-            start_x = (qr_width - total_width) // 2
-            y = qr_height // 2 - base_icon_size // 2
+            start_x = (qr_size - total_width) // 2
+            y = half - half_icon
             
-            for i in range(num_icons):
-                x = start_x + i * base_icon_size
-                icon_positions.append((x, y))
+            # Calcul vectorisé de toutes les positions
+            xs = start_x + np.arange(num_icons) * base_icon_size
+            icon_positions = [(x, y) for x in xs.tolist()]
                 
         elif layout == 'grid':
             # Disposition en grille
@@ -694,49 +1507,127 @@ class SocialQRGenerator:
             grid_height = rows * base_icon_size
             
             # Position de départ (centre)
-            start_x = (qr_width - grid_width) // 2
-            start_y = (qr_height - grid_height) // 2
+            start_x = (qr_size - grid_width) // 2
+            start_y = (qr_size - grid_height) // 2
             
-            for i in range(num_icons):
-                col = i % cols
-                row = i // cols
-                x = start_x + col * base_icon_size
-                y = start_y + row * base_icon_size
-                icon_positions.append((x, y))
+            # Calcul vectorisé de toutes les positions
+            indices = np.arange(num_icons)
+            xs = start_x + (indices % cols) * base_icon_size
+            ys = start_y + (indices // cols) * base_icon_size
+            icon_positions = list(zip(xs.tolist(), ys.tolist()))
         
         else:
             # Disposition par défaut (une seule icône au centre)
-            icon_positions = [((qr_width - base_icon_size) // 2, (qr_height - base_icon_size) // 2)]
+            icon_positions = [((qr_size - base_icon_size) // 2, (qr_size - base_icon_size) // 2)]
         
-        # Ajout des icônes
-        for i, platform in enumerate(valid_platforms):
-            if i >= len(icon_positions):
-                break
+        try:
+            # Superposition du masque sur le QR code
+            qr_img.alpha_composite(mask, dest=mask_pos)
+        
+            # Redimensionnement des icônes en parallèle (le rééchantillonnage PIL
+            # libère le GIL), une seule fois par plateforme distincte
+            resample_filter = options.get('resample_filter', Image.Resampling.BICUBIC)
+            icon_box = (base_icon_size, base_icon_size)
+            unique_platforms = list(dict.fromkeys(valid_platforms[:len(icon_positions)]))
+            if len(unique_platforms) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(unique_platforms))) as executor:
+                    icons = dict(zip(unique_platforms, executor.map(
+                        lambda p: self.icon_library.resize_icon(p, icon_box, resample_filter),
+                        unique_platforms
+                    )))
+            else:
+                icons = {p: self.icon_library.resize_icon(p, icon_box, resample_filter)
+                         for p in unique_platforms}
+            
+            # Ajout des icônes (fusion vectorisée avec NumPy si le fond est opaque)
+            canvas = None
+            if qr_img.getextrema()[3][0] == 255:
+                canvas = np.array(qr_img)
+        
+            for i, platform in enumerate(valid_platforms):
+                if i >= len(icon_positions):
+                    break
                 
-            # Récupération de l'icône
-            icon = self.icon_library.resize_icon(platform, (base_icon_size, base_icon_size))
+                # Récupération de l'icône
+                icon = icons[platform]
             
-            if icon:
-                # Position de l'icône
-                icon_pos = icon_positions[i]
+                if icon:
+                    # Position de l'icône
+                    icon_pos = icon_positions[i]
                 
-                # Superposition de l'icône sur le QR code
-                qr_img.paste(icon, icon_pos, icon)
-        
-        # Sauvegarde de l'image finale
-        qr_img.save(output_path)
-        
-        # Enregistrement des métadonnées
-        metadata = {
-            'data': data,
-            'platforms': valid_platforms,
-            'layout': layout,
-            **options
-        }
-        self._save_metadata(metadata, output_path)
+                    # Superposition de l'icône sur le QR code
+                    if canvas is not None:
+                        _blend_icon_np(canvas, icon, icon_pos)
+                    else:
+                        qr_img.alpha_composite(icon, dest=icon_pos)
+        
+            if canvas is not None:
+                qr_img = Image.fromarray(canvas, 'RGBA')
+        except Exception:
+            logger.exception("Erreur lors de l'ajout des icônes %s", ', '.join(valid_platforms))
+            qr_img = _render_qr_modules(modules, box_size, border, fill_color, back_color, 'RGBA')
+        
+        # Sauvegarde de l'image finale (compression zlib rapide par défaut)
+        self._save_image(qr_img, output_path, options)
+        
+        # Enregistrement des métadonnées (sauf si l'appelant n'en a pas besoin)
+        if not options.get('skip_metadata'):
+            metadata = {
+                'data': data,
+                'platforms': valid_platforms,
+                'layout': layout,
+                **options
+            }
+            self._save_metadata(metadata, output_path)
         
         return output_path
     
+    def generate_batch(self, entries, max_workers=None):
+        """
+        Génère plusieurs QR codes sociaux en parallèle dans un pool de processus.
+        
+        Les processus sont démarrés avec 'spawn' : un fork depuis un processus
+        multithread (serveur web, threads de téléchargement ou de rendu) peut
+        copier un verrou détenu par un autre thread et bloquer les processus.
+        
+        Args:
+            entries (list): Liste de dictionnaires d'arguments pour generate_social_qrcode
+                ('data', 'platform', et éventuellement 'filename' et les options)
+            max_workers (int, optional): Nombre de processus. Si non spécifié,
+                utilise le nombre de processeurs.
+        
+        Returns:
+            list: Chemins des fichiers générés, dans l'ordre des entrées.
+        """
+        jobs = [(self.output_dir, self.icon_library.icons_dir, entry) for entry in entries]
+        
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(_generate_social_qrcode_worker, jobs))
+    
+    @staticmethod
+    def _output_extension(options):
+        """Extension des fichiers générés selon l'option output_format"""
+        return 'webp' if options.get('output_format', 'png').lower() == 'webp' else 'png'
+    
+    def _save_image(self, qr_img, output_path, options):
+        """
+        Enregistre le QR code généré.
+        
+        Le PNG est encodé avec une compression zlib rapide (niveau 1 par défaut) ;
+        le WebP sans perte est proposé comme alternative plus compacte.
+        
+        Args:
+            qr_img (PIL.Image): Image du QR code
+            output_path (str): Chemin du fichier de sortie
+            options (dict): Options de génération (output_format, png_compress_level)
+        """
+        if self._output_extension(options) == 'webp':
+            qr_img.save(output_path, format='WEBP', lossless=True, quality=0)
+        else:
+            qr_img.save(output_path, format='PNG', optimize=False,
+                        compress_level=int(options.get('png_compress_level', 1)))
+    
     def _save_metadata(self, metadata, output_path):
         """
         Enregistre les métadonnées du QR code généré.
@@ -750,16 +1641,13 @@ class SocialQRGenerator:
         metadata_filename = f"{os.path.splitext(qr_filename)[0]}.txt"
         metadata_path = os.path.join(self.metadata_dir, metadata_filename)
         
-        # Création du contenu des métadonnées
+        # Création du contenu des métadonnées en une seule passe
         metadata_content = [
-            f"Date de création: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Date de création: {datetime.now():%Y-%m-%d %H:%M:%S}",
             f"Fichier: {qr_filename}",
+            *(f"{key}: {value}" for key, value in metadata.items())
         ]
         
-        # Ajout des métadonnées
-        for key, value in metadata.items():
-            metadata_content.append(f"{key}: {value}")
-        
-        # Écriture des métadonnées dans le fichier
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(metadata_content))
+        # Écriture des métadonnées en une seule opération (le répertoire est créé dans __init__)
+        with open(metadata_path, 'wb') as f:
+            f.write('\n'.join(metadata_content).encode('utf-8'))
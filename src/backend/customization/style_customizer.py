@@ -8,8 +8,10 @@ personnaliser l'apparence des QR codes, similaire à QR Code Monkey.
 """
 
 import os
-import uuid
-from datetime import datetime
+import secrets
+import logging
+from io import BytesIO
+from functools import lru_cache
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import (
@@ -27,7 +29,61 @@ from qrcode.image.styles.colormasks import (
     HorizontalGradiantColorMask,
     VerticalGradiantColorMask
 )
-from PIL import Image, ImageDraw, ImageColor, ImageFont, ImageFilter, ImageOps, ImageChops
+from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageOps, ImageChops
+from src.backend.customization.color_utils import color_mask_kwargs, parse_color
+from src.backend.customization.metadata_journal import MetadataJournal
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def _star_offsets(size):
+    """
+    Décalages (par rapport au centre) des sommets de l'œil en étoile à 4 branches,
+    calculés une seule fois par taille.
+    
+    Args:
+        size (int): Taille de l'œil
+    
+    Returns:
+        tuple: Décalages (dx, dy) des 8 sommets du polygone
+    """
+    outer_radius = size // 2
+    inner_radius = size // 4
+    
+    # Sommets externes (rayon extérieur) et internes (rayon intérieur) alternés
+    offsets = (
+        (0, -outer_radius),  # haut
+        (inner_radius // 2, -(inner_radius // 2)),  # diagonale
+        (outer_radius, 0),  # droite
+        (inner_radius // 2, inner_radius // 2)  # diagonale
+    )
+    return offsets * 2
+
+
+@lru_cache(maxsize=1)
+def _preview_qrcode():
+    """
+    Construit une seule fois le QR code commun aux prévisualisations.
+    
+    L'objet renvoyé est partagé : make_image ne fait que lire sa matrice.
+    
+    Returns:
+        QRCode: QR code compilé encodant "PREVIEW"
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data("PREVIEW")
+    qr.make(fit=True)
+    return qr
+
+
+# Nombre maximal de masques de couleur conservés par instance
+_COLOR_MASK_CACHE_MAX = 64
 
 
 class AdvancedQRStyleGenerator:
@@ -37,7 +93,7 @@ class AdvancedQRStyleGenerator:
     similaires à QR Code Monkey.
     """
 
-    def __init__(self, output_dir=None, templates_dir=None):
+    def __init__(self, output_dir=None, templates_dir=None, legacy_metadata=False):
         """
         Initialise le générateur de styles de QR codes.
         
@@ -46,6 +102,8 @@ class AdvancedQRStyleGenerator:
                 Si non spécifié, utilise le répertoire courant.
             templates_dir (str, optional): Répertoire contenant les templates de styles.
                 Si non spécifié, utilise le sous-répertoire 'styles' du répertoire courant.
+            legacy_metadata (bool): Écrit un fichier texte de métadonnées par QR code
+                au lieu d'une ligne dans le journal metadata/index.jsonl
         """
         # Répertoire de sortie par défaut
         self.output_dir = output_dir or os.path.join(os.getcwd(), 'generated_qrcodes')
@@ -54,16 +112,39 @@ class AdvancedQRStyleGenerator:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.templates_dir = templates_dir or os.path.join(current_dir, '..', '..', 'frontend', 'static', 'img', 'styles')
         
-        # Création des répertoires s'ils n'existent pas
-        os.makedirs(self.output_dir, exist_ok=True)
+        # Création des répertoires s'ils n'existent pas (métadonnées comprises,
+        # une seule fois plutôt qu'à chaque QR code)
+        self.metadata_dir = os.path.join(self.output_dir, 'metadata')
+        os.makedirs(self.metadata_dir, exist_ok=True)
         os.makedirs(self.templates_dir, exist_ok=True)
         
+        # Masques de couleur déjà construits, par classe et arguments
+        self._color_mask_cache = {}
+        
+        # Prévisualisations impossibles à générer (par catégorie) et catégories
+        # dont toutes les prévisualisations ont déjà été traitées
+        self._failed_previews = {}
+        self._checked_preview_categories = set()
+        
+        # Journal des métadonnées, ouvert à la première écriture et tamponné
+        self.legacy_metadata = legacy_metadata
+        self._metadata_journal = MetadataJournal(self.metadata_dir, legacy=legacy_metadata)
+        
         # Initialisation des dictionnaires de styles
         self._init_module_drawers()
         self._init_color_masks()
         self._init_eye_shapes()
         self._init_frame_shapes()
         self._init_predefined_styles()
+        
+        # Méthodes de dessin de chaque forme d'œil et de contour (une recherche dans
+        # un dictionnaire au lieu d'une suite de comparaisons de chaînes)
+        self._eye_drawers = {
+            shape_id: getattr(self, f'_draw_eye_{shape_id}') for shape_id in self.eye_shapes
+        }
+        self._frame_drawers = {
+            shape_id: getattr(self, f'_draw_frame_{shape_id}') for shape_id in self.frame_shapes
+        }
     
     def _init_module_drawers(self):
         """
@@ -143,12 +224,6 @@ class AdvancedQRStyleGenerator:
                 'preview': os.path.join(self.templates_dir, 'module_shapes', 'pixel.png')
             }
         }
-        
-        # Création des prévisualisations manquantes
-        for style_id, style_info in self.module_drawers.items():
-            if not os.path.exists(style_info['preview']):
-                os.makedirs(os.path.dirname(style_info['preview']), exist_ok=True)
-                self._generate_module_preview(style_id)
     
     def _init_color_masks(self):
         """
@@ -198,12 +273,6 @@ class AdvancedQRStyleGenerator:
                 'preview': os.path.join(self.templates_dir, 'color_masks', 'rainbow.png')
             }
         }
-        
-        # Création des prévisualisations manquantes
-        for mask_id, mask_info in self.color_masks.items():
-            if not os.path.exists(mask_info['preview']):
-                os.makedirs(os.path.dirname(mask_info['preview']), exist_ok=True)
-                self._generate_color_mask_preview(mask_id)
     
     def _init_eye_shapes(self):
         """
@@ -261,12 +330,6 @@ class AdvancedQRStyleGenerator:
                 'preview': os.path.join(self.templates_dir, 'eye_shapes', 'leaf.png')
             }
         }
-        
-        # Création des prévisualisations manquantes
-        for shape_id, shape_info in self.eye_shapes.items():
-            if not os.path.exists(shape_info['preview']):
-                os.makedirs(os.path.dirname(shape_info['preview']), exist_ok=True)
-                self._generate_eye_preview(shape_id)
     
     def _init_frame_shapes(self):
         """
@@ -324,12 +387,6 @@ class AdvancedQRStyleGenerator:
                 'preview': os.path.join(self.templates_dir, 'frame_shapes', 'pixel.png')
             }
         }
-        
-        # Création des prévisualisations manquantes
-        for shape_id, shape_info in self.frame_shapes.items():
-            if not os.path.exists(shape_info['preview']):
-                os.makedirs(os.path.dirname(shape_info['preview']), exist_ok=True)
-                self._generate_frame_preview(shape_id)
     
     def _init_predefined_styles(self):
         """
@@ -498,12 +555,135 @@ class AdvancedQRStyleGenerator:
                 'preview': os.path.join(self.templates_dir, 'vintage.png')
             }
         }
+    
+    def _preview_source(self, category):
+        """
+        Entrées et générateur de prévisualisation d'une catégorie.
         
-        # Création des prévisualisations manquantes
-        for style_id, style_info in self.predefined_styles.items():
-            if not os.path.exists(style_info['preview']):
-                os.makedirs(os.path.dirname(style_info['preview']), exist_ok=True)
-                self._generate_style_preview(style_id)
+        Args:
+            category (str): Catégorie ('module', 'color_mask', 'eye', 'frame' ou 'style')
+        
+        Returns:
+            tuple: (dictionnaire des entrées, méthode de génération de la prévisualisation)
+        """
+        sources = {
+            'module': (self.module_drawers, self._generate_module_preview),
+            'color_mask': (self.color_masks, self._generate_color_mask_preview),
+            'eye': (self.eye_shapes, self._generate_eye_preview),
+            'frame': (self.frame_shapes, self._generate_frame_preview),
+            'style': (self.predefined_styles, self._generate_style_preview)
+        }
+        if category not in sources:
+            raise ValueError(f"Catégorie '{category}' non reconnue. Catégories disponibles: {', '.join(sources)}")
+        return sources[category]
+    
+    def get_preview_path(self, category, style_id):
+        """
+        Obtient le chemin de la prévisualisation d'un style, générée à la demande.
+        
+        Les prévisualisations ne sont plus générées à la construction : seule celle
+        demandée est créée si elle n'existe pas encore.
+        
+        Args:
+            category (str): Catégorie ('module', 'color_mask', 'eye', 'frame' ou 'style')
+            style_id (str): Identifiant du style dans la catégorie
+        
+        Returns:
+            str: Chemin du fichier de prévisualisation, ou None si elle n'a pas pu
+                être générée
+        """
+        entries, generate_preview = self._preview_source(category)
+        preview_path = entries[style_id]['preview']
+        if not os.path.exists(preview_path):
+            os.makedirs(os.path.dirname(preview_path), exist_ok=True)
+            if not self._generate_preview(category, style_id, generate_preview):
+                return None
+        return preview_path
+    
+    def _ensure_previews(self, category):
+        """
+        Génère les prévisualisations manquantes d'une catégorie.
+        
+        Les répertoires ne sont listés qu'au premier appel pour chaque catégorie ;
+        une prévisualisation en échec est journalisée et n'est plus retentée.
+        
+        Args:
+            category (str): Catégorie ('module', 'color_mask', 'eye', 'frame' ou 'style')
+        """
+        if category in self._checked_preview_categories:
+            return
+        
+        entries, generate_preview = self._preview_source(category)
+        for entry_id in self._missing_previews(entries):
+            self._generate_preview(category, entry_id, generate_preview)
+        self._checked_preview_categories.add(category)
+    
+    def _generate_preview(self, category, entry_id, generate_preview):
+        """
+        Génère une prévisualisation, sans propager une éventuelle erreur.
+        
+        Args:
+            category (str): Catégorie de l'entrée
+            entry_id (str): Identifiant de l'entrée dans la catégorie
+            generate_preview: Méthode de génération de la prévisualisation
+        
+        Returns:
+            bool: True si la prévisualisation a été générée
+        """
+        failed = self._failed_previews.setdefault(category, set())
+        if entry_id in failed:
+            return False
+        
+        try:
+            generate_preview(entry_id)
+        except Exception as e:
+            logger.warning("Prévisualisation '%s' (%s) impossible à générer: %s",
+                           entry_id, category, e, exc_info=True)
+            failed.add(entry_id)
+            return False
+        return True
+    
+    def _preview_url(self, category, entry_id, entry_info):
+        """
+        URL relative de la prévisualisation d'une entrée.
+        
+        Args:
+            category (str): Catégorie de l'entrée
+            entry_id (str): Identifiant de l'entrée dans la catégorie
+            entry_info (dict): Informations de l'entrée (clé 'preview')
+        
+        Returns:
+            str: Chemin relatif au répertoire des templates, ou None si la
+                prévisualisation n'a pas pu être générée
+        """
+        if entry_id in self._failed_previews.get(category, ()):
+            return None
+        return os.path.relpath(entry_info['preview'], self.templates_dir)
+    
+    def _missing_previews(self, entries):
+        """
+        Identifie les entrées dont la prévisualisation n'existe pas encore.
+        
+        Chaque répertoire de prévisualisations est créé et listé une seule fois,
+        plutôt qu'un appel à os.path.exists par entrée.
+        
+        Args:
+            entries (dict): Entrées (styles, masques, formes) indexées par identifiant,
+                avec le chemin de leur prévisualisation sous la clé 'preview'
+        
+        Returns:
+            list: Identifiants des entrées sans prévisualisation
+        """
+        listings = {}
+        missing = []
+        for entry_id, entry_info in entries.items():
+            directory, name = os.path.split(entry_info['preview'])
+            if directory not in listings:
+                os.makedirs(directory, exist_ok=True)
+                listings[directory] = set(os.listdir(directory))
+            if name not in listings[directory]:
+                missing.append(entry_id)
+        return missing
     
     def _generate_module_preview(self, module_style_id):
         """
@@ -519,15 +699,8 @@ class AdvancedQRStyleGenerator:
         drawer_info = self.module_drawers[module_style_id]
         drawer = drawer_info['drawer']
         
-        # Génération d'un QR code simple
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data("PREVIEW")
-        qr.make(fit=True)
+        # QR code simple, encodé une seule fois pour toutes les prévisualisations
+        qr = _preview_qrcode()
         
         # Création de l'image avec le style spécifié
         img = qr.make_image(
@@ -556,30 +729,11 @@ class AdvancedQRStyleGenerator:
         mask_info = self.color_masks[mask_id]
         mask_class = mask_info['class']
         
-        # Configuration des couleurs pour la prévisualisation
-        if mask_id == 'solid':
-            mask = mask_class(front_color=(0, 0, 0), back_color=(255, 255, 255))
-        elif mask_id == 'rainbow':
-            mask = mask_class(back_color=(255, 255, 255))
-        elif mask_id in ['radial_gradient', 'square_gradient', 'diagonal_gradient']:
-            mask = mask_class(center_color=(0, 102, 204), edge_color=(0, 51, 153), back_color=(255, 255, 255))
-        elif mask_id == 'horizontal_gradient':
-            mask = mask_class(left_color=(255, 102, 0), right_color=(204, 0, 0), back_color=(255, 255, 255))
-        elif mask_id == 'vertical_gradient':
-            mask = mask_class(top_color=(0, 153, 0), bottom_color=(0, 51, 0), back_color=(255, 255, 255))
-        else:
-            # Masque par défaut
-            mask = SolidFillColorMask(front_color=(0, 0, 0), back_color=(255, 255, 255))
+        # Couleurs par défaut du masque pour la prévisualisation
+        mask = self._get_color_mask(mask_class, color_mask_kwargs(mask_id, {}))
         
-        # Génération d'un QR code simple
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data("PREVIEW")
-        qr.make(fit=True)
+        # QR code simple, encodé une seule fois pour toutes les prévisualisations
+        qr = _preview_qrcode()
         
         # Création de l'image avec le masque spécifié
         img = qr.make_image(
@@ -653,19 +807,23 @@ class AdvancedQRStyleGenerator:
         # Récupération des informations du style
         style_info = self.predefined_styles[style_id]
         
-        # Génération d'un QR code avec le style spécifié
-        qr_code = self.apply_predefined_style(
-            "PREVIEW",
-            style_id,
-            None,
-            save_to_file=True,
-            output_path=style_info['preview']
-        )
+        # Génération en mémoire du QR code avec le style spécifié (ni PNG pleine
+        # taille, ni métadonnées)
+        img = self.apply_predefined_style("PREVIEW", style_id, save_to_file=False)
+        
+        # Redimensionnement pour la prévisualisation
+        img = img.resize((100, 100), Image.LANCZOS)
+        
+        # Sauvegarde de l'image (compression zlib rapide)
+        img.save(style_info['preview'], optimize=False, compress_level=1)
     
     def _draw_eye_shape(self, draw, shape_id, x, y, size, color):
         """
         Dessine un œil de QR code avec une forme spécifique.
         
+        La forme est dessinée par sa méthode dédiée (table de correspondance
+        construite à l'initialisation) ; une forme inconnue donne un œil carré.
+        
         Args:
             draw: Objet ImageDraw
             shape_id (str): Identifiant de la forme
@@ -673,308 +831,247 @@ class AdvancedQRStyleGenerator:
             size: Taille de l'œil
             color: Couleur de l'œil
         """
+        self._eye_drawers.get(shape_id, self._draw_eye_square)(draw, x, y, size, color)
+    
+    def _draw_eye_square(self, draw, x, y, size, color):
+        """Dessine un œil carré."""
+        # Carré extérieur
+        draw.rectangle([x, y, x + size, y + size], fill=color)
+        # Carré intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        draw.rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
+        # Carré central
+        center_size = size // 5
+        center_x = x + (size - center_size) // 2
+        center_y = y + (size - center_size) // 2
+        draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
+    
+    def _draw_eye_circle(self, draw, x, y, size, color):
+        """Dessine un œil circulaire."""
+        # Cercle extérieur
+        draw.ellipse([x, y, x + size, y + size], fill=color)
+        # Cercle intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        draw.ellipse([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
+        # Cercle central
+        center_size = size // 5
+        center_x = x + (size - center_size) // 2
+        center_y = y + (size - center_size) // 2
+        draw.ellipse([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
+    
+    def _draw_eye_rounded(self, draw, x, y, size, color):
+        """Dessine un œil arrondi."""
+        # Rectangle arrondi (coins dessinés par rounded_rectangle, en une seule passe)
+        radius = size // 5
+        draw.rounded_rectangle([x, y, x + size, y + size], radius, fill=color)
+        # Intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        inner_radius = inner_size // 5
+        draw.rounded_rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], inner_radius, fill='white')
+        # Centre
+        center_size = size // 5
+        center_x = x + (size - center_size) // 2
+        center_y = y + (size - center_size) // 2
+        center_radius = center_size // 5
+        draw.rounded_rectangle([center_x, center_y, center_x + center_size, center_y + center_size], center_radius, fill=color)
+    
+    def _draw_eye_diamond(self, draw, x, y, size, color):
+        """Dessine un œil en losange."""
+        # Points du losange extérieur
+        points = [
+            (x + size // 2, y),  # haut
+            (x + size, y + size // 2),  # droite
+            (x + size // 2, y + size),  # bas
+            (x, y + size // 2)  # gauche
+        ]
+        draw.polygon(points, fill=color)
+        
+        # Points du losange intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_offset = (size - inner_size) // 2
+        inner_points = [
+            (x + size // 2, y + inner_offset),  # haut
+            (x + size - inner_offset, y + size // 2),  # droite
+            (x + size // 2, y + size - inner_offset),  # bas
+            (x + inner_offset, y + size // 2)  # gauche
+        ]
+        draw.polygon(inner_points, fill='white')
+        
+        # Points du losange central
+        center_size = size // 5
+        center_offset = (size - center_size) // 2
+        center_points = [
+            (x + size // 2, y + center_offset),  # haut
+            (x + size - center_offset, y + size // 2),  # droite
+            (x + size // 2, y + size - center_offset),  # bas
+            (x + center_offset, y + size // 2)  # gauche
+        ]
+        draw.polygon(center_points, fill=color)
+    
+    def _draw_eye_cushion(self, draw, x, y, size, color):
+        """Dessine un œil en coussin."""
+        # Forme de coussin
+        draw.rectangle([x, y, x + size, y + size], fill=color)
+        # Arrondir les coins
+        radius = size // 3
+        # Créer un effet de "coussin" en arrondissant les coins
+        draw.pieslice([x - radius, y - radius, x + radius, y + radius], 0, 90, fill='white')
+        draw.pieslice([x + size - radius, y - radius, x + size + radius, y + radius], 90, 180, fill='white')
+        draw.pieslice([x - radius, y + size - radius, x + radius, y + size + radius], 270, 360, fill='white')
+        draw.pieslice([x + size - radius, y + size - radius, x + size + radius, y + size + radius], 180, 270, fill='white')
+        
+        # Intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        draw.rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
+        
+        # Centre
+        center_size = size // 5
+        center_x = x + (size - center_size) // 2
+        center_y = y + (size - center_size) // 2
+        draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
+    
+    def _draw_eye_star(self, draw, x, y, size, color):
+        """Dessine un œil en étoile à 4 branches."""
+        # Étoile à 4 branches
+        # Centre de l'étoile
+        cx, cy = x + size // 2, y + size // 2
+        
+        # Points de l'étoile (décalages précalculés pour cette taille)
+        points = [(cx + dx, cy + dy) for dx, dy in _star_offsets(size)]
+        
+        # Dessiner l'étoile
+        draw.polygon(points, fill=color)
+        
+        # Centre vide
+        inner_size = size // 3
+        draw.ellipse([cx - inner_size//2, cy - inner_size//2, cx + inner_size//2, cy + inner_size//2], fill='white')
+        
         # Point central
+        center_size = size // 10
+        draw.ellipse([cx - center_size//2, cy - center_size//2, cx + center_size//2, cy + center_size//2], fill=color)
+    
+    def _draw_eye_dots(self, draw, x, y, size, color):
+        """Dessine un œil entouré de points."""
+        # Coordonnées du centre
+        cx, cy = x + size // 2, y + size // 2
+        radius = size // 2
+        small_radius = size // 8
+        
+        # Dessiner le cercle extérieur
+        draw.ellipse([x, y, x + size, y + size], fill=color)
+        
+        # Dessiner le cercle intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        draw.ellipse([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
+        
+        # Dessiner les points autour du cercle
+        num_dots = 8
+        dot_radius = size // 16
+        for i in range(num_dots):
+            angle = i * (360 / num_dots)
+            dot_x = cx + int(radius * 0.6 * cos(angle * pi / 180))
+            dot_y = cy + int(radius * 0.6 * sin(angle * pi / 180))
+            draw.ellipse([dot_x - dot_radius, dot_y - dot_radius, dot_x + dot_radius, dot_y + dot_radius], fill=color)
+        
+        # Dessiner le point central
+        draw.ellipse([cx - small_radius, cy - small_radius, cx + small_radius, cy + small_radius], fill=color)
+    
+    def _draw_eye_rounded_rect(self, draw, x, y, size, color):
+        """Dessine un œil en rectangle aux coins arrondis."""
+        # Rectangle aux coins arrondis
+        radius = size // 8
+        draw.rounded_rectangle([x, y, x + size, y + size], radius, fill=color)
+        
+        # Rectangle intérieur (vide), aux coins arrondis
+        inner_size = size * 3 // 5
+        inner_x = x + (size - inner_size) // 2
+        inner_y = y + (size - inner_size) // 2
+        inner_radius = inner_size // 8
+        draw.rounded_rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], inner_radius, fill='white')
+        
+        # Rectangle central
+        center_size = size // 5
+        center_x = x + (size - center_size) // 2
+        center_y = y + (size - center_size) // 2
+        draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
+    
+    def _draw_eye_flower(self, draw, x, y, size, color):
+        """Dessine un œil en fleur."""
+        # Coordonnées du centre
         cx, cy = x + size // 2, y + size // 2
+        radius = size // 2
         
-        if shape_id == 'square':
-            # Carré extérieur
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-            # Carré intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            draw.rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
-            # Carré central
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
-            
-        elif shape_id == 'circle':
-            # Cercle extérieur
-            draw.ellipse([x, y, x + size, y + size], fill=color)
-            # Cercle intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            draw.ellipse([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
-            # Cercle central
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            draw.ellipse([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
-            
-        elif shape_id == 'rounded':
-            # Rectangle arrondi
-            radius = size // 5
-            # Dessiner un rectangle
-            draw.rectangle([x + radius, y, x + size - radius, y + size], fill=color)
-            draw.rectangle([x, y + radius, x + size, y + size - radius], fill=color)
-            # Ajouter les coins arrondis
-            draw.pieslice([x, y, x + radius * 2, y + radius * 2], 180, 270, fill=color)
-            draw.pieslice([x + size - radius * 2, y, x + size, y + radius * 2], 270, 0, fill=color)
-            draw.pieslice([x, y + size - radius * 2, x + radius * 2, y + size], 90, 180, fill=color)
-            draw.pieslice([x + size - radius * 2, y + size - radius * 2, x + size, y + size], 0, 90, fill=color)
-            # Intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            inner_radius = inner_size // 5
-            # Rectangle intérieur
-            draw.rectangle([inner_x + inner_radius, inner_y, inner_x + inner_size - inner_radius, inner_y + inner_size], fill='white')
-            draw.rectangle([inner_x, inner_y + inner_radius, inner_x + inner_size, inner_y + inner_size - inner_radius], fill='white')
-            # Coins arrondis intérieurs
-            draw.pieslice([inner_x, inner_y, inner_x + inner_radius * 2, inner_y + inner_radius * 2], 180, 270, fill='white')
-            draw.pieslice([inner_x + inner_size - inner_radius * 2, inner_y, inner_x + inner_size, inner_y + inner_radius * 2], 270, 0, fill='white')
-            draw.pieslice([inner_x, inner_y + inner_size - inner_radius * 2, inner_x + inner_radius * 2, inner_y + inner_size], 90, 180, fill='white')
-            draw.pieslice([inner_x + inner_size - inner_radius * 2, inner_y + inner_size - inner_radius * 2, inner_x + inner_size, inner_y + inner_size], 0, 90, fill='white')
-            # Centre
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            center_radius = center_size // 5
-            # Rectangle central
-            draw.rectangle([center_x + center_radius, center_y, center_x + center_size - center_radius, center_y + center_size], fill=color)
-            draw.rectangle([center_x, center_y + center_radius, center_x + center_size, center_y + center_size - center_radius], fill=color)
-            # Coins arrondis centraux
-            draw.pieslice([center_x, center_y, center_x + center_radius * 2, center_y + center_radius * 2], 180, 270, fill=color)
-            draw.pieslice([center_x + center_size - center_radius * 2, center_y, center_x + center_size, center_y + center_radius * 2], 270, 0, fill=color)
-            draw.pieslice([center_x, center_y + center_size - center_radius * 2, center_x + center_radius * 2, center_y + center_size], 90, 180, fill=color)
-            draw.pieslice([center_x + center_size - center_radius * 2, center_y + center_size - center_radius * 2, center_x + center_size, center_y + center_size], 0, 90, fill=color)
-            
-        elif shape_id == 'diamond':
-            # Points du losange extérieur
-            points = [
-                (x + size // 2, y),  # haut
-                (x + size, y + size // 2),  # droite
-                (x + size // 2, y + size),  # bas
-                (x, y + size // 2)  # gauche
-            ]
-            draw.polygon(points, fill=color)
-            
-            # Points du losange intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_offset = (size - inner_size) // 2
-            inner_points = [
-                (x + size // 2, y + inner_offset),  # haut
-                (x + size - inner_offset, y + size // 2),  # droite
-                (x + size // 2, y + size - inner_offset),  # bas
-                (x + inner_offset, y + size // 2)  # gauche
-            ]
-            draw.polygon(inner_points, fill='white')
-            
-            # Points du losange central
-            center_size = size // 5
-            center_offset = (size - center_size) // 2
-            center_points = [
-                (x + size // 2, y + center_offset),  # haut
-                (x + size - center_offset, y + size // 2),  # droite
-                (x + size // 2, y + size - center_offset),  # bas
-                (x + center_offset, y + size // 2)  # gauche
-            ]
-            draw.polygon(center_points, fill=color)
-            
-        elif shape_id == 'cushion':
-            # Forme de coussin
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-            # Arrondir les coins
-            radius = size // 3
-            # Créer un effet de "coussin" en arrondissant les coins
-            draw.pieslice([x - radius, y - radius, x + radius, y + radius], 0, 90, fill='white')
-            draw.pieslice([x + size - radius, y - radius, x + size + radius, y + radius], 90, 180, fill='white')
-            draw.pieslice([x - radius, y + size - radius, x + radius, y + size + radius], 270, 360, fill='white')
-            draw.pieslice([x + size - radius, y + size - radius, x + size + radius, y + size + radius], 180, 270, fill='white')
-            
-            # Intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            draw.rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
-            
-            # Centre
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
-            
-        elif shape_id == 'star':
-            # Étoile à 4 branches
-            # Centre de l'étoile
-            cx, cy = x + size // 2, y + size // 2
-            outer_radius = size // 2
-            inner_radius = size // 4
-            
-            # Points de l'étoile
-            points = []
-            for i in range(8):
-                angle = i * 45  # 45 degrés entre chaque point
-                radius = outer_radius if i % 2 == 0 else inner_radius
-                px = cx + int(radius * (i % 2 == 0))  # points externes
-                py = cy + int(radius * (i % 2 == 1))  # points internes
-                if i % 4 == 0:  # haut
-                    px = cx
-                    py = cy - radius
-                elif i % 4 == 1:  # diagonale
-                    px = cx + radius // 2
-                    py = cy - radius // 2
-                elif i % 4 == 2:  # droite
-                    px = cx + radius
-                    py = cy
-                elif i % 4 == 3:  # diagonale
-                    px = cx + radius // 2
-                    py = cy + radius // 2
-                points.append((px, py))
-            
-            # Dessiner l'étoile
-            draw.polygon(points, fill=color)
-            
-            # Centre vide
-            inner_size = size // 3
-            draw.ellipse([cx - inner_size//2, cy - inner_size//2, cx + inner_size//2, cy + inner_size//2], fill='white')
-            
-            # Point central
-            center_size = size // 10
-            draw.ellipse([cx - center_size//2, cy - center_size//2, cx + center_size//2, cy + center_size//2], fill=color)
-            
-        elif shape_id == 'dots':
-            # Coordonnées du centre
-            cx, cy = x + size // 2, y + size // 2
-            radius = size // 2
-            small_radius = size // 8
-            
-            # Dessiner le cercle extérieur
-            draw.ellipse([x, y, x + size, y + size], fill=color)
-            
-            # Dessiner le cercle intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            draw.ellipse([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
-            
-            # Dessiner les points autour du cercle
-            num_dots = 8
-            dot_radius = size // 16
-            for i in range(num_dots):
-                angle = i * (360 / num_dots)
-                dot_x = cx + int(radius * 0.6 * cos(angle * pi / 180))
-                dot_y = cy + int(radius * 0.6 * sin(angle * pi / 180))
-                draw.ellipse([dot_x - dot_radius, dot_y - dot_radius, dot_x + dot_radius, dot_y + dot_radius], fill=color)
-            
-            # Dessiner le point central
-            draw.ellipse([cx - small_radius, cy - small_radius, cx + small_radius, cy + small_radius], fill=color)
-            
-        elif shape_id == 'rounded_rect':
-            # Rectangle aux coins arrondis
-            radius = size // 8
-            
-            # Rectangle principal
-            draw.rectangle([x + radius, y, x + size - radius, y + size], fill=color)
-            draw.rectangle([x, y + radius, x + size, y + size - radius], fill=color)
-            
-            # Coins arrondis
-            draw.pieslice([x, y, x + radius * 2, y + radius * 2], 180, 270, fill=color)
-            draw.pieslice([x + size - radius * 2, y, x + size, y + radius * 2], 270, 0, fill=color)
-            draw.pieslice([x, y + size - radius * 2, x + radius * 2, y + size], 90, 180, fill=color)
-            draw.pieslice([x + size - radius * 2, y + size - radius * 2, x + size, y + size], 0, 90, fill=color)
-            
-            # Rectangle intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            inner_radius = inner_size // 8
-            
-            # Rectangle intérieur
-            draw.rectangle([inner_x + inner_radius, inner_y, inner_x + inner_size - inner_radius, inner_y + inner_size], fill='white')
-            draw.rectangle([inner_x, inner_y + inner_radius, inner_x + inner_size, inner_y + inner_size - inner_radius], fill='white')
-            
-            # Coins arrondis intérieurs
-            draw.pieslice([inner_x, inner_y, inner_x + inner_radius * 2, inner_y + inner_radius * 2], 180, 270, fill='white')
-            draw.pieslice([inner_x + inner_size - inner_radius * 2, inner_y, inner_x + inner_size, inner_y + inner_radius * 2], 270, 0, fill='white')
-            draw.pieslice([inner_x, inner_y + inner_size - inner_radius * 2, inner_x + inner_radius * 2, inner_y + inner_size], 90, 180, fill='white')
-            draw.pieslice([inner_x + inner_size - inner_radius * 2, inner_y + inner_size - inner_radius * 2, inner_x + inner_size, inner_y + inner_size], 0, 90, fill='white')
-            
-            # Rectangle central
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
-            
-        elif shape_id == 'flower':
-            # Coordonnées du centre
-            cx, cy = x + size // 2, y + size // 2
-            radius = size // 2
-            
-            # Dessiner le cercle central
-            center_radius = radius // 2
-            draw.ellipse([cx - center_radius, cy - center_radius, cx + center_radius, cy + center_radius], fill=color)
-            
-            # Dessiner les pétales (4 cercles autour du centre)
-            petal_radius = radius // 2
-            positions = [
-                (cx, cy - radius),  # haut
-                (cx + radius, cy),  # droite
-                (cx, cy + radius),  # bas
-                (cx - radius, cy)   # gauche
-            ]
-            for px, py in positions:
-                draw.ellipse([px - petal_radius, py - petal_radius, px + petal_radius, py + petal_radius], fill=color)
-            
-            # Centre vide
-            inner_radius = radius // 3
-            draw.ellipse([cx - inner_radius, cy - inner_radius, cx + inner_radius, cy + inner_radius], fill='white')
-            
-            # Point central
-            dot_radius = radius // 6
-            draw.ellipse([cx - dot_radius, cy - dot_radius, cx + dot_radius, cy + dot_radius], fill=color)
-            
-        elif shape_id == 'leaf':
-            # Forme de feuille
-            # Triangle principal
-            points = [
-                (x + size // 2, y),  # sommet
-                (x + size, y + size),  # coin inférieur droit
-                (x, y + size)  # coin inférieur gauche
-            ]
-            draw.polygon(points, fill=color)
-            
-            # Triangle intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_offset = (size - inner_size) // 2
-            inner_points = [
-                (x + size // 2, y + inner_offset),  # sommet
-                (x + size - inner_offset, y + size - inner_offset),  # coin inférieur droit
-                (x + inner_offset, y + size - inner_offset)  # coin inférieur gauche
-            ]
-            draw.polygon(inner_points, fill='white')
-            
-            # Triangle central
-            center_size = size // 5
-            center_offset = size // 2
-            center_points = [
-                (x + size // 2, y + center_offset),  # sommet
-                (x + size // 2 + center_size // 2, y + center_offset + center_size),  # coin inférieur droit
-                (x + size // 2 - center_size // 2, y + center_offset + center_size)  # coin inférieur gauche
-            ]
-            draw.polygon(center_points, fill=color)
-            
-        else:
-            # Forme par défaut (carré)
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-            # Carré intérieur (vide)
-            inner_size = size * 3 // 5
-            inner_x = x + (size - inner_size) // 2
-            inner_y = y + (size - inner_size) // 2
-            draw.rectangle([inner_x, inner_y, inner_x + inner_size, inner_y + inner_size], fill='white')
-            # Carré central
-            center_size = size // 5
-            center_x = x + (size - center_size) // 2
-            center_y = y + (size - center_size) // 2
-            draw.rectangle([center_x, center_y, center_x + center_size, center_y + center_size], fill=color)
+        # Dessiner le cercle central
+        center_radius = radius // 2
+        draw.ellipse([cx - center_radius, cy - center_radius, cx + center_radius, cy + center_radius], fill=color)
+        
+        # Dessiner les pétales (4 cercles autour du centre)
+        petal_radius = radius // 2
+        positions = [
+            (cx, cy - radius),  # haut
+            (cx + radius, cy),  # droite
+            (cx, cy + radius),  # bas
+            (cx - radius, cy)   # gauche
+        ]
+        for px, py in positions:
+            draw.ellipse([px - petal_radius, py - petal_radius, px + petal_radius, py + petal_radius], fill=color)
+        
+        # Centre vide
+        inner_radius = radius // 3
+        draw.ellipse([cx - inner_radius, cy - inner_radius, cx + inner_radius, cy + inner_radius], fill='white')
+        
+        # Point central
+        dot_radius = radius // 6
+        draw.ellipse([cx - dot_radius, cy - dot_radius, cx + dot_radius, cy + dot_radius], fill=color)
+    
+    def _draw_eye_leaf(self, draw, x, y, size, color):
+        """Dessine un œil en feuille."""
+        # Forme de feuille
+        # Triangle principal
+        points = [
+            (x + size // 2, y),  # sommet
+            (x + size, y + size),  # coin inférieur droit
+            (x, y + size)  # coin inférieur gauche
+        ]
+        draw.polygon(points, fill=color)
+        
+        # Triangle intérieur (vide)
+        inner_size = size * 3 // 5
+        inner_offset = (size - inner_size) // 2
+        inner_points = [
+            (x + size // 2, y + inner_offset),  # sommet
+            (x + size - inner_offset, y + size - inner_offset),  # coin inférieur droit
+            (x + inner_offset, y + size - inner_offset)  # coin inférieur gauche
+        ]
+        draw.polygon(inner_points, fill='white')
+        
+        # Triangle central
+        center_size = size // 5
+        center_offset = size // 2
+        center_points = [
+            (x + size // 2, y + center_offset),  # sommet
+            (x + size // 2 + center_size // 2, y + center_offset + center_size),  # coin inférieur droit
+            (x + size // 2 - center_size // 2, y + center_offset + center_size)  # coin inférieur gauche
+        ]
+        draw.polygon(center_points, fill=color)
     
     def _draw_frame_shape(self, draw, shape_id, x, y, size, color):
         """
         Dessine un contour de marqueur avec une forme spécifique.
         
+        La forme est dessinée par sa méthode dédiée (table de correspondance
+        construite à l'initialisation) ; une forme inconnue donne un contour carré.
+        
         Args:
             draw: Objet ImageDraw
             shape_id (str): Identifiant de la forme
@@ -985,259 +1082,234 @@ class AdvancedQRStyleGenerator:
         # Épaisseur du contour
         thickness = size // 7
         
-        if shape_id == 'square':
-            # Contour carré
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-            draw.rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
-            
-        elif shape_id == 'rounded_square':
-            # Carré aux coins légèrement arrondis
-            radius = size // 10
-            
-            # Rectangle extérieur
-            draw.rectangle([x + radius, y, x + size - radius, y + size], fill=color)
-            draw.rectangle([x, y + radius, x + size, y + size - radius], fill=color)
-            
-            # Coins arrondis
-            draw.pieslice([x, y, x + radius * 2, y + radius * 2], 180, 270, fill=color)
-            draw.pieslice([x + size - radius * 2, y, x + size, y + radius * 2], 270, 0, fill=color)
-            draw.pieslice([x, y + size - radius * 2, x + radius * 2, y + size], 90, 180, fill=color)
-            draw.pieslice([x + size - radius * 2, y + size - radius * 2, x + size, y + size], 0, 90, fill=color)
-            
-            # Rectangle intérieur (vide)
-            inner_radius = max(1, (radius - thickness))
-            draw.rectangle([x + thickness + inner_radius, y + thickness, x + size - thickness - inner_radius, y + size - thickness], fill='white')
-            draw.rectangle([x + thickness, y + thickness + inner_radius, x + size - thickness, y + size - thickness - inner_radius], fill='white')
-            
-            # Coins arrondis intérieurs
-            draw.pieslice([x + thickness, y + thickness, x + thickness + inner_radius * 2, y + thickness + inner_radius * 2], 180, 270, fill='white')
-            draw.pieslice([x + size - thickness - inner_radius * 2, y + thickness, x + size - thickness, y + thickness + inner_radius * 2], 270, 0, fill='white')
-            draw.pieslice([x + thickness, y + size - thickness - inner_radius * 2, x + thickness + inner_radius * 2, y + size - thickness], 90, 180, fill='white')
-            draw.pieslice([x + size - thickness - inner_radius * 2, y + size - thickness - inner_radius * 2, x + size - thickness, y + size - thickness], 0, 90, fill='white')
-            
-        elif shape_id == 'circle':
-            # Contour circulaire
-            draw.ellipse([x, y, x + size, y + size], fill=color)
-            draw.ellipse([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
-            
-        elif shape_id == 'rounded':
-            # Contour fortement arrondi (presque circulaire)
-            radius = size // 3
-            
-            # Rectangle extérieur avec coins très arrondis
-            draw.rectangle([x + radius, y, x + size - radius, y + size], fill=color)
-            draw.rectangle([x, y + radius, x + size, y + size - radius], fill=color)
-            
-            # Coins arrondis
-            draw.pieslice([x, y, x + radius * 2, y + radius * 2], 180, 270, fill=color)
-            draw.pieslice([x + size - radius * 2, y, x + size, y + radius * 2], 270, 0, fill=color)
-            draw.pieslice([x, y + size - radius * 2, x + radius * 2, y + size], 90, 180, fill=color)
-            draw.pieslice([x + size - radius * 2, y + size - radius * 2, x + size, y + size], 0, 90, fill=color)
-            
-            # Intérieur (vide)
-            inner_radius = max(1, (radius - thickness))
-            draw.rectangle([x + thickness + inner_radius, y + thickness, x + size - thickness - inner_radius, y + size - thickness], fill='white')
-            draw.rectangle([x + thickness, y + thickness + inner_radius, x + size - thickness, y + size - thickness - inner_radius], fill='white')
-            
-            # Coins arrondis intérieurs
-            draw.pieslice([x + thickness, y + thickness, x + thickness + inner_radius * 2, y + thickness + inner_radius * 2], 180, 270, fill='white')
-            draw.pieslice([x + size - thickness - inner_radius * 2, y + thickness, x + size - thickness, y + thickness + inner_radius * 2], 270, 0, fill='white')
-            draw.pieslice([x + thickness, y + size - thickness - inner_radius * 2, x + thickness + inner_radius * 2, y + size - thickness], 90, 180, fill='white')
-            draw.pieslice([x + size - thickness - inner_radius * 2, y + size - thickness - inner_radius * 2, x + size - thickness, y + size - thickness], 0, 90, fill='white')
-            
-        elif shape_id == 'diamond':
-            # Points du losange extérieur
-            points = [
-                (x + size // 2, y),  # haut
-                (x + size, y + size // 2),  # droite
-                (x + size // 2, y + size),  # bas
-                (x, y + size // 2)  # gauche
-            ]
-            draw.polygon(points, fill=color)
-            
-            # Points du losange intérieur (vide)
-            inner_offset = thickness
-            inner_points = [
-                (x + size // 2, y + inner_offset),  # haut
-                (x + size - inner_offset, y + size // 2),  # droite
-                (x + size // 2, y + size - inner_offset),  # bas
-                (x + inner_offset, y + size // 2)  # gauche
-            ]
-            draw.polygon(inner_points, fill='white')
-            
-        elif shape_id == 'corner_cut':
-            # Contour aux coins coupés
-            # Points du polygone
-            cut_size = size // 5
-            points = [
-                (x + cut_size, y),  # haut gauche
-                (x + size - cut_size, y),  # haut droite
-                (x + size, y + cut_size),  # droite haut
-                (x + size, y + size - cut_size),  # droite bas
-                (x + size - cut_size, y + size),  # bas droite
-                (x + cut_size, y + size),  # bas gauche
-                (x, y + size - cut_size),  # gauche bas
-                (x, y + cut_size)  # gauche haut
-            ]
-            draw.polygon(points, fill=color)
-            
-            # Points du polygone intérieur (vide)
-            inner_cut_size = max(1, cut_size - thickness)
-            inner_points = [
-                (x + cut_size + thickness, y + thickness),  # haut gauche
-                (x + size - cut_size - thickness, y + thickness),  # haut droite
-                (x + size - thickness, y + cut_size + thickness),  # droite haut
-                (x + size - thickness, y + size - cut_size - thickness),  # droite bas
-                (x + size - cut_size - thickness, y + size - thickness),  # bas droite
-                (x + cut_size + thickness, y + size - thickness),  # bas gauche
-                (x + thickness, y + size - cut_size - thickness),  # gauche bas
-                (x + thickness, y + cut_size + thickness)  # gauche haut
-            ]
-            draw.polygon(inner_points, fill='white')
-            
-        elif shape_id == 'jagged':
-            # Contour dentelé
-            # Nombre de dents par côté
-            teeth = 3
-            teeth_depth = size // 10
-            
-            # Points du polygone dentelé
-            points = []
-            
-            # Côté supérieur
-            for i in range(teeth + 1):
-                x_pos = x + i * (size / teeth)
-                y_pos = y + (teeth_depth if i % 2 else 0)
-                points.append((x_pos, y_pos))
-            
-            # Côté droit
-            for i in range(1, teeth + 1):
-                x_pos = x + size - (teeth_depth if i % 2 else 0)
-                y_pos = y + i * (size / teeth)
-                points.append((x_pos, y_pos))
-            
-            # Côté inférieur
-            for i in range(teeth, -1, -1):
-                x_pos = x + i * (size / teeth)
-                y_pos = y + size - (teeth_depth if i % 2 else 0)
-                points.append((x_pos, y_pos))
-            
-            # Côté gauche
-            for i in range(teeth, 0, -1):
-                x_pos = x + (teeth_depth if i % 2 else 0)
-                y_pos = y + i * (size / teeth)
-                points.append((x_pos, y_pos))
-            
-            draw.polygon(points, fill=color)
-            
-            # Points du polygone intérieur (vide)
-            inner_teeth_depth = max(1, teeth_depth - thickness // 2)
-            inner_size = size - 2 * thickness
-            inner_teeth = teeth
-            inner_points = []
-            
+        self._frame_drawers.get(shape_id, self._draw_frame_square)(draw, x, y, size, thickness, color)
+    
+    def _draw_frame_square(self, draw, x, y, size, thickness, color):
+        """Dessine un contour carré."""
+        # Contour carré
+        draw.rectangle([x, y, x + size, y + size], fill=color)
+        draw.rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
+    
+    def _draw_frame_rounded_square(self, draw, x, y, size, thickness, color):
+        """Dessine un contour carré aux coins légèrement arrondis."""
+        # Carré aux coins légèrement arrondis
+        radius = size // 10
+        draw.rounded_rectangle([x, y, x + size, y + size], radius, fill=color)
+        
+        # Intérieur (vide)
+        inner_radius = max(1, (radius - thickness))
+        draw.rounded_rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], inner_radius, fill='white')
+    
+    def _draw_frame_circle(self, draw, x, y, size, thickness, color):
+        """Dessine un contour circulaire."""
+        # Contour circulaire
+        draw.ellipse([x, y, x + size, y + size], fill=color)
+        draw.ellipse([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
+    
+    def _draw_frame_rounded(self, draw, x, y, size, thickness, color):
+        """Dessine un contour fortement arrondi."""
+        # Contour fortement arrondi (presque circulaire)
+        radius = size // 3
+        draw.rounded_rectangle([x, y, x + size, y + size], radius, fill=color)
+        
+        # Intérieur (vide)
+        inner_radius = max(1, (radius - thickness))
+        draw.rounded_rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], inner_radius, fill='white')
+    
+    def _draw_frame_diamond(self, draw, x, y, size, thickness, color):
+        """Dessine un contour en losange."""
+        # Points du losange extérieur
+        points = [
+            (x + size // 2, y),  # haut
+            (x + size, y + size // 2),  # droite
+            (x + size // 2, y + size),  # bas
+            (x, y + size // 2)  # gauche
+        ]
+        draw.polygon(points, fill=color)
+        
+        # Points du losange intérieur (vide)
+        inner_offset = thickness
+        inner_points = [
+            (x + size // 2, y + inner_offset),  # haut
+            (x + size - inner_offset, y + size // 2),  # droite
+            (x + size // 2, y + size - inner_offset),  # bas
+            (x + inner_offset, y + size // 2)  # gauche
+        ]
+        draw.polygon(inner_points, fill='white')
+    
+    def _draw_frame_corner_cut(self, draw, x, y, size, thickness, color):
+        """Dessine un contour aux coins coupés."""
+        # Contour aux coins coupés
+        # Points du polygone
+        cut_size = size // 5
+        points = [
+            (x + cut_size, y),  # haut gauche
+            (x + size - cut_size, y),  # haut droite
+            (x + size, y + cut_size),  # droite haut
+            (x + size, y + size - cut_size),  # droite bas
+            (x + size - cut_size, y + size),  # bas droite
+            (x + cut_size, y + size),  # bas gauche
+            (x, y + size - cut_size),  # gauche bas
+            (x, y + cut_size)  # gauche haut
+        ]
+        draw.polygon(points, fill=color)
+        
+        # Points du polygone intérieur (vide)
+        inner_cut_size = max(1, cut_size - thickness)
+        inner_points = [
+            (x + cut_size + thickness, y + thickness),  # haut gauche
+            (x + size - cut_size - thickness, y + thickness),  # haut droite
+            (x + size - thickness, y + cut_size + thickness),  # droite haut
+            (x + size - thickness, y + size - cut_size - thickness),  # droite bas
+            (x + size - cut_size - thickness, y + size - thickness),  # bas droite
+            (x + cut_size + thickness, y + size - thickness),  # bas gauche
+            (x + thickness, y + size - cut_size - thickness),  # gauche bas
+            (x + thickness, y + cut_size + thickness)  # gauche haut
+        ]
+        draw.polygon(inner_points, fill='white')
+    
+    def _draw_frame_jagged(self, draw, x, y, size, thickness, color):
+        """Dessine un contour dentelé."""
+        # Contour dentelé
+        # Nombre de dents par côté
+        teeth = 3
+        teeth_depth = size // 10
+        
+        # Points du polygone dentelé
+        points = []
+        
+        # Côté supérieur
+        for i in range(teeth + 1):
+            x_pos = x + i * (size / teeth)
+            y_pos = y + (teeth_depth if i % 2 else 0)
+            points.append((x_pos, y_pos))
+        
+        # Côté droit
+        for i in range(1, teeth + 1):
+            x_pos = x + size - (teeth_depth if i % 2 else 0)
+            y_pos = y + i * (size / teeth)
+            points.append((x_pos, y_pos))
+        
+        # Côté inférieur
+        for i in range(teeth, -1, -1):
+            x_pos = x + i * (size / teeth)
+            y_pos = y + size - (teeth_depth if i % 2 else 0)
+            points.append((x_pos, y_pos))
+        
+        # Côté gauche
+        for i in range(teeth, 0, -1):
+            x_pos = x + (teeth_depth if i % 2 else 0)
+            y_pos = y + i * (size / teeth)
+            points.append((x_pos, y_pos))
+        
+        draw.polygon(points, fill=color)
+        
+        # Points du polygone intérieur (vide)
+        inner_teeth_depth = max(1, teeth_depth - thickness // 2)
+        inner_size = size - 2 * thickness
+        inner_teeth = teeth
+        inner_points = []
+        
+        # Côté supérieur
+        for i in range(inner_teeth + 1):
+            x_pos = x + thickness + i * (inner_size / inner_teeth)
+            y_pos = y + thickness + (inner_teeth_depth if i % 2 else 0)
+            inner_points.append((x_pos, y_pos))
+        
+        # Côté droit
+        for i in range(1, inner_teeth + 1):
+            x_pos = x + thickness + inner_size - (inner_teeth_depth if i % 2 else 0)
+            y_pos = y + thickness + i * (inner_size / inner_teeth)
+            inner_points.append((x_pos, y_pos))
+        
+        # Côté inférieur
+        for i in range(inner_teeth, -1, -1):
+            x_pos = x + thickness + i * (inner_size / inner_teeth)
+            y_pos = y + thickness + inner_size - (inner_teeth_depth if i % 2 else 0)
+            inner_points.append((x_pos, y_pos))
+        
+        # Côté gauche
+        for i in range(inner_teeth, 0, -1):
+            x_pos = x + thickness + (inner_teeth_depth if i % 2 else 0)
+            y_pos = y + thickness + i * (inner_size / inner_teeth)
+            inner_points.append((x_pos, y_pos))
+        
+        draw.polygon(inner_points, fill='white')
+    
+    def _draw_frame_dots(self, draw, x, y, size, thickness, color):
+        """Dessine un contour composé de points."""
+        # Contour composé de points
+        # Nombre de points par côté
+        num_dots = 8
+        dot_radius = size // 20
+        dots_positions = []
+        
+        # Calculer les positions des points
+        for i in range(num_dots):
             # Côté supérieur
-            for i in range(inner_teeth + 1):
-                x_pos = x + thickness + i * (inner_size / inner_teeth)
-                y_pos = y + thickness + (inner_teeth_depth if i % 2 else 0)
-                inner_points.append((x_pos, y_pos))
-            
+            dots_positions.append((x + i * size / (num_dots - 1), y))
             # Côté droit
-            for i in range(1, inner_teeth + 1):
-                x_pos = x + thickness + inner_size - (inner_teeth_depth if i % 2 else 0)
-                y_pos = y + thickness + i * (inner_size / inner_teeth)
-                inner_points.append((x_pos, y_pos))
-            
+            dots_positions.append((x + size, y + i * size / (num_dots - 1)))
             # Côté inférieur
-            for i in range(inner_teeth, -1, -1):
-                x_pos = x + thickness + i * (inner_size / inner_teeth)
-                y_pos = y + thickness + inner_size - (inner_teeth_depth if i % 2 else 0)
-                inner_points.append((x_pos, y_pos))
-            
+            dots_positions.append((x + size - i * size / (num_dots - 1), y + size))
             # Côté gauche
-            for i in range(inner_teeth, 0, -1):
-                x_pos = x + thickness + (inner_teeth_depth if i % 2 else 0)
-                y_pos = y + thickness + i * (inner_size / inner_teeth)
-                inner_points.append((x_pos, y_pos))
-            
-            draw.polygon(inner_points, fill='white')
-            
-        elif shape_id == 'dots':
-            # Contour composé de points
-            # Nombre de points par côté
-            num_dots = 8
-            dot_radius = size // 20
-            dots_positions = []
-            
-            # Calculer les positions des points
-            for i in range(num_dots):
-                # Côté supérieur
-                dots_positions.append((x + i * size / (num_dots - 1), y))
-                # Côté droit
-                dots_positions.append((x + size, y + i * size / (num_dots - 1)))
-                # Côté inférieur
-                dots_positions.append((x + size - i * size / (num_dots - 1), y + size))
-                # Côté gauche
-                dots_positions.append((x, y + size - i * size / (num_dots - 1)))
-            
-            # Dessiner les points
-            for px, py in dots_positions:
-                draw.ellipse([px - dot_radius, py - dot_radius, px + dot_radius, py + dot_radius], fill=color)
-            
-            # Rectangle intérieur (vide)
-            inner_offset = thickness
-            draw.rectangle([x + inner_offset, y + inner_offset, x + size - inner_offset, y + size - inner_offset], fill='white')
-            
-        elif shape_id == 'pointed':
-            # Contour aux coins pointus
-            # Points du polygone
-            point_size = size // 4
-            points = [
-                (x, y + point_size),  # haut gauche
-                (x + point_size, y),  # coin pointu haut gauche
-                (x + size - point_size, y),  # haut droite
-                (x + size, y + point_size),  # coin pointu haut droite
-                (x + size, y + size - point_size),  # droite bas
-                (x + size - point_size, y + size),  # coin pointu bas droite
-                (x + point_size, y + size),  # bas gauche
-                (x, y + size - point_size)  # coin pointu bas gauche
-            ]
-            draw.polygon(points, fill=color)
-            
-            # Points du polygone intérieur (vide)
-            inner_point_size = max(1, point_size - thickness)
-            inner_points = [
-                (x + thickness, y + point_size),  # haut gauche
-                (x + point_size, y + thickness),  # coin pointu haut gauche
-                (x + size - point_size, y + thickness),  # haut droite
-                (x + size - thickness, y + point_size),  # coin pointu haut droite
-                (x + size - thickness, y + size - point_size),  # droite bas
-                (x + size - point_size, y + size - thickness),  # coin pointu bas droite
-                (x + point_size, y + size - thickness),  # bas gauche
-                (x + thickness, y + size - point_size)  # coin pointu bas gauche
-            ]
-            draw.polygon(inner_points, fill='white')
-            
-        elif shape_id == 'pixel':
-            # Contour pixelisé
-            # Taille des pixels
-            pixel_size = size // 10
-            
-            # Dessiner le contour extérieur pixelisé
-            for i in range(0, size + 1, pixel_size):
-                for j in range(0, size + 1, pixel_size):
-                    # Dessiner seulement les pixels du contour
-                    if (i < thickness or i >= size - thickness or 
-                        j < thickness or j >= size - thickness):
-                        draw.rectangle([x + i, y + j, x + i + pixel_size - 1, y + j + pixel_size - 1], fill=color)
-            
-            # Rectangle intérieur (vide)
-            draw.rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
-            
-        else:
-            # Contour carré par défaut
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-            draw.rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
+            dots_positions.append((x, y + size - i * size / (num_dots - 1)))
+        
+        # Dessiner les points
+        for px, py in dots_positions:
+            draw.ellipse([px - dot_radius, py - dot_radius, px + dot_radius, py + dot_radius], fill=color)
+        
+        # Rectangle intérieur (vide)
+        inner_offset = thickness
+        draw.rectangle([x + inner_offset, y + inner_offset, x + size - inner_offset, y + size - inner_offset], fill='white')
+    
+    def _draw_frame_pointed(self, draw, x, y, size, thickness, color):
+        """Dessine un contour aux coins pointus."""
+        # Contour aux coins pointus
+        # Points du polygone
+        point_size = size // 4
+        points = [
+            (x, y + point_size),  # haut gauche
+            (x + point_size, y),  # coin pointu haut gauche
+            (x + size - point_size, y),  # haut droite
+            (x + size, y + point_size),  # coin pointu haut droite
+            (x + size, y + size - point_size),  # droite bas
+            (x + size - point_size, y + size),  # coin pointu bas droite
+            (x + point_size, y + size),  # bas gauche
+            (x, y + size - point_size)  # coin pointu bas gauche
+        ]
+        draw.polygon(points, fill=color)
+        
+        # Points du polygone intérieur (vide)
+        inner_point_size = max(1, point_size - thickness)
+        inner_points = [
+            (x + thickness, y + point_size),  # haut gauche
+            (x + point_size, y + thickness),  # coin pointu haut gauche
+            (x + size - point_size, y + thickness),  # haut droite
+            (x + size - thickness, y + point_size),  # coin pointu haut droite
+            (x + size - thickness, y + size - point_size),  # droite bas
+            (x + size - point_size, y + size - thickness),  # coin pointu bas droite
+            (x + point_size, y + size - thickness),  # bas gauche
+            (x + thickness, y + size - point_size)  # coin pointu bas gauche
+        ]
+        draw.polygon(inner_points, fill='white')
+    
+    def _draw_frame_pixel(self, draw, x, y, size, thickness, color):
+        """Dessine un contour pixelisé."""
+        # Contour pixelisé
+        # Taille des pixels
+        pixel_size = size // 10
+        
+        # Dessiner le contour extérieur pixelisé
+        for i in range(0, size + 1, pixel_size):
+            for j in range(0, size + 1, pixel_size):
+                # Dessiner seulement les pixels du contour
+                if (i < thickness or i >= size - thickness or 
+                    j < thickness or j >= size - thickness):
+                    draw.rectangle([x + i, y + j, x + i + pixel_size - 1, y + j + pixel_size - 1], fill=color)
+        
+        # Rectangle intérieur (vide)
+        draw.rectangle([x + thickness, y + thickness, x + size - thickness, y + size - thickness], fill='white')
     
     def generate_styled_qrcode(self, data, module_drawer_id, color_mask_id, filename=None, **options):
         """
@@ -1248,14 +1320,18 @@ class AdvancedQRStyleGenerator:
             module_drawer_id (str): Identifiant du style de module ('square', 'circle', etc.)
             color_mask_id (str): Identifiant du masque de couleur ('solid', 'radial_gradient', etc.)
             filename (str, optional): Nom du fichier de sortie. Si non spécifié,
-                génère un nom basé sur un UUID.
+                génère un nom aléatoire.
             **options: Options supplémentaires pour la personnalisation du QR code.
+                - png_compress_level (int): Niveau de compression PNG de 0 à 9 (1 par défaut)
+                - return_bytes (bool): Renvoie le contenu PNG au lieu d'écrire un fichier
+                  (aucune métadonnée n'est alors enregistrée)
             
         Returns:
-            str: Chemin du fichier QR code généré.
+            str or bytes: Chemin du fichier QR code généré, ou contenu PNG avec
+                return_bytes.
         """
         if not filename:
-            filename = f"styled_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"styled_qrcode_{secrets.token_hex(4)}.png"
         
         # Chemin complet du fichier de sortie
         output_path = os.path.join(self.output_dir, filename)
@@ -1270,66 +1346,14 @@ class AdvancedQRStyleGenerator:
         # Récupération du module drawer
         module_drawer = self.module_drawers[module_drawer_id]['drawer']
         
-        # Récupération du masque de couleur
-        color_mask_class = self.color_masks[color_mask_id]['class']
-        
         # Paramètres du QR code
         version = options.get('version', 1)
         error_correction = options.get('error_correction', qrcode.constants.ERROR_CORRECT_M)
         box_size = options.get('box_size', 10)
         border = options.get('border', 4)
         
-        # Options pour le masque de couleur
-        color_mask_kwargs = {}
-        
-        if color_mask_id == 'solid':
-            # Couleur unie
-            color_mask_kwargs = {
-                'front_color': options.get('front_color', (0, 0, 0)),
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-        elif color_mask_id in ['radial_gradient', 'square_gradient']:
-            # Dégradés radial ou carré
-            color_mask_kwargs = {
-                'center_color': options.get('front_color', (0, 102, 204)),
-                'edge_color': options.get('edge_color', (0, 51, 153)),
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-            
-            if 'gradient_center' in options:
-                color_mask_kwargs['center'] = options.get('gradient_center')
-        elif color_mask_id == 'horizontal_gradient':
-            # Dégradé horizontal
-            color_mask_kwargs = {
-                'left_color': options.get('front_color', (255, 102, 0)),
-                'right_color': options.get('edge_color', (204, 0, 0)),
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-        elif color_mask_id == 'vertical_gradient':
-            # Dégradé vertical
-            color_mask_kwargs = {
-                'top_color': options.get('front_color', (0, 153, 0)),
-                'bottom_color': options.get('edge_color', (0, 51, 0)),
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-        elif color_mask_id == 'diagonal_gradient':
-            # Dégradé diagonal
-            color_mask_kwargs = {
-                'top_left_color': options.get('front_color', (0, 102, 204)),
-                'bottom_right_color': options.get('edge_color', (0, 51, 153)),
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-        elif color_mask_id == 'rainbow':
-            # Dégradé arc-en-ciel
-            color_mask_kwargs = {
-                'back_color': options.get('back_color', (255, 255, 255))
-            }
-            
-            if 'colors' in options:
-                color_mask_kwargs['colors'] = options.get('colors')
-        
         # Création du masque de couleur
-        color_mask = color_mask_class(**color_mask_kwargs)
+        color_mask = self._build_color_mask(color_mask_id, options)
         
         # Génération du QR code
         qr = qrcode.QRCode(
@@ -1363,14 +1387,66 @@ class AdvancedQRStyleGenerator:
             # Personnalisation des yeux et contours
             img_pil = self._customize_markers(img_pil, qr, frame_shape, eye_shape, options)
         
-        # Sauvegarde de l'image
-        img_pil.save(output_path)
+        # Encodage en mémoire pour les appelants qui servent l'image directement
+        compress_level = int(options.get('png_compress_level', 1))
+        if options.get('return_bytes'):
+            buffered = BytesIO()
+            img_pil.save(buffered, format='PNG', optimize=False, compress_level=compress_level)
+            return buffered.getvalue()
+        
+        # Sauvegarde de l'image (compression zlib rapide par défaut)
+        img_pil.save(output_path, optimize=False, compress_level=compress_level)
         
         # Enregistrement des métadonnées
         self._save_metadata(data, output_path, options)
         
         return output_path
     
+    def _build_color_mask(self, color_mask_id, options):
+        """
+        Crée le masque de couleur demandé à partir des options.
+        
+        Args:
+            color_mask_id (str): Identifiant du masque de couleur ('solid', 'radial_gradient', etc.).
+                Un identifiant inconnu donne une couleur unie.
+            options (dict): Options de personnalisation (front_color, edge_color,
+                back_color et options spécifiques aux dégradés)
+        
+        Returns:
+            QRColorMask: Masque de couleur
+        """
+        if color_mask_id not in self.color_masks:
+            return self._get_color_mask(SolidFillColorMask, color_mask_kwargs('solid', options))
+        
+        return self._get_color_mask(self.color_masks[color_mask_id]['class'],
+                                    color_mask_kwargs(color_mask_id, options))
+    
+    def _get_color_mask(self, color_mask_class, color_mask_kwargs):
+        """
+        Obtient un masque de couleur, réutilisé s'il a déjà été construit avec les
+        mêmes arguments (prévisualisations, styles et QR codes confondus).
+        
+        Args:
+            color_mask_class: Classe du masque de couleur
+            color_mask_kwargs (dict): Arguments du masque
+        
+        Returns:
+            QRColorMask: Masque de couleur
+        """
+        # Arguments non hachables (liste de couleurs, par exemple) : pas de cache
+        try:
+            key = (color_mask_class, tuple(sorted(color_mask_kwargs.items())))
+            color_mask = self._color_mask_cache.get(key)
+        except TypeError:
+            return color_mask_class(**color_mask_kwargs)
+        
+        if color_mask is None:
+            if len(self._color_mask_cache) >= _COLOR_MASK_CACHE_MAX:
+                self._color_mask_cache.clear()
+            color_mask = color_mask_class(**color_mask_kwargs)
+            self._color_mask_cache[key] = color_mask
+        return color_mask
+    
     def _customize_markers(self, qr_image, qr_code, frame_shape, eye_shape, options):
         """
         Personnalise les marqueurs d'un QR code (yeux et contours).
@@ -1385,8 +1461,9 @@ class AdvancedQRStyleGenerator:
         Returns:
             Image: Image PIL modifiée
         """
-        # Copie de l'image pour éviter de modifier l'original
-        enhanced_img = qr_image.copy().convert('RGBA')
+        # Copie RGBA de l'image (convert renvoie toujours une nouvelle image :
+        # l'original n'est pas modifié, sans copie intermédiaire)
+        enhanced_img = qr_image.convert('RGBA')
         
         # Configuration des marqueurs
         # Calcul de la taille des modules (pixels par module)
@@ -1408,9 +1485,7 @@ class AdvancedQRStyleGenerator:
         draw = ImageDraw.Draw(eye_layer)
         
         # Couleur pour les yeux (par défaut, noir)
-        eye_color = options.get('front_color', (0, 0, 0))
-        if isinstance(eye_color, str):
-            eye_color = ImageColor.getrgb(eye_color)
+        eye_color = parse_color(options.get('front_color', (0, 0, 0)))
         
         # Dessiner les yeux personnalisés
         for pos_x, pos_y in positions:
@@ -1476,7 +1551,7 @@ class AdvancedQRStyleGenerator:
         if output_path:
             final_path = output_path
         elif not filename:
-            filename = f"{style_id}_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"{style_id}_qrcode_{secrets.token_hex(4)}.png"
             final_path = os.path.join(self.output_dir, filename)
         else:
             final_path = os.path.join(self.output_dir, filename)
@@ -1497,53 +1572,9 @@ class AdvancedQRStyleGenerator:
             color_mask_id = options['color_mask']
             
             module_drawer = self.module_drawers[module_drawer_id]['drawer']
-            color_mask_class = self.color_masks[color_mask_id]['class']
-            
-            # Options pour le masque de couleur
-            color_mask_kwargs = {}
-            
-            if color_mask_id == 'solid':
-                color_mask_kwargs = {
-                    'front_color': options.get('front_color', (0, 0, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask_id in ['radial_gradient', 'square_gradient']:
-                color_mask_kwargs = {
-                    'center_color': options.get('front_color', (0, 102, 204)),
-                    'edge_color': options.get('edge_color', (0, 51, 153)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-                
-                if 'gradient_center' in options:
-                    color_mask_kwargs['center'] = options.get('gradient_center')
-            elif color_mask_id == 'horizontal_gradient':
-                color_mask_kwargs = {
-                    'left_color': options.get('front_color', (255, 102, 0)),
-                    'right_color': options.get('edge_color', (204, 0, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask_id == 'vertical_gradient':
-                color_mask_kwargs = {
-                    'top_color': options.get('front_color', (0, 153, 0)),
-                    'bottom_color': options.get('edge_color', (0, 51, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask_id == 'diagonal_gradient':
-                color_mask_kwargs = {
-                    'top_left_color': options.get('front_color', (0, 102, 204)),
-                    'bottom_right_color': options.get('edge_color', (0, 51, 153)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask_id == 'rainbow':
-                color_mask_kwargs = {
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-                
-                if 'colors' in options:
-                    color_mask_kwargs['colors'] = options.get('colors')
             
             # Création du masque de couleur
-            color_mask = color_mask_class(**color_mask_kwargs)
+            color_mask = self._build_color_mask(color_mask_id, options)
             
             # Paramètres du QR code
             version = options.get('version', 1)
@@ -1593,7 +1624,7 @@ class AdvancedQRStyleGenerator:
             data (str): Données à encoder dans le QR code (URL, texte, etc.)
             logo_path (str): Chemin vers le fichier logo à insérer
             filename (str, optional): Nom du fichier de sortie. Si non spécifié,
-                génère un nom basé sur un UUID.
+                génère un nom aléatoire.
             **options: Options supplémentaires pour la personnalisation du QR code.
                 - version (int): Version du QR code (1-40)
                 - error_correction (int): Niveau de correction d'erreur
@@ -1606,12 +1637,15 @@ class AdvancedQRStyleGenerator:
                 - logo_size (float): Taille du logo en pourcentage du QR code (0.0-1.0)
                 - logo_border (bool): Ajouter une bordure blanche autour du logo
                 - logo_border_width (int): Largeur de la bordure du logo en pixels
+                - png_compress_level (int): Niveau de compression PNG de 0 à 9 (1 par défaut)
             
         Returns:
             str: Chemin du fichier QR code généré.
         """
         if not filename:
-            filename = f"logo_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"logo_qrcode_{secrets.token_hex(4)}.png"
+        
+        compress_level = int(options.get('png_compress_level', 1))
         
         # Chemin complet du fichier de sortie
         output_path = os.path.join(self.output_dir, filename)
@@ -1644,8 +1678,10 @@ class AdvancedQRStyleGenerator:
                 **options
             )
             
-            # Conversion en image PIL
-            if not isinstance(qr_img, Image.Image):
+            # Conversion en image PIL (chemin du fichier, ou contenu PNG avec return_bytes)
+            if isinstance(qr_img, bytes):
+                qr_img = Image.open(BytesIO(qr_img))
+            elif not isinstance(qr_img, Image.Image):
                 qr_img = Image.open(qr_img)
         else:
             # Génération avec style par défaut
@@ -1708,8 +1744,8 @@ class AdvancedQRStyleGenerator:
             # Ajout du logo
             result.paste(logo, position, logo)
             
-            # Sauvegarde de l'image finale
-            result.save(output_path)
+            # Sauvegarde de l'image finale (compression zlib rapide par défaut)
+            result.save(output_path, optimize=False, compress_level=compress_level)
             
             # Enregistrement des métadonnées
             options['logo_path'] = logo_path
@@ -1718,45 +1754,28 @@ class AdvancedQRStyleGenerator:
             return output_path
             
         except Exception as e:
-            print(f"Erreur lors de l'ajout du logo: {e}")
+            logger.warning("Erreur lors de l'ajout du logo: %s", e, exc_info=True)
             # En cas d'erreur, générer un QR code sans logo
-            qr_img.save(output_path)
+            qr_img.save(output_path, optimize=False, compress_level=compress_level)
             return output_path
     
     def _save_metadata(self, data, output_path, options=None):
         """
-        Enregistre les métadonnées du QR code généré.
+        Enregistre les métadonnées du QR code généré dans le journal
+        metadata/index.jsonl (ou un fichier texte avec legacy_metadata).
         
         Args:
             data (str): Données encodées dans le QR code
             output_path (str): Chemin du fichier QR code généré
             options (dict, optional): Options utilisées pour la génération
         """
-        metadata_dir = os.path.join(self.output_dir, 'metadata')
-        if not os.path.exists(metadata_dir):
-            os.makedirs(metadata_dir)
-        
-        # Nom du fichier de métadonnées basé sur le nom du QR code
-        qr_filename = os.path.basename(output_path)
-        metadata_filename = f"{os.path.splitext(qr_filename)[0]}.txt"
-        metadata_path = os.path.join(metadata_dir, metadata_filename)
-        
-        # Création du contenu des métadonnées
-        metadata_content = [
-            f"Date de création: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Données: {data}",
-            f"Fichier: {qr_filename}",
-        ]
-        
-        # Ajout des options si spécifiées
-        if options:
-            metadata_content.append("Options:")
-            for key, value in options.items():
-                metadata_content.append(f"  {key}: {value}")
-        
-        # Écriture des métadonnées dans le fichier
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(metadata_content))
+        self._metadata_journal.write(data, output_path, options)
+    
+    def close(self):
+        """
+        Vide et ferme le journal des métadonnées.
+        """
+        self._metadata_journal.close()
     
     def get_all_module_styles(self):
         """
@@ -1765,13 +1784,16 @@ class AdvancedQRStyleGenerator:
         Returns:
             list: Liste des styles de modules avec leurs informations
         """
+        # Prévisualisations manquantes générées à la consultation de la liste
+        self._ensure_previews('module')
+        
         styles = []
         for style_id, style_info in self.module_drawers.items():
             styles.append({
                 'id': style_id,
                 'name': style_info['name'],
                 'description': style_info['description'],
-                'preview_url': os.path.relpath(style_info['preview'], self.templates_dir)
+                'preview_url': self._preview_url('module', style_id, style_info)
             })
         
         return styles
@@ -1783,13 +1805,16 @@ class AdvancedQRStyleGenerator:
         Returns:
             list: Liste des masques de couleur avec leurs informations
         """
+        # Prévisualisations manquantes générées à la consultation de la liste
+        self._ensure_previews('color_mask')
+        
         masks = []
         for mask_id, mask_info in self.color_masks.items():
             masks.append({
                 'id': mask_id,
                 'name': mask_info['name'],
                 'description': mask_info['description'],
-                'preview_url': os.path.relpath(mask_info['preview'], self.templates_dir)
+                'preview_url': self._preview_url('color_mask', mask_id, mask_info)
             })
         
         return masks
@@ -1801,13 +1826,16 @@ class AdvancedQRStyleGenerator:
         Returns:
             list: Liste des formes d'yeux avec leurs informations
         """
+        # Prévisualisations manquantes générées à la consultation de la liste
+        self._ensure_previews('eye')
+        
         shapes = []
         for shape_id, shape_info in self.eye_shapes.items():
             shapes.append({
                 'id': shape_id,
                 'name': shape_info['name'],
                 'description': shape_info['description'],
-                'preview_url': os.path.relpath(shape_info['preview'], self.templates_dir)
+                'preview_url': self._preview_url('eye', shape_id, shape_info)
             })
         
         return shapes
@@ -1819,13 +1847,16 @@ class AdvancedQRStyleGenerator:
         Returns:
             list: Liste des formes de contours avec leurs informations
         """
+        # Prévisualisations manquantes générées à la consultation de la liste
+        self._ensure_previews('frame')
+        
         shapes = []
         for shape_id, shape_info in self.frame_shapes.items():
             shapes.append({
                 'id': shape_id,
                 'name': shape_info['name'],
                 'description': shape_info['description'],
-                'preview_url': os.path.relpath(shape_info['preview'], self.templates_dir)
+                'preview_url': self._preview_url('frame', shape_id, shape_info)
             })
         
         return shapes
@@ -1837,13 +1868,16 @@ class AdvancedQRStyleGenerator:
         Returns:
             list: Liste des styles prédéfinis avec leurs informations
         """
+        # Prévisualisations manquantes générées à la consultation de la liste
+        self._ensure_previews('style')
+        
         styles = []
         for style_id, style_info in self.predefined_styles.items():
             styles.append({
                 'id': style_id,
                 'name': style_info['name'],
                 'description': style_info['description'],
-                'preview_url': os.path.relpath(style_info['preview'], self.templates_dir)
+                'preview_url': self._preview_url('style', style_id, style_info)
             })
         
         return styles
@@ -1863,7 +1897,6 @@ class AdvancedQRStyleGenerator:
             str: Image base64 du QR code
         """
         import base64
-        from io import BytesIO
         
         # Génération de l'image
         if style_id and style_id in self.predefined_styles:
@@ -1891,41 +1924,9 @@ class AdvancedQRStyleGenerator:
             qr.make(fit=True)
             
             module_drawer = self.module_drawers.get(module_shape, {'drawer': SquareModuleDrawer()})['drawer']
-            color_mask_class = self.color_masks.get(color_mask, {'class': SolidFillColorMask})['class']
-            
-            # Options du masque de couleur
-            color_mask_kwargs = {}
-            if color_mask == 'solid':
-                color_mask_kwargs = {
-                    'front_color': options.get('front_color', (0, 0, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask in ['radial_gradient', 'square_gradient']:
-                color_mask_kwargs = {
-                    'center_color': options.get('front_color', (0, 102, 204)),
-                    'edge_color': options.get('edge_color', (0, 51, 153)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask == 'horizontal_gradient':
-                color_mask_kwargs = {
-                    'left_color': options.get('front_color', (255, 102, 0)),
-                    'right_color': options.get('edge_color', (204, 0, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            elif color_mask == 'vertical_gradient':
-                color_mask_kwargs = {
-                    'top_color': options.get('front_color', (0, 153, 0)),
-                    'bottom_color': options.get('edge_color', (0, 51, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
-            else:
-                color_mask_kwargs = {
-                    'front_color': options.get('front_color', (0, 0, 0)),
-                    'back_color': options.get('back_color', (255, 255, 255))
-                }
             
             # Création du masque de couleur
-            color_mask = color_mask_class(**color_mask_kwargs)
+            color_mask = self._build_color_mask(color_mask, options)
             
             # Création de l'image
             img = qr.make_image(
@@ -1959,7 +1960,7 @@ class AdvancedQRStyleGenerator:
         
         # Conversion en base64
         buffered = BytesIO()
-        img.save(buffered, format="PNG")
+        img.save(buffered, format="PNG", optimize=False, compress_level=1)
         img_str = base64.b64encode(buffered.getvalue()).decode()
         
         return f"data:image/png;base64,{img_str}"
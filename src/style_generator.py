@@ -7,8 +7,13 @@ Ce module fournit des fonctionnalités avancées pour personnaliser l'apparence
 """
 
 import os
-import uuid
-from datetime import datetime
+import multiprocessing
+import copy
+import secrets
+from io import BytesIO
+from types import MappingProxyType
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import (
@@ -26,7 +31,269 @@ from qrcode.image.styles.colormasks import (
     HorizontalGradiantColorMask,
     VerticalGradiantColorMask
 )
+import numpy as np
 from PIL import Image, ImageDraw, ImageChops
+from src.backend.customization.color_utils import color_mask_kwargs
+from src.backend.customization.metadata_journal import MetadataJournal
+
+# Au-delà de cette taille, les données ne sont pas mises en cache (mémoire bornée)
+_MATRIX_CACHE_MAX_DATA = 2048
+
+
+@lru_cache(maxsize=256)
+def _build_qrcode(data, version, error_correction, mask_pattern=None):
+    """
+    Construit et compile un QR code (Reed-Solomon, choix du masque) une seule fois
+    par (données, version, correction d'erreur, masque).
+    
+    L'objet renvoyé est partagé : il doit être copié avant toute modification.
+    
+    Args:
+        data (str): Données à encoder
+        version (int): Version du QR code (1-40)
+        error_correction (int): Niveau de correction d'erreur
+        mask_pattern (int, optional): Masque imposé (0-7). Si non spécifié, les huit
+            masques sont évalués et le meilleur est retenu.
+    
+    Returns:
+        QRCode: QR code compilé
+    """
+    qr = qrcode.QRCode(version=version, error_correction=error_correction,
+                       mask_pattern=mask_pattern)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def _make_qrcode(data, version, error_correction, box_size, border, mask_pattern=None):
+    """
+    Obtient un QR code compilé aux dimensions demandées, en réutilisant la matrice
+    des modules déjà calculée pour les mêmes données.
+    
+    Args:
+        data (str): Données à encoder
+        version (int): Version du QR code (1-40)
+        error_correction (int): Niveau de correction d'erreur
+        box_size (int): Taille de chaque "boîte" du QR code en pixels
+        border (int): Taille de la bordure en nombre de boîtes
+        mask_pattern (int, optional): Masque imposé (0-7)
+    
+    Returns:
+        QRCode: QR code compilé, propre à l'appelant
+    """
+    if len(data) > _MATRIX_CACHE_MAX_DATA:
+        qr = qrcode.QRCode(version=version, error_correction=error_correction,
+                           mask_pattern=mask_pattern)
+        qr.add_data(data)
+        qr.make(fit=True)
+    else:
+        # Copie superficielle : la matrice des modules, en lecture seule, est partagée
+        qr = copy.copy(_build_qrcode(data, version, error_correction, mask_pattern))
+    
+    qr.box_size = box_size
+    qr.border = border
+    return qr
+
+
+def _render_solid_square_modules(modules, box_size, border, front_color, back_color,
+                                 size_ratio=None):
+    """
+    Dessine des modules carrés de couleur unie sans passer par StyledPilImage.
+    
+    Les modules sont posés en une seule opération, à raison d'un pixel par module,
+    puis l'image est agrandie sans interpolation : le résultat est identique à celui
+    de SquareModuleDrawer avec SolidFillColorMask, sans la boucle par module ni
+    l'application du masque pixel par pixel.
+    
+    Avec size_ratio (GappedSquareModuleDrawer), les modules hors des
+    yeux sont réduits ; les pixels couverts sur chaque axe sont obtenus en dessinant
+    les mêmes rectangles que le module drawer sur une seule ligne, ce qui reproduit
+    exactement son arrondi des coordonnées.
+    
+    Args:
+        modules (list): Matrice des modules du QR code (sans bordure)
+        box_size (int): Taille de chaque "boîte" du QR code en pixels
+        border (int): Taille de la bordure en nombre de boîtes
+        front_color (tuple): Couleur des modules (RGB)
+        back_color (tuple): Couleur d'arrière-plan (RGB)
+        size_ratio (float, optional): Taille relative des modules espacés
+    
+    Returns:
+        Image: Image PIL en mode RGB
+    """
+    count = len(modules)
+    size = count + 2 * border
+    
+    if size_ratio is not None:
+        pixel_size = size * box_size
+        
+        # Pixels couverts par les modules réduits, identiques sur les deux axes
+        delta = (1 - size_ratio) * box_size / 2
+        strip = Image.new('L', (pixel_size, 1), 0)
+        strip_draw = ImageDraw.Draw(strip)
+        for index in range(count):
+            x = (index + border) * box_size
+            strip_draw.rectangle((x + delta, 0, x + box_size - 1 - delta, 0), fill=255)
+        covered = np.asarray(strip, dtype=bool)[0]
+        
+        # Modules foncés et yeux (dessinés en carrés pleins), bordure comprise
+        dark = np.zeros((size, size), dtype=bool)
+        dark[border:border + count, border:border + count] = modules
+        eyes = np.zeros((size, size), dtype=bool)
+        for row, col in ((0, 0), (0, count - 7), (count - 7, 0)):
+            eyes[border + row:border + row + 7, border + col:border + col + 7] = True
+        
+        dark = np.repeat(np.repeat(dark, box_size, axis=0), box_size, axis=1)
+        eyes = np.repeat(np.repeat(eyes, box_size, axis=0), box_size, axis=1)
+        mask = dark & (eyes | (covered[None, :] & covered[:, None]))
+        
+        img = Image.new('RGB', (pixel_size, pixel_size), back_color)
+        img.paste(front_color, (0, 0), Image.fromarray(mask))
+        return img
+    
+    # Masque des modules foncés
+    mask = Image.fromarray(np.array(modules, dtype=bool))
+    
+    img = Image.new('RGB', (size, size), back_color)
+    img.paste(front_color, (border, border), mask)
+    
+    return img.resize((size * box_size, size * box_size), Image.Resampling.NEAREST)
+
+
+class _VectorizedColorMaskMixin:
+    """
+    Application d'un masque de couleur avec NumPy, en une seule passe.
+    
+    Reproduit exactement QRColorMask.apply_mask (interpolation entre la couleur de
+    fond et celle de premier plan selon la teinte de chaque pixel, anticrénelage
+    compris), sans appel à getpixel/putpixel pour chaque pixel. Les classes filles
+    fournissent les couleurs de premier plan par _fg_pixels(width, height), qui
+    renvoie un tableau RGB de forme compatible avec (hauteur, largeur, 3).
+    """
+    
+    def apply_mask(self, image):
+        if image.mode != 'RGB' or len(self.back_color) != 3:
+            return super().apply_mask(image)
+        
+        width, height = image.size
+        back_color = np.array(self.back_color, dtype=np.float64)
+        
+        # Coefficient d'interpolation de chaque pixel, moyenné sur les canaux où la
+        # couleur de fond et la couleur de dessin diffèrent
+        pixels = np.asarray(image, dtype=np.float64)
+        norm = None
+        count = 0
+        for channel, (back, paint) in enumerate(zip(self.back_color, self.paint_color)):
+            if back != paint:
+                extrap = (pixels[..., channel] - back) / (paint - back)
+                norm = extrap if norm is None else norm + extrap
+                count += 1
+        if norm is None:
+            image.paste(tuple(self.back_color), (0, 0, width, height))
+            return
+        norm = (norm / count)[..., None]
+        
+        fg_pixels = self._fg_pixels(width, height)
+        out = np.trunc(fg_pixels * norm + back_color * (1 - norm))
+        
+        # putpixel borne les composantes hors de [0, 255] (dépassements du rééchantillonnage)
+        image.paste(Image.fromarray(np.clip(out, 0, 255).astype(np.uint8), 'RGB'))
+    
+    @staticmethod
+    def _interp_colors(color1, color2, norm):
+        """Interpolation (tronquée, comme interp_color) entre deux couleurs"""
+        norm = norm[..., None]
+        return np.trunc(np.array(color2, dtype=np.float64) * norm
+                        + np.array(color1, dtype=np.float64) * (1 - norm))
+
+
+class _SolidFillColorMask(_VectorizedColorMaskMixin, SolidFillColorMask):
+    """Masque de couleur unie appliqué avec NumPy"""
+    
+    def apply_mask(self, image):
+        if self.back_color == (255, 255, 255) and self.front_color == (0, 0, 0):
+            # L'image est déjà dessinée en noir et blanc
+            return
+        super().apply_mask(image)
+    
+    def _fg_pixels(self, width, height):
+        return np.array(self.front_color, dtype=np.float64)
+
+
+class _RadialGradiantColorMask(_VectorizedColorMaskMixin, RadialGradiantColorMask):
+    """Masque en gradient radial appliqué avec NumPy"""
+    
+    def _fg_pixels(self, width, height):
+        xs = np.arange(width, dtype=np.float64)[None, :]
+        ys = np.arange(height, dtype=np.float64)[:, None]
+        distance = np.sqrt((xs - width / 2) ** 2 + (ys - width / 2) ** 2) / (np.sqrt(2) * width / 2)
+        return self._interp_colors(self.center_color, self.edge_color, distance)
+
+
+class _SquareGradiantColorMask(_VectorizedColorMaskMixin, SquareGradiantColorMask):
+    """Masque en gradient carré appliqué avec NumPy"""
+    
+    def _fg_pixels(self, width, height):
+        xs = np.arange(width, dtype=np.float64)[None, :]
+        ys = np.arange(height, dtype=np.float64)[:, None]
+        distance = np.maximum(np.abs(xs - width / 2), np.abs(ys - width / 2)) / (width / 2)
+        return self._interp_colors(self.center_color, self.edge_color, distance)
+
+
+class _HorizontalGradiantColorMask(_VectorizedColorMaskMixin, HorizontalGradiantColorMask):
+    """Masque en gradient horizontal appliqué avec NumPy (une ligne de couleurs)"""
+    
+    def _fg_pixels(self, width, height):
+        xs = np.arange(width, dtype=np.float64)[None, :]
+        return self._interp_colors(self.left_color, self.right_color, xs / width)
+
+
+class _VerticalGradiantColorMask(_VectorizedColorMaskMixin, VerticalGradiantColorMask):
+    """Masque en gradient vertical appliqué avec NumPy (une colonne de couleurs)"""
+    
+    def _fg_pixels(self, width, height):
+        ys = np.arange(height, dtype=np.float64)[:, None]
+        return self._interp_colors(self.top_color, self.bottom_color, ys / width)
+
+
+# Nombre maximal de masques de couleur personnalisés conservés par instance
+_COLOR_MASK_CACHE_MAX = 256
+
+# Couleurs par défaut (premier plan, seconde couleur des gradients)
+_DEFAULT_MASK_COLORS = ((0, 0, 0), (100, 100, 100))
+
+
+# Personnalisateurs réutilisés dans chaque processus de travail de generate_batch
+_worker_customizers = {}
+
+
+def _generate_styled_qrcode_worker(job):
+    """
+    Génère un QR code stylisé dans un processus de travail.
+    
+    Le personnalisateur (styles, masques et matrices en cache) est créé une seule
+    fois par processus ; son journal de métadonnées est vidé après chaque QR code.
+    
+    Args:
+        job (tuple): (répertoire de sortie, legacy_metadata, entrée)
+    
+    Returns:
+        str: Chemin du fichier QR code généré.
+    """
+    output_dir, legacy_metadata, entry = job
+    
+    customizer = _worker_customizers.get((output_dir, legacy_metadata))
+    if customizer is None:
+        customizer = QRCodeCustomizer(output_dir=output_dir, legacy_metadata=legacy_metadata)
+        _worker_customizers[(output_dir, legacy_metadata)] = customizer
+    
+    try:
+        if 'style_name' in entry:
+            return customizer.apply_predefined_style(**entry)
+        return customizer.generate_styled_qrcode(**entry)
+    finally:
+        customizer.close()
+
 
 class QRCodeCustomizer:
     """
@@ -34,19 +301,89 @@ class QRCodeCustomizer:
     Fournit des méthodes pour personnaliser l'apparence des QR codes avec différents styles.
     """
 
-    def __init__(self, output_dir=None):
+    # Styles prédéfinis, construits une seule fois à l'import
+    PREDEFINED_STYLES = MappingProxyType({
+        'classic': {
+            'module_drawer': 'square',
+            'color_mask': 'solid',
+            'front_color': (0, 0, 0),
+            'back_color': (255, 255, 255)
+        },
+        'rounded': {
+            'module_drawer': 'rounded',
+            'color_mask': 'solid',
+            'front_color': (0, 0, 0),
+            'back_color': (255, 255, 255)
+        },
+        'dots': {
+            'module_drawer': 'circle',
+            'color_mask': 'solid',
+            'front_color': (0, 0, 0),
+            'back_color': (255, 255, 255)
+        },
+        'modern_blue': {
+            'module_drawer': 'rounded',
+            'color_mask': 'vertical_gradient',
+            'front_color': (0, 102, 204),
+            'bottom_color': (0, 51, 153),
+            'back_color': (255, 255, 255)
+        },
+        'sunset': {
+            'module_drawer': 'circle',
+            'color_mask': 'horizontal_gradient',
+            'left_color': (255, 102, 0),
+            'right_color': (204, 0, 0),
+            'back_color': (255, 255, 255)
+        },
+        'forest': {
+            'module_drawer': 'square',
+            'color_mask': 'radial_gradient',
+            'front_color': (0, 102, 0),
+            'edge_color': (0, 51, 0),
+            'gradient_center': (0.5, 0.5),
+            'back_color': (255, 255, 255)
+        },
+        'ocean': {
+            'module_drawer': 'rounded',
+            'color_mask': 'radial_gradient',
+            'front_color': (0, 153, 204),
+            'edge_color': (0, 51, 102),
+            'gradient_center': (0.5, 0.5),
+            'back_color': (255, 255, 255)
+        },
+        'barcode': {
+            'module_drawer': 'vertical_bars',
+            'color_mask': 'solid',
+            'front_color': (0, 0, 0),
+            'back_color': (255, 255, 255)
+        },
+        'elegant': {
+            'module_drawer': 'gapped_square',
+            'color_mask': 'solid',
+            'front_color': (51, 51, 51),
+            'back_color': (245, 245, 245)
+        }
+    })
+
+    def __init__(self, output_dir=None, legacy_metadata=False):
         """
         Initialise le personnalisateur de QR codes.
         
         Args:
             output_dir (str, optional): Répertoire de sortie pour les QR codes générés.
                 Si non spécifié, utilise le répertoire courant.
+            legacy_metadata (bool): Écrit un fichier texte de métadonnées par QR code
+                au lieu d'une ligne dans le journal metadata/index.jsonl
         """
         self.output_dir = output_dir or os.path.join(os.getcwd(), 'generated_qrcodes')
         
-        # Création du répertoire de sortie s'il n'existe pas
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        # Création des répertoires de sortie et des métadonnées (une seule fois)
+        self.metadata_dir = os.path.join(self.output_dir, 'metadata')
+        os.makedirs(self.metadata_dir, exist_ok=True)
+        
+        # Journal des métadonnées, ouvert à la première écriture et tamponné
+        self.legacy_metadata = legacy_metadata
+        self._metadata_journal = MetadataJournal(self.metadata_dir, legacy=legacy_metadata)
         
         # Dictionnaire des styles de modules disponibles
         self.module_drawers = {
@@ -60,77 +397,25 @@ class QRCodeCustomizer:
             'mini_square': SquareModuleDrawer(module_scale=0.8)
         }
         
-        # Dictionnaire des masques de couleur disponibles
+        # Dictionnaire des masques de couleur disponibles (appliqués avec NumPy)
         self.color_masks = {
-            'solid': SolidFillColorMask,
-            'radial_gradient': RadialGradiantColorMask,
-            'square_gradient': SquareGradiantColorMask,
-            'horizontal_gradient': HorizontalGradiantColorMask,
-            'vertical_gradient': VerticalGradiantColorMask
+            'solid': _SolidFillColorMask,
+            'radial_gradient': _RadialGradiantColorMask,
+            'square_gradient': _SquareGradiantColorMask,
+            'horizontal_gradient': _HorizontalGradiantColorMask,
+            'vertical_gradient': _VerticalGradiantColorMask
         }
         
-        # Dictionnaire des styles prédéfinis
-        self.predefined_styles = {
-            'classic': {
-                'module_drawer': 'square',
-                'color_mask': 'solid',
-                'front_color': (0, 0, 0),
-                'back_color': (255, 255, 255)
-            },
-            'rounded': {
-                'module_drawer': 'rounded',
-                'color_mask': 'solid',
-                'front_color': (0, 0, 0),
-                'back_color': (255, 255, 255)
-            },
-            'dots': {
-                'module_drawer': 'circle',
-                'color_mask': 'solid',
-                'front_color': (0, 0, 0),
-                'back_color': (255, 255, 255)
-            },
-            'modern_blue': {
-                'module_drawer': 'rounded',
-                'color_mask': 'vertical_gradient',
-                'front_color': (0, 102, 204),
-                'bottom_color': (0, 51, 153),
-                'back_color': (255, 255, 255)
-            },
-            'sunset': {
-                'module_drawer': 'circle',
-                'color_mask': 'horizontal_gradient',
-                'left_color': (255, 102, 0),
-                'right_color': (204, 0, 0),
-                'back_color': (255, 255, 255)
-            },
-            'forest': {
-                'module_drawer': 'square',
-                'color_mask': 'radial_gradient',
-                'front_color': (0, 102, 0),
-                'edge_color': (0, 51, 0),
-                'gradient_center': (0.5, 0.5),
-                'back_color': (255, 255, 255)
-            },
-            'ocean': {
-                'module_drawer': 'rounded',
-                'color_mask': 'radial_gradient',
-                'front_color': (0, 153, 204),
-                'edge_color': (0, 51, 102),
-                'gradient_center': (0.5, 0.5),
-                'back_color': (255, 255, 255)
-            },
-            'barcode': {
-                'module_drawer': 'vertical_bars',
-                'color_mask': 'solid',
-                'front_color': (0, 0, 0),
-                'back_color': (255, 255, 255)
-            },
-            'elegant': {
-                'module_drawer': 'gapped_square',
-                'color_mask': 'solid',
-                'front_color': (51, 51, 51),
-                'back_color': (245, 245, 245)
-            }
+        # Styles prédéfinis (copie de la table de classe, extensible par instance)
+        self.predefined_styles = dict(self.PREDEFINED_STYLES)
+        
+        # Masques de couleur déjà construits, par type et arguments
+        self._color_mask_cache = {}
+        
+        # Masques de couleur des styles prédéfinis, construits une seule fois
+        self._predefined_masks = {
+            style_name: self._create_color_mask(style)
+            for style_name, style in self.predefined_styles.items()
         }
     
     def generate_styled_qrcode(self, data, filename=None, **options):
@@ -140,7 +425,7 @@ class QRCodeCustomizer:
         Args:
             data (str): Données à encoder dans le QR code (URL, texte, etc.)
             filename (str, optional): Nom du fichier de sortie. Si non spécifié,
-                génère un nom basé sur un UUID.
+                génère un nom aléatoire.
             **options: Options supplémentaires pour la personnalisation du QR code.
                 - version (int): Version du QR code (1-40)
                 - error_correction (int): Niveau de correction d'erreur
@@ -150,91 +435,186 @@ class QRCodeCustomizer:
                 - color_mask (str): Type de masque de couleur ('solid', 'radial_gradient', etc.)
                 - front_color (tuple/str): Couleur de premier plan (RGB ou nom)
                 - back_color (tuple/str): Couleur d'arrière-plan (RGB ou nom)
-                - gradient_center (tuple): Centre du gradient (x, y) entre 0 et 1
+                - gradient_center (tuple): Centre du gradient (x, y) entre 0 et 1 (ignoré :
+                  les gradients de qrcode sont toujours centrés)
                 - gradient_direction (tuple): Direction du gradient (x, y)
+                - png_compress_level (int): Niveau de compression PNG de 0 à 9 (1 par défaut)
+                - mask_pattern (int): Masque imposé (0-7). Évite l'évaluation des huit
+                  masques (la partie la plus coûteuse de l'encodage), au prix d'un
+                  symbole éventuellement moins équilibré, mais toujours lisible.
+                - return_bytes (bool): Renvoie le contenu PNG au lieu d'écrire un fichier
+                  (aucune métadonnée n'est alors enregistrée)
             
         Returns:
-            str: Chemin du fichier QR code généré.
+            str or bytes: Chemin du fichier QR code généré, ou contenu PNG avec
+                return_bytes.
+        """
+        return self._generate_styled_qrcode(data, filename, options)
+    
+    def _generate_styled_qrcode(self, data, filename, options, io_pool=None):
+        """
+        Génère un QR code avec un style personnalisé (voir generate_styled_qrcode).
+        
+        Args:
+            data (str): Données à encoder dans le QR code
+            filename (str): Nom du fichier de sortie, ou None
+            options (dict): Options de personnalisation
+            io_pool (ThreadPoolExecutor, optional): Pool chargé de la sauvegarde
+        
+        Returns:
+            str: Chemin du fichier QR code généré, ou Future de ce chemin si
+                io_pool est spécifié.
         """
         if not filename:
-            filename = f"styled_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"styled_qrcode_{secrets.token_hex(4)}.png"
         
         # Chemin complet du fichier de sortie
         output_path = os.path.join(self.output_dir, filename)
         
-        # Paramètres par défaut
-        version = options.get('version', 1)
-        error_correction = options.get('error_correction', qrcode.constants.ERROR_CORRECT_M)
-        box_size = options.get('box_size', 10)
-        border = options.get('border', 4)
-        
         # Style des modules
         module_drawer_name = options.get('module_drawer', 'square')
         module_drawer = self.module_drawers.get(module_drawer_name, SquareModuleDrawer())
         
         # Masque de couleur
+        color_mask = self._create_color_mask(options)
+        
+        return self._render_styled_qrcode(data, output_path, module_drawer, color_mask, options,
+                                          io_pool)
+    
+    def _create_color_mask(self, options):
+        """
+        Crée le masque de couleur décrit par les options.
+        
+        Un masque déjà construit avec les mêmes arguments est réutilisé.
+        
+        Args:
+            options (dict): Options de personnalisation (color_mask, front_color,
+                back_color et options spécifiques aux gradients)
+        
+        Returns:
+            QRColorMask: Masque de couleur
+        """
         color_mask_name = options.get('color_mask', 'solid')
-        color_mask_class = self.color_masks.get(color_mask_name, SolidFillColorMask)
-        
-        # Couleurs
-        front_color = options.get('front_color', (0, 0, 0))
-        back_color = options.get('back_color', (255, 255, 255))
-        
-        # Options spécifiques aux gradients
-        color_mask_kwargs = {}
-        if color_mask_name == 'solid':
-            color_mask_kwargs = {
-                'front_color': front_color,
-                'back_color': back_color
-            }
-        elif color_mask_name == 'radial_gradient' or color_mask_name == 'square_gradient':
-            color_mask_kwargs = {
-                'center_color': front_color,
-                'edge_color': options.get('edge_color', (100, 100, 100)),
-                'back_color': back_color
-            }
-            if 'gradient_center' in options:
-                color_mask_kwargs['center'] = options.get('gradient_center', (0.5, 0.5))
-        elif color_mask_name == 'horizontal_gradient':
-            color_mask_kwargs = {
-                'left_color': front_color,
-                'right_color': options.get('right_color', (100, 100, 100)),
-                'back_color': back_color
-            }
-        elif color_mask_name == 'vertical_gradient':
-            color_mask_kwargs = {
-                'top_color': front_color,
-                'bottom_color': options.get('bottom_color', (100, 100, 100)),
-                'back_color': back_color
-            }
+        if color_mask_name not in self.color_masks:
+            color_mask_name = 'solid'
+        color_mask_class = self.color_masks[color_mask_name]
+        
+        # Arguments du masque (table de correspondance partagée ; les couleurs
+        # textuelles sont converties en tuples RGB)
+        mask_kwargs = color_mask_kwargs(color_mask_name, options, _DEFAULT_MASK_COLORS)
+        
+        # Réutilisation d'un masque identique (arguments non hachables : pas de cache)
+        try:
+            key = (color_mask_class, tuple(sorted(mask_kwargs.items())))
+            color_mask = self._color_mask_cache.get(key)
+        except TypeError:
+            return color_mask_class(**mask_kwargs)
         
         # Création du masque de couleur
-        color_mask = color_mask_class(**color_mask_kwargs)
-        
-        # Génération du QR code
-        qr = qrcode.QRCode(
-            version=version,
-            error_correction=error_correction,
-            box_size=box_size,
-            border=border,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        if color_mask is None:
+            if len(self._color_mask_cache) >= _COLOR_MASK_CACHE_MAX:
+                self._color_mask_cache.clear()
+            color_mask = color_mask_class(**mask_kwargs)
+            self._color_mask_cache[key] = color_mask
+        return color_mask
+    
+    def _render_styled_qrcode(self, data, output_path, module_drawer, color_mask, options,
+                              io_pool=None):
+        """
+        Génère et enregistre un QR code avec un style de modules et un masque de
+        couleur déjà construits.
+        
+        Avec io_pool, la sauvegarde (encodage PNG, qui libère le GIL) et les
+        métadonnées sont confiées au pool : l'appelant peut construire le QR code
+        suivant pendant ce temps.
+        
+        Args:
+            data (str): Données à encoder dans le QR code
+            output_path (str): Chemin du fichier de sortie
+            module_drawer: Style des modules
+            color_mask: Masque de couleur
+            options (dict): Options de génération (version, error_correction,
+                box_size, border, mask_pattern, frame_shape, eye_shape,
+                png_compress_level)
+            io_pool (ThreadPoolExecutor, optional): Pool chargé de la sauvegarde
         
-        # Création de l'image avec le style personnalisé
-        img = qr.make_image(
-            image_factory=StyledPilImage,
-            module_drawer=module_drawer,
-            color_mask=color_mask
+        Returns:
+            str: Chemin du fichier QR code généré, ou Future de ce chemin si
+                io_pool est spécifié.
+        """
+        # Paramètres par défaut
+        version = options.get('version', 1)
+        error_correction = options.get('error_correction', qrcode.constants.ERROR_CORRECT_M)
+        box_size = options.get('box_size', 10)
+        border = options.get('border', 4)
+        
+        # Génération du QR code (matrice des modules mise en cache)
+        qr = _make_qrcode(data, version, error_correction, box_size, border,
+                          options.get('mask_pattern'))
+        
+        # Création de l'image avec le style personnalisé (modules carrés, espacés ou
+        # non, de couleur unie dessinés directement ; un fond noir est laissé à
+        # StyledPilImage, qui l'applique alors aussi aux modules)
+        solid_colors = (
+            isinstance(color_mask, SolidFillColorMask)
+            and len(color_mask.front_color) == 3
+            and len(color_mask.back_color) == 3
+            and tuple(color_mask.back_color) != (0, 0, 0)
         )
+        if solid_colors and type(module_drawer) is SquareModuleDrawer:
+            img_pil = _render_solid_square_modules(
+                qr.modules, box_size, border,
+                tuple(color_mask.front_color), tuple(color_mask.back_color)
+            )
+        elif solid_colors and type(module_drawer) is GappedSquareModuleDrawer:
+            img_pil = _render_solid_square_modules(
+                qr.modules, box_size, border,
+                tuple(color_mask.front_color), tuple(color_mask.back_color),
+                size_ratio=module_drawer.size_ratio
+            )
+        else:
+            img = qr.make_image(
+                image_factory=StyledPilImage,
+                module_drawer=module_drawer,
+                color_mask=color_mask
+            )
+            img_pil = img.get_image()
         
         # Personnalisation des yeux et des contours si spécifiée
-        img_pil = img.get_image()
-        if 'frame_shape' in options or 'eye_shape' in options:
+        if options.get('frame_shape') or options.get('eye_shape'):
             img_pil = self._customize_eyes_and_frames(img_pil, options)
         
-        # Sauvegarde de l'image
-        img_pil.save(output_path)
+        if io_pool is not None:
+            return io_pool.submit(self._save_styled_qrcode, img_pil, data, output_path, options)
+        return self._save_styled_qrcode(img_pil, data, output_path, options)
+    
+    def _save_styled_qrcode(self, img_pil, data, output_path, options):
+        """
+        Enregistre l'image d'un QR code stylisé et ses métadonnées.
+        
+        Avec l'option return_bytes, l'image est encodée en mémoire et renvoyée,
+        sans fichier ni métadonnées.
+        
+        Args:
+            img_pil: Image PIL du QR code
+            data (str): Données encodées dans le QR code
+            output_path (str): Chemin du fichier de sortie
+            options (dict): Options de génération (png_compress_level, return_bytes)
+        
+        Returns:
+            str or bytes: Chemin du fichier QR code généré, ou contenu PNG avec
+                return_bytes.
+        """
+        compress_level = int(options.get('png_compress_level', 1))
+        
+        # Encodage en mémoire pour les appelants qui servent l'image directement
+        if options.get('return_bytes'):
+            buffered = BytesIO()
+            img_pil.save(buffered, format='PNG', optimize=False, compress_level=compress_level)
+            return buffered.getvalue()
+        
+        # Sauvegarde de l'image (compression zlib rapide par défaut)
+        img_pil.save(output_path, format='PNG', optimize=False, compress_level=compress_level)
         
         # Enregistrement des métadonnées
         self._save_metadata(data, output_path, options)
@@ -245,12 +625,15 @@ class QRCodeCustomizer:
         """
         Personnalise les yeux et les contours du QR code.
         
+        Implémentation de démonstration : l'image est renvoyée telle quelle, sans
+        copie ni modification.
+        
         Args:
             qr_image: Image PIL du QR code
             options: Options de personnalisation
         
         Returns:
-            Image: Image PIL modifiée
+            Image: Image PIL du QR code (qr_image)
         """
         # Cette fonction est une implémentation simplifiée pour la démonstration
         # Pour une implémentation complète, il faudrait localiser les modules des yeux 
@@ -281,7 +664,7 @@ class QRCodeCustomizer:
             str: Chemin du fichier QR code généré
         """
         if not filename:
-            filename = f"custom_shape_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"custom_shape_qrcode_{secrets.token_hex(4)}.png"
         
         # Mise à jour des options
         options['module_drawer'] = module_shape
@@ -299,62 +682,127 @@ class QRCodeCustomizer:
             data (str): Données à encoder dans le QR code (URL, texte, etc.)
             style_name (str): Nom du style prédéfini à appliquer
             filename (str, optional): Nom du fichier de sortie. Si non spécifié,
-                génère un nom basé sur un UUID.
+                génère un nom aléatoire.
             **custom_options: Options personnalisées qui remplaceront celles du style prédéfini
             
         Returns:
             str: Chemin du fichier QR code généré.
         """
+        return self._apply_predefined_style(data, style_name, filename, custom_options)
+    
+    def _apply_predefined_style(self, data, style_name, filename, custom_options, io_pool=None):
+        """
+        Applique un style prédéfini au QR code (voir apply_predefined_style).
+        
+        Args:
+            data (str): Données à encoder dans le QR code
+            style_name (str): Nom du style prédéfini à appliquer
+            filename (str): Nom du fichier de sortie, ou None
+            custom_options (dict): Options remplaçant celles du style prédéfini
+            io_pool (ThreadPoolExecutor, optional): Pool chargé de la sauvegarde
+        
+        Returns:
+            str: Chemin du fichier QR code généré, ou Future de ce chemin si
+                io_pool est spécifié.
+        """
         # Vérification que le style existe
         if style_name not in self.predefined_styles:
             raise ValueError(f"Style '{style_name}' non reconnu. Styles disponibles: {', '.join(self.predefined_styles.keys())}")
         
-        # Récupération des options du style prédéfini
-        style_options = self.predefined_styles[style_name].copy()
+        # Chemin rapide : style prédéfini sans personnalisation, masque déjà construit
+        color_mask = None if custom_options else self._predefined_masks.get(style_name)
+        if color_mask is not None:
+            style_options = self.predefined_styles[style_name]
+            module_drawer = self.module_drawers.get(style_options['module_drawer'], SquareModuleDrawer())
+            if not filename:
+                filename = f"{style_name}_qrcode_{secrets.token_hex(4)}.png"
+            output_path = os.path.join(self.output_dir, filename)
+            return self._render_styled_qrcode(data, output_path, module_drawer, color_mask,
+                                              style_options, io_pool)
         
-        # Fusion avec les options personnalisées
-        style_options.update(custom_options)
+        # Options du style prédéfini, fusionnées avec les options personnalisées
+        style_options = {**self.predefined_styles[style_name], **custom_options}
         
         # Génération du QR code avec le style
         if not filename:
-            filename = f"{style_name}_qrcode_{uuid.uuid4().hex[:8]}.png"
+            filename = f"{style_name}_qrcode_{secrets.token_hex(4)}.png"
         
-        return self.generate_styled_qrcode(data, filename, **style_options)
+        return self._generate_styled_qrcode(data, filename, style_options, io_pool)
     
-    def _save_metadata(self, data, output_path, options=None):
+    def generate_style_gallery(self, data, styles=None, **custom_options):
         """
-        Enregistre les métadonnées du QR code généré.
+        Génère le même QR code dans plusieurs styles prédéfinis (galerie d'aperçus).
+        
+        Les données ne sont encodées qu'une fois (matrice des modules mise en cache) ;
+        seuls le dessin des modules, le masque de couleur et la sauvegarde sont
+        répétés pour chaque style. Les sauvegardes sont faites par deux threads,
+        pendant le dessin des styles suivants.
         
         Args:
-            data (str): Données encodées dans le QR code
-            output_path (str): Chemin du fichier QR code généré
-            options (dict, optional): Options utilisées pour la génération
+            data (str): Données à encoder dans le QR code
+            styles (list, optional): Noms des styles prédéfinis. Si non spécifié,
+                utilise tous les styles prédéfinis.
+            **custom_options: Options personnalisées appliquées à chaque style
+        
+        Returns:
+            dict: Chemin du fichier généré pour chaque style
+        """
+        if styles is None:
+            styles = list(self.predefined_styles)
+        
+        with ThreadPoolExecutor(max_workers=2) as io_pool:
+            futures = {
+                style_name: self._apply_predefined_style(data, style_name, None, custom_options,
+                                                         io_pool)
+                for style_name in styles
+            }
+            return {style_name: future.result() for style_name, future in futures.items()}
+    
+    def generate_batch(self, entries, max_workers=None):
         """
-        metadata_dir = os.path.join(self.output_dir, 'metadata')
-        if not os.path.exists(metadata_dir):
-            os.makedirs(metadata_dir)
+        Génère plusieurs QR codes stylisés en parallèle dans un pool de processus.
         
-        # Nom du fichier de métadonnées basé sur le nom du QR code
-        qr_filename = os.path.basename(output_path)
-        metadata_filename = f"{os.path.splitext(qr_filename)[0]}.txt"
-        metadata_path = os.path.join(metadata_dir, metadata_filename)
+        Comme pour les QR codes sociaux, les processus sont démarrés avec 'spawn'
+        et non par fork : le verrou du journal des métadonnées ou ceux des threads
+        de l'appelant (serveur web, galerie de styles) seraient copiés dans l'état
+        où ils se trouvent.
         
-        # Création du contenu des métadonnées
-        metadata_content = [
-            f"Date de création: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Données: {data}",
-            f"Fichier: {qr_filename}",
-        ]
+        Args:
+            entries (list): Liste de dictionnaires d'arguments pour generate_styled_qrcode
+                ('data', et éventuellement 'filename' et les options), ou pour
+                apply_predefined_style s'ils contiennent 'style_name'
+            max_workers (int, optional): Nombre de processus. Si non spécifié,
+                utilise le nombre de processeurs.
         
-        # Ajout des options si spécifiées
-        if options:
-            metadata_content.append("Options:")
-            for key, value in options.items():
-                metadata_content.append(f"  {key}: {value}")
+        Returns:
+            list: Chemins des fichiers générés, dans l'ordre des entrées.
+        """
+        jobs = [(self.output_dir, self.legacy_metadata, entry) for entry in entries]
+        
+        # Les métadonnées déjà en tampon sont écrites avant celles des processus
+        self.close()
         
-        # Écriture des métadonnées dans le fichier
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(metadata_content))
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(_generate_styled_qrcode_worker, jobs))
+    
+    def _save_metadata(self, data, output_path, options=None):
+        """
+        Enregistre les métadonnées du QR code généré dans le journal
+        metadata/index.jsonl (ou un fichier texte avec legacy_metadata).
+        
+        Args:
+            data (str): Données encodées dans le QR code
+            output_path (str): Chemin du fichier QR code généré
+            options (dict, optional): Options utilisées pour la génération
+        """
+        self._metadata_journal.write(data, output_path, options)
+    
+    def close(self):
+        """
+        Vide et ferme le journal des métadonnées.
+        """
+        self._metadata_journal.close()
 
 
 # Exemple d'utilisation si exécuté directement
@@ -380,3 +828,5 @@ if __name__ == "__main__":
         "example_ocean.png"
     )
     print(f"QR code avec style prédéfini généré: {predefined_qr}")
+    
+    customizer.close()
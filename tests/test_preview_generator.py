@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de test pour le générateur de prévisualisations.
+Ce module contient les tests unitaires de la classe QRCodePreviewGenerator.
+"""
+
+import os
+import io
+import base64
+import pytest
+import qrcode
+from PIL import Image
+import sys
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import du module à tester
+from src.backend.customization.preview_generator import QRCodePreviewGenerator
+
+
+def _decode_preview(data_uri):
+    """Décode une prévisualisation 'data:image/png;base64,...' en image PIL"""
+    assert data_uri.startswith("data:image/png;base64,")
+    return Image.open(io.BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+
+
+class TestQRCodePreviewGenerator:
+    """Classe de test pour QRCodePreviewGenerator"""
+
+    @pytest.fixture
+    def preview_generator(self):
+        """
+        Fixture créant le générateur sans son constructeur (qui instancie
+        GappedSquareModuleDrawer avec un argument gap_width refusé par qrcode 7.4)
+        """
+        return QRCodePreviewGenerator.__new__(QRCodePreviewGenerator)
+
+    def test_error_correction_preview_levels(self, preview_generator):
+        """Test d'une prévisualisation par niveau de correction d'erreur"""
+        data = "https://www.example.com"
+        previews = preview_generator.generate_error_correction_preview(
+            data, box_size=2, border=1, fill_color=(255, 0, 0, 255), back_color=(0, 255, 0, 255)
+        )
+        assert list(previews) == ['L', 'M', 'Q', 'H']
+
+        levels = {
+            'L': qrcode.constants.ERROR_CORRECT_L,
+            'M': qrcode.constants.ERROR_CORRECT_M,
+            'Q': qrcode.constants.ERROR_CORRECT_Q,
+            'H': qrcode.constants.ERROR_CORRECT_H
+        }
+        for level, error_correction in levels.items():
+            qr = qrcode.QRCode(version=1, error_correction=error_correction, border=1)
+            qr.add_data(data)
+            qr.make(fit=True)
+            matrix = qr.get_matrix()
+
+            img = _decode_preview(previews[level])
+            assert img.mode == 'RGB'
+            assert img.size == (len(matrix) * 2, len(matrix) * 2)
+
+            # Couleurs des modules (canal alpha ignoré) et du fond, module par module
+            expected = [(255, 0, 0) if module else (0, 255, 0) for row in matrix for module in row]
+            assert list(img.resize((len(matrix), len(matrix)), Image.NEAREST).getdata()) == expected
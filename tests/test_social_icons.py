@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de test pour les QR codes avec icônes de réseaux sociaux.
+Ce module contient les tests unitaires de la bibliothèque d'icônes
+et du générateur de QR codes sociaux.
+"""
+
+import os
+import time
+import threading
+import pytest
+import qrcode
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import sys
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# Import du module à tester
+from src.backend.customization import social_icons
+from src.backend.customization.social_icons import (
+    SocialIconLibrary,
+    SocialQRGenerator,
+    _get_qr_modules,
+    _render_qr_modules
+)
+
+
+class TestSocialQRGenerator:
+    """Classe de test pour SocialIconLibrary et SocialQRGenerator"""
+
+    @pytest.fixture
+    def icon_library(self, tmp_path):
+        """Fixture créant une bibliothèque d'icônes locale, sans téléchargement"""
+        icons_dir = tmp_path / "icons"
+        library = SocialIconLibrary(icons_dir=str(icons_dir), download_if_missing=False)
+        for platform in library.icons_config:
+            Image.new('RGBA', (200, 200), color=(255, 0, 0, 255)).save(icons_dir / f"{platform}.png")
+            (icons_dir / f"{platform}.svg").write_text('<svg xmlns="http://www.w3.org/2000/svg"/>')
+        return library
+
+    @pytest.fixture
+    def generator(self, tmp_path, icon_library):
+        """Fixture pour créer une instance de SocialQRGenerator avec un répertoire temporaire"""
+        output_dir = tmp_path / "qrcodes"
+        return SocialQRGenerator(output_dir=str(output_dir), icon_library=icon_library)
+
+    def test_resize_icon_is_cached(self, icon_library):
+        """Test de la mise en cache des icônes redimensionnées"""
+        icon = icon_library.resize_icon('facebook', (40, 40))
+        assert icon.size == (40, 40)
+        assert icon.mode == 'RGBA'
+        assert icon_library.resize_icon('facebook', (40, 40)) is icon
+
+    def test_resize_cache_is_bounded(self, icon_library):
+        """Test de l'éviction des plus anciennes icônes redimensionnées"""
+        icon_library._resized_cache_max = 4
+        first = icon_library.resize_icon('twitter', (10, 10))
+        for size in range(11, 20):
+            icon_library.resize_icon('twitter', (size, size))
+            # L'icône utilisée récemment reste dans le cache
+            assert icon_library.resize_icon('twitter', (10, 10)) is first
+        assert len(icon_library._resized_cache) == 4
+        assert ('twitter', 19, 19, Image.BICUBIC) in icon_library._resized_cache
+        assert ('twitter', 11, 11, Image.BICUBIC) not in icon_library._resized_cache
+
+    def test_preload_icons(self, icon_library):
+        """Test du préchargement des icônes en mémoire"""
+        library = SocialIconLibrary(icons_dir=icon_library.icons_dir, download_if_missing=False)
+        assert set(library._icon_cache) == set(library.icons_config)
+        assert library.get_icon_image('facebook').mode == 'RGBA'
+
+        lazy_library = SocialIconLibrary(icons_dir=icon_library.icons_dir,
+                                         download_if_missing=False, lazy=True)
+        assert not lazy_library._icon_cache
+
+    def test_get_icon_data_uri(self, icon_library):
+        """Test de l'URI de données d'une icône, au format SVG de préférence"""
+        data_uri = icon_library.get_icon_data_uri('facebook')
+        assert data_uri.startswith("data:image/svg+xml;utf8,")
+        assert icon_library.get_icon_data_uri('facebook') is data_uri
+
+    def test_create_fallback_icon(self, tmp_path):
+        """Test de la création d'une icône de secours"""
+        icons_dir = tmp_path / "fallback"
+        library = SocialIconLibrary(icons_dir=str(icons_dir), download_if_missing=False)
+        library._create_fallback_icon('facebook')
+
+        img = Image.open(icons_dir / "facebook.png")
+        assert img.size == (200, 200)
+        assert img.getpixel((100, 10))[:3] == (0x18, 0x77, 0xF2)
+
+    def test_concurrent_downloads_write_each_icon_once(self, tmp_path, monkeypatch):
+        """Test des téléchargements concurrents : chaque icône n'est écrite qu'une fois"""
+        writes = []
+        atomic_write = social_icons._atomic_write
+
+        def fake_fetch_svg(library, platform, refresh=False):
+            time.sleep(0.01)
+            return b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"/>'
+
+        def counting_atomic_write(path, data):
+            writes.append(os.path.basename(path))
+            atomic_write(path, data)
+
+        monkeypatch.setattr(SocialIconLibrary, '_fetch_svg', fake_fetch_svg)
+        monkeypatch.setattr(social_icons, '_atomic_write', counting_atomic_write)
+
+        library = SocialIconLibrary(icons_dir=str(tmp_path / "icons"), download_if_missing=True, lazy=True)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            paths = list(executor.map(lambda _: library.get_icon_path('facebook'), range(8)))
+        library.wait_ready()
+        library.close()
+
+        assert writes.count('facebook.png') == 1
+        assert writes.count('facebook.svg') == 1
+        assert all(path and os.path.exists(path) for path in paths)
+        assert not [name for name in os.listdir(library.icons_dir) if name.endswith('.tmp')]
+
+    def test_missing_icon_without_download(self, tmp_path, monkeypatch):
+        """Test d'une icône absente lorsque le téléchargement est désactivé"""
+        def no_network(library, platform, refresh=False):
+            raise AssertionError("aucun téléchargement attendu")
+
+        monkeypatch.setattr(SocialIconLibrary, '_fetch_svg', no_network)
+        library = SocialIconLibrary(icons_dir=str(tmp_path / "icons"), download_if_missing=False)
+
+        assert library.get_icon_path('facebook', 'svg') is None
+        png_path = library.get_icon_path('facebook')
+        assert Image.open(png_path).size == (200, 200)
+
+    def test_render_cached_matrix_matches_qrcode(self):
+        """Test du rendu d'une matrice mise en cache, identique à celui de qrcode"""
+        data = "https://www.example.com"
+        modules = _get_qr_modules(data, 1, qrcode.constants.ERROR_CORRECT_M)
+        assert _get_qr_modules(data, 1, qrcode.constants.ERROR_CORRECT_M) is modules
+
+        for fill_color, back_color in (("black", "white"), ("#1877F2", "white"), ("red", "transparent")):
+            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_M,
+                               box_size=5, border=2)
+            qr.add_data(data)
+            qr.make(fit=True)
+            expected = qr.make_image(fill_color=fill_color, back_color=back_color).get_image()
+
+            img = _render_qr_modules(modules, 5, 2, fill_color, back_color)
+            assert img.mode == expected.mode
+            assert img.tobytes() == expected.tobytes()
+
+    def test_generate_social_qrcode(self, generator):
+        """Test de la génération d'un QR code social"""
+        output_path = generator.generate_social_qrcode("https://www.example.com", 'facebook')
+        assert os.path.exists(output_path)
+
+        img = Image.open(output_path)
+        assert img.size[0] == img.size[1]
+
+    def test_generate_social_qrcode_webp(self, generator):
+        """Test de la génération d'un QR code social au format WebP"""
+        output_path = generator.generate_social_qrcode(
+            "https://www.example.com", 'facebook', output_format='webp'
+        )
+        assert output_path.endswith(".webp")
+
+        img = Image.open(output_path)
+        assert img.format == 'WEBP'
+
+    def test_generate_multi_social_qrcode(self, generator):
+        """Test de la génération d'un QR code multi-sociaux"""
+        for layout in ('circle', 'line', 'grid'):
+            output_path = generator.generate_multi_social_qrcode(
+                "https://www.example.com", ['facebook', 'twitter', 'facebook'], layout=layout
+            )
+            assert os.path.exists(output_path)
+
+    def test_generate_batch(self, generator):
+        """Test de la génération par lot"""
+        entries = [
+            {'data': "https://www.example.com", 'platform': 'facebook', 'filename': "batch_1.png"},
+            {'data': "https://www.example.org", 'platform': 'twitter', 'filename': "batch_2.png"},
+        ]
+        output_paths = generator.generate_batch(entries, max_workers=2)
+
+        assert [os.path.basename(path) for path in output_paths] == ["batch_1.png", "batch_2.png"]
+        assert all(os.path.exists(path) for path in output_paths)
+
+    def test_generate_batch_during_prefetch(self, tmp_path, icon_library, monkeypatch):
+        """Test de la génération par lot pendant un téléchargement en arrière-plan"""
+        download_started = threading.Event()
+        release_download = threading.Event()
+
+        def blocking_fetch_svg(library, platform, refresh=False):
+            download_started.set()
+            release_download.wait(10)
+            raise OSError("réseau indisponible")
+
+        # Icône manquante : le thread de préchargement reste bloqué sur son téléchargement
+        os.remove(os.path.join(icon_library.icons_dir, "github.png"))
+        monkeypatch.setattr(SocialIconLibrary, '_fetch_svg', blocking_fetch_svg)
+        library = SocialIconLibrary(icons_dir=icon_library.icons_dir, download_if_missing=True, lazy=True)
+        generator = SocialQRGenerator(output_dir=str(tmp_path / "batch"), icon_library=library)
+        assert download_started.wait(10)
+
+        try:
+            entries = [
+                {'data': "https://www.example.com", 'platform': 'facebook', 'filename': "batch_1.png"},
+                {'data': "https://www.example.org", 'platform': 'twitter', 'filename': "batch_2.png"},
+            ]
+            output_paths = generator.generate_batch(entries, max_workers=2)
+            assert all(os.path.exists(path) for path in output_paths)
+        finally:
+            release_download.set()
+            library.close()
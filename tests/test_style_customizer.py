@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de test pour le générateur de styles avancés.
+Ce module contient les tests unitaires de la classe AdvancedQRStyleGenerator.
+"""
+
+import os
+import pytest
+import sys
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import du module à tester
+from src.backend.customization.style_customizer import AdvancedQRStyleGenerator
+
+
+class TestAdvancedQRStyleGenerator:
+    """Classe de test pour AdvancedQRStyleGenerator"""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        """Fixture pour créer une instance d'AdvancedQRStyleGenerator avec des répertoires temporaires"""
+        generator = AdvancedQRStyleGenerator(output_dir=str(tmp_path / "qrcodes"),
+                                             templates_dir=str(tmp_path / "styles"))
+        yield generator
+        generator.close()
+
+    def test_radial_gradient_ignores_gradient_center(self, generator):
+        """Test d'un dégradé radial avec gradient_center (non pris en charge par qrcode)"""
+        preview = generator.generate_preview_base64(
+            "https://www.example.com", module_shape='square', color_mask='radial_gradient',
+            gradient_center=(0.3, 0.3)
+        )
+        assert preview.startswith("data:image/png;base64,")
+
+        output_path = generator.apply_predefined_style("https://www.example.com", 'ocean')
+        assert os.path.exists(output_path)
+
+    def test_listing_survives_failed_previews(self, generator, monkeypatch):
+        """Test des listes de styles lorsque certaines prévisualisations échouent"""
+        calls = []
+        generate_module_preview = generator._generate_module_preview
+
+        def failing_preview(style_id):
+            calls.append(style_id)
+            if style_id == 'circle':
+                raise RuntimeError("rendu impossible")
+            generate_module_preview(style_id)
+
+        monkeypatch.setattr(generator, '_generate_module_preview', failing_preview)
+
+        styles = generator.get_all_module_styles()
+        previews = {style['id']: style['preview_url'] for style in styles}
+        assert len(styles) == len(generator.module_drawers)
+        assert previews['square'] == os.path.join('module_shapes', 'square.png')
+        assert previews['circle'] is None
+
+        # Les prévisualisations en échec ne sont pas retentées
+        calls.clear()
+        assert generator.get_all_module_styles() == styles
+        assert generator.get_preview_path('module', 'circle') is None
+        assert not calls
+
+        for listing in (generator.get_all_color_masks, generator.get_all_eye_shapes,
+                        generator.get_all_frame_shapes, generator.get_all_predefined_styles):
+            assert listing()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de test pour le personnalisateur de QR codes.
+Ce module contient les tests unitaires de la classe QRCodeCustomizer.
+"""
+
+import os
+import json
+import pytest
+import qrcode
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers import (
+    SquareModuleDrawer,
+    GappedSquareModuleDrawer,
+    RoundedModuleDrawer
+)
+from qrcode.image.styles.colormasks import SolidFillColorMask, HorizontalGradiantColorMask
+from PIL import Image
+import sys
+
+# Ajout du chemin du projet au PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import du module à tester
+from src.style_generator import (
+    QRCodeCustomizer,
+    _HorizontalGradiantColorMask,
+    _make_qrcode,
+    _render_solid_square_modules
+)
+from src.backend.customization.color_utils import color_mask_kwargs, parse_color
+
+
+class TestQRCodeCustomizer:
+    """Classe de test pour QRCodeCustomizer"""
+
+    @pytest.fixture
+    def customizer(self, tmp_path):
+        """Fixture pour créer une instance de QRCodeCustomizer avec un répertoire temporaire"""
+        return QRCodeCustomizer(output_dir=str(tmp_path))
+
+    def test_cached_qrcode_matches_fresh_qrcode(self):
+        """Test de la réutilisation de la matrice des modules entre deux appels"""
+        data = "https://www.example.com"
+        first = _make_qrcode(data, 1, qrcode.constants.ERROR_CORRECT_M, 10, 4)
+        second = _make_qrcode(data, 1, qrcode.constants.ERROR_CORRECT_M, 5, 2)
+        assert first is not second
+        assert first.modules is second.modules
+        assert (second.box_size, second.border) == (5, 2)
+
+        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_M)
+        qr.add_data(data)
+        qr.make(fit=True)
+        assert first.modules == qr.modules
+
+    def test_fixed_mask_pattern(self):
+        """Test de l'encodage avec un masque imposé"""
+        data = "https://www.example.com"
+        qr = _make_qrcode(data, 1, qrcode.constants.ERROR_CORRECT_M, 10, 4, mask_pattern=3)
+
+        expected = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_M,
+                                 mask_pattern=3)
+        expected.add_data(data)
+        expected.make(fit=True)
+        assert qr.modules == expected.modules
+
+    def test_render_solid_square_modules_matches_styled_image(self):
+        """Test du rendu direct des modules carrés, identique à celui de StyledPilImage"""
+        qr = _make_qrcode("https://www.example.com", 1, qrcode.constants.ERROR_CORRECT_M, 5, 2)
+        for front_color, back_color in (((0, 0, 0), (255, 255, 255)), ((0, 102, 204), (245, 245, 245))):
+            color_mask = SolidFillColorMask(front_color=front_color, back_color=back_color)
+            expected = qr.make_image(image_factory=StyledPilImage, module_drawer=SquareModuleDrawer(),
+                                     color_mask=color_mask).get_image()
+
+            img = _render_solid_square_modules(qr.modules, 5, 2, front_color, back_color)
+            assert img.mode == expected.mode
+            assert img.tobytes() == expected.tobytes()
+
+    def test_render_gapped_square_modules_matches_styled_image(self):
+        """Test du rendu direct des modules carrés espacés, identique à celui de StyledPilImage"""
+        qr = _make_qrcode("https://www.example.com", 1, qrcode.constants.ERROR_CORRECT_M, 7, 2)
+        for size_ratio in (0.8, 0.5):
+            expected = qr.make_image(image_factory=StyledPilImage,
+                                     module_drawer=GappedSquareModuleDrawer(size_ratio=size_ratio),
+                                     color_mask=SolidFillColorMask()).get_image()
+
+            img = _render_solid_square_modules(qr.modules, 7, 2, (0, 0, 0), (255, 255, 255),
+                                               size_ratio=size_ratio)
+            assert img.tobytes() == expected.tobytes()
+
+    def test_vectorized_color_mask_matches_qrcode(self):
+        """Test de l'application vectorisée d'un masque en gradient, identique à celle de qrcode"""
+        qr = _make_qrcode("https://www.example.com", 1, qrcode.constants.ERROR_CORRECT_M, 3, 1)
+        colors = {'left_color': (255, 102, 0), 'right_color': (204, 0, 0), 'back_color': (250, 240, 255)}
+        images = [
+            qr.make_image(image_factory=StyledPilImage, module_drawer=RoundedModuleDrawer(),
+                          color_mask=color_mask_class(**colors)).get_image()
+            for color_mask_class in (HorizontalGradiantColorMask, _HorizontalGradiantColorMask)
+        ]
+        assert images[0].tobytes() == images[1].tobytes()
+
+    def test_apply_predefined_style(self, customizer):
+        """Test de l'application d'un style prédéfini"""
+        output_path = customizer.apply_predefined_style("https://www.example.com", 'rounded')
+        assert os.path.exists(output_path)
+
+        img = Image.open(output_path)
+        assert img.size[0] == img.size[1]
+
+    def test_generate_style_gallery(self, customizer):
+        """Test de la génération d'une galerie de styles prédéfinis"""
+        gallery = customizer.generate_style_gallery("https://www.example.com", ['classic', 'dots'])
+        assert list(gallery) == ['classic', 'dots']
+        assert all(os.path.exists(path) for path in gallery.values())
+
+    def test_generate_style_gallery_all_styles(self, customizer):
+        """Test de la galerie complète : chaque style prédéfini y figure"""
+        gallery = customizer.generate_style_gallery("https://www.example.com")
+        assert list(gallery) == list(customizer.predefined_styles)
+        assert all(os.path.exists(path) for path in gallery.values())
+
+    def test_generate_batch(self, customizer):
+        """Test de la génération par lot"""
+        entries = [
+            {'data': "https://www.example.com", 'filename': "batch_1.png", 'module_drawer': 'circle'},
+            {'data': "https://www.example.org", 'style_name': 'dots', 'filename': "batch_2.png"},
+        ]
+        output_paths = customizer.generate_batch(entries, max_workers=2)
+
+        assert [os.path.basename(path) for path in output_paths] == ["batch_1.png", "batch_2.png"]
+        assert all(os.path.exists(path) for path in output_paths)
+
+    def test_parse_color(self):
+        """Test de la normalisation des couleurs"""
+        assert parse_color('#1877F2') == (0x18, 0x77, 0xF2)
+        assert parse_color('red') == (255, 0, 0)
+        assert parse_color([0, 102, 204]) == (0, 102, 204)
+
+    def test_color_mask_kwargs(self):
+        """Test de la table partagée des arguments de masques de couleur"""
+        options = {'front_color': 'red', 'bottom_color': '#003300', 'gradient_center': (0.5, 0.5)}
+        assert color_mask_kwargs('vertical_gradient', options) == {
+            'top_color': (255, 0, 0), 'bottom_color': (0, 51, 0), 'back_color': (255, 255, 255)
+        }
+        assert color_mask_kwargs('radial_gradient', {}, ((0, 0, 0), (100, 100, 100))) == {
+            'center_color': (0, 0, 0), 'edge_color': (100, 100, 100), 'back_color': (255, 255, 255)
+        }
+        assert color_mask_kwargs('unknown', {'front_color': 'blue'}) == {
+            'front_color': (0, 0, 255), 'back_color': (255, 255, 255)
+        }
+
+    def test_generate_styled_qrcode_with_hex_colors(self, customizer):
+        """Test de la génération d'un QR code avec des couleurs hexadécimales"""
+        output_path = customizer.generate_styled_qrcode(
+            "https://www.example.com", front_color='#0066CC', back_color='#FFFFFF'
+        )
+
+        img = Image.open(output_path).convert('RGB')
+        assert (0, 102, 204) in {color for _, color in img.getcolors(maxcolors=1 << 16)}
+
+    def test_generate_styled_qrcode_return_bytes(self, customizer):
+        """Test de la génération d'un QR code en mémoire, sans fichier"""
+        png = customizer.generate_styled_qrcode("https://www.example.com", return_bytes=True)
+        assert png.startswith(b'\x89PNG')
+        assert os.listdir(customizer.output_dir) == ['metadata']
+
+    def test_metadata_journal(self, customizer):
+        """Test du journal des métadonnées au format JSON Lines"""
+        customizer.apply_predefined_style("https://www.example.com", 'classic', "first.png")
+        customizer.apply_predefined_style("https://www.example.org", 'dots', "second.png")
+        customizer.close()
+
+        with open(os.path.join(customizer.metadata_dir, 'index.jsonl'), encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert [record['file'] for record in records] == ["first.png", "second.png"]
+        assert records[1]['options']['module_drawer'] == 'circle'
+
+    def test_legacy_metadata_file(self, tmp_path):
+        """Test des métadonnées écrites dans un fichier texte par QR code"""
+        customizer = QRCodeCustomizer(output_dir=str(tmp_path), legacy_metadata=True)
+        customizer.apply_predefined_style("https://www.example.com", 'classic', "legacy.png")
+        customizer.close()
+
+        with open(os.path.join(customizer.metadata_dir, 'legacy.txt'), encoding='utf-8') as f:
+            content = f.read()
+        assert "Données: https://www.example.com" in content
+        assert not os.path.exists(os.path.join(customizer.metadata_dir, 'index.jsonl'))